@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the serialization hot paths. Run a module with, e.g.::
+
+    python -m benchmarks.bench_dump
+
+or the whole suite, saving and comparing JSON results, with::
+
+    python -m benchmarks.suite --save results.json --compare baseline.json
+"""
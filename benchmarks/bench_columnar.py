@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Compare row by row and columnar (``class Meta: columnar = True``)
+serialization of a wide page of numbers and timestamps.
+
+Usage: ::
+
+    python -m benchmarks.bench_columnar [--objects 1000] [--repeat 5]
+
+If NumPy is installed, the same page is also serialized from a structured
+array.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime as dt
+import timeit
+
+from marshmallow import Schema, fields
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMBER_FIELDS = ['n{0}'.format(idx) for idx in range(8)]
+FLOAT_FIELDS = ['f{0}'.format(idx) for idx in range(4)]
+TIMESTAMP_FIELDS = ['t{0}'.format(idx) for idx in range(4)]
+
+
+class Row(object):
+
+    def __init__(self, idx):
+        for offset, name in enumerate(NUMBER_FIELDS):
+            setattr(self, name, idx + offset)
+        for offset, name in enumerate(FLOAT_FIELDS):
+            setattr(self, name, idx / (offset + 1.0))
+        for offset, name in enumerate(TIMESTAMP_FIELDS):
+            setattr(self, name, dt.datetime(2016, 1, 1, offset, idx % 60))
+
+
+def make_schema(name, field_names, columnar=False):
+    """Return a schema class with a number or timestamp field per name."""
+    attrs = {}
+    for field_name in field_names:
+        if field_name in TIMESTAMP_FIELDS:
+            attrs[field_name] = fields.DateTime()
+        elif field_name in FLOAT_FIELDS:
+            attrs[field_name] = fields.Float()
+        else:
+            attrs[field_name] = fields.Int()
+    attrs['Meta'] = type(str('Meta'), (object,), {'columnar': columnar})
+    return type(str(name), (Schema,), attrs)
+
+
+ROW_FIELDS = NUMBER_FIELDS + FLOAT_FIELDS + TIMESTAMP_FIELDS
+RowSchema = make_schema('RowSchema', ROW_FIELDS)
+ColumnarRowSchema = make_schema('ColumnarRowSchema', ROW_FIELDS, columnar=True)
+NumberSchema = make_schema('NumberSchema', NUMBER_FIELDS + FLOAT_FIELDS)
+ColumnarNumberSchema = make_schema('ColumnarNumberSchema', NUMBER_FIELDS + FLOAT_FIELDS,
+                                   columnar=True)
+
+
+def bench(schema, objs, repeat):
+    """Return the best ops/sec (objects serialized per second)."""
+    best = min(timeit.repeat(lambda: schema.dump(objs), number=1, repeat=repeat))
+    return len(objs) / best
+
+
+def compare(label, row_schema, columnar_schema, objs, repeat):
+    assert row_schema.dump(objs).data == columnar_schema.dump(objs).data, \
+        'Columnar output differs'
+    row_ops = bench(row_schema, objs, repeat)
+    columnar_ops = bench(columnar_schema, objs, repeat)
+    print(label)
+    print('  rows:     {0:>12,.0f} objects/sec'.format(row_ops))
+    print('  columns:  {0:>12,.0f} objects/sec'.format(columnar_ops))
+    print('  speedup:  {0:>12.2f}x'.format(columnar_ops / row_ops))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    objs = [Row(idx) for idx in range(args.objects)]
+    compare('objects', RowSchema(many=True), ColumnarRowSchema(many=True),
+            objs, args.repeat)
+    if np is not None:
+        dtype = ([(name, 'i8') for name in NUMBER_FIELDS] +
+                 [(name, 'f8') for name in FLOAT_FIELDS])
+        array = np.array(
+            [tuple(getattr(obj, name) for name, _ in dtype) for obj in objs],
+            dtype=dtype,
+        )
+        compare('structured array', NumberSchema(many=True),
+                ColumnarNumberSchema(many=True), array, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
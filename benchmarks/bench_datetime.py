@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Compare ISO8601 parsing with dateutil and with `marshmallow.utils.from_iso`,
+and time loading and dumping a timestamp-heavy page.
+
+Usage: ::
+
+    python -m benchmarks.bench_datetime [--objects 1000] [--repeat 5]
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime as dt
+import timeit
+
+from marshmallow import Schema, fields, utils
+
+
+class EventSchema(Schema):
+    created = fields.DateTime()
+    updated = fields.DateTime()
+    started = fields.DateTime()
+    day = fields.Date()
+    at = fields.Time()
+
+
+def best(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    start = dt.datetime(2016, 1, 1, 12, 30, 15, 123456)
+    events = [
+        {
+            'created': start + dt.timedelta(seconds=idx),
+            'updated': start + dt.timedelta(minutes=idx),
+            'started': start + dt.timedelta(hours=idx),
+            'day': (start + dt.timedelta(days=idx)).date(),
+            'at': (start + dt.timedelta(seconds=idx)).time(),
+        }
+        for idx in range(args.objects)
+    ]
+    schema = EventSchema(many=True)
+    payload = schema.dump(events).data
+    strings = [each['created'] for each in payload]
+
+    if utils.dateutil_available:
+        from dateutil import parser as dateutil_parser
+        elapsed = best(lambda: [dateutil_parser.parse(each) for each in strings],
+                       args.repeat)
+        print('dateutil parse: {0:>12,.0f} timestamps/sec'.format(len(strings) / elapsed))
+    utils._parse_iso_datetime.cache_clear()
+    elapsed = best(lambda: [utils.from_iso(each) for each in strings], 1)
+    print('from_iso:       {0:>12,.0f} timestamps/sec (uncached)'.format(
+        len(strings) / elapsed))
+    elapsed = best(lambda: schema.load(payload), args.repeat)
+    print('load:           {0:>12,.0f} objects/sec'.format(len(payload) / elapsed))
+    elapsed = best(lambda: schema.dump(events), args.repeat)
+    print('dump:           {0:>12,.0f} objects/sec'.format(len(events) / elapsed))
+
+
+if __name__ == '__main__':
+    main()
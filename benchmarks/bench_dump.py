@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Compare the generic and the generated dump paths of
+:class:`Marshaller <marshmallow.marshalling.Marshaller>`.
+
+Usage: ::
+
+    python -m benchmarks.bench_dump [--objects 1000] [--repeat 5]
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime as dt
+import decimal
+import timeit
+
+from marshmallow import Schema, fields
+from marshmallow.marshalling import Marshaller
+
+
+class Author(object):
+
+    def __init__(self, idx):
+        self.id = idx
+        self.name = 'Author {0}'.format(idx)
+        self.email = 'author{0}@example.com'.format(idx)
+        self.active = idx % 2 == 0
+        self.score = idx * 1.5
+        self.balance = decimal.Decimal('12.34')
+        self.created = dt.datetime(2016, 1, 1, 12, 30, idx % 60)
+        self.profile = {'city': 'Shanghai'}
+
+
+class AuthorSchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+    email = fields.Str(dump_to='mail')
+    active = fields.Bool()
+    score = fields.Float()
+    balance = fields.Decimal(as_string=True)
+    created = fields.DateTime()
+    city = fields.Str(attribute='profile.city')
+    role = fields.Str(default='member')
+    password = fields.Str(load_only=True)
+
+
+def bench(marshaller, schema, objs, repeat):
+    """Return the best ops/sec (objects serialized per second)."""
+    accessor = schema._get_accessor()
+    fields_dict = schema.fields
+
+    def run():
+        marshaller.serialize(objs, fields_dict, many=True, accessor=accessor,
+                             dict_class=schema.dict_class)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return len(objs) / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    objs = [Author(idx) for idx in range(args.objects)]
+    schema = AuthorSchema(many=True)
+    generic = Marshaller(compiled=False)
+    compiled = Marshaller(compiled=True)
+    accessor = schema._get_accessor()
+    expected = generic.serialize(objs, schema.fields, many=True, accessor=accessor)
+    actual = compiled.serialize(objs, schema.fields, many=True, accessor=accessor)
+    assert expected == actual, 'Generated dump function output differs'
+
+    generic_ops = bench(generic, schema, objs, args.repeat)
+    compiled_ops = bench(compiled, schema, objs, args.repeat)
+    print('generic:   {0:>12,.0f} objects/sec'.format(generic_ops))
+    print('generated: {0:>12,.0f} objects/sec'.format(compiled_ops))
+    print('speedup:   {0:>12.2f}x'.format(compiled_ops / generic_ops))
+
+
+if __name__ == '__main__':
+    main()
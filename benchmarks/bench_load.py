@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Compare the generic and the generated load paths of
+:class:`Unmarshaller <marshmallow.marshalling.Unmarshaller>`.
+
+Usage: ::
+
+    python -m benchmarks.bench_load [--objects 1000] [--repeat 5]
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import timeit
+
+from marshmallow import Schema, fields, validate
+from marshmallow.marshalling import Unmarshaller
+
+
+class AuthorSchema(Schema):
+    id = fields.Int(dump_only=True)
+    name = fields.Str(required=True)
+    email = fields.Str(load_from='mail')
+    active = fields.Bool(missing=True)
+    score = fields.Float(allow_none=True)
+    role = fields.Str(validate=validate.OneOf(['admin', 'member']))
+    tags = fields.List(fields.Str(), missing=list)
+    note = fields.Str()
+
+
+def make_payload(idx):
+    return {
+        'name': 'Author {0}'.format(idx),
+        'mail': 'author{0}@example.com'.format(idx),
+        'score': None if idx % 3 else idx * 1.5,
+        'role': 'member',
+        'tags': ['a', 'b'],
+    }
+
+
+def bench(unmarshaller, schema, payload, partial, repeat):
+    """Return the best ops/sec (items deserialized per second)."""
+    fields_dict = schema.fields
+
+    def run():
+        unmarshaller.deserialize(payload, fields_dict, many=True, partial=partial,
+                                 dict_class=schema.dict_class)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return len(payload) / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    payload = [make_payload(idx) for idx in range(args.objects)]
+    schema = AuthorSchema(many=True)
+    generic = Unmarshaller(compiled=False)
+    compiled = Unmarshaller(compiled=True)
+    for partial in (False, True):
+        expected = generic.deserialize(payload, schema.fields, many=True, partial=partial)
+        actual = compiled.deserialize(payload, schema.fields, many=True, partial=partial)
+        assert expected == actual, 'Generated load function output differs'
+
+        generic_ops = bench(generic, schema, payload, partial, args.repeat)
+        compiled_ops = bench(compiled, schema, payload, partial, args.repeat)
+        print('partial={0}'.format(partial))
+        print('  generic:   {0:>12,.0f} items/sec'.format(generic_ops))
+        print('  generated: {0:>12,.0f} items/sec'.format(compiled_ops))
+        print('  speedup:   {0:>12.2f}x'.format(compiled_ops / generic_ops))
+
+
+if __name__ == '__main__':
+    main()
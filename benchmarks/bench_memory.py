@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Report the memory used by schema instances.
+
+Usage: ::
+
+    python -m benchmarks.bench_memory [--instances 1000]
+
+Requires Python 3.4+ (`tracemalloc`).
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import gc
+import tracemalloc
+
+from marshmallow import Schema, fields, validate
+
+
+class AddressSchema(Schema):
+    street = fields.Str(required=True)
+    city = fields.Str(validate=validate.Length(max=64))
+    zip_code = fields.Str(load_from='zip')
+
+
+class UserSchema(Schema):
+    id = fields.Int(dump_only=True)
+    name = fields.Str(required=True, validate=validate.Length(min=1, max=64))
+    email = fields.Email()
+    homepage = fields.Url()
+    role = fields.Str(validate=validate.OneOf(['admin', 'member']), missing='member')
+    score = fields.Float()
+    balance = fields.Decimal(as_string=True)
+    active = fields.Bool()
+    created = fields.DateTime()
+    birthday = fields.Date()
+    tags = fields.List(fields.Str())
+    address = fields.Nested(AddressSchema)
+
+    class Meta:
+        ordered = True
+
+
+def measure(factory, count):
+    """Return the number of bytes allocated per object by ``factory``."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objs = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objs
+    return allocated / float(count)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--instances', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    field_bytes = measure(lambda: fields.Str(validate=validate.Length(max=10)),
+                          args.instances)
+    schema_bytes = measure(UserSchema, args.instances)
+    print('field:  {0:>10,.0f} bytes/instance'.format(field_bytes))
+    print('schema: {0:>10,.0f} bytes/instance ({1} fields)'.format(
+        schema_bytes, len(UserSchema._declared_fields)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Compare per-object and batched serialization of a recursive schema.
+
+Usage: ::
+
+    python -m benchmarks.bench_nested [--width 10] [--depth 3] [--repeat 5]
+
+:class:`Nested <marshmallow.fields.Nested>` fields serialize the children of a
+whole page with one call to the nested schema, row by row or with
+``class Meta: columnar = True``. A ``pass_many`` processor on the nested schema
+turns the batching off, which gives the per-object figure.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import timeit
+
+from marshmallow import Schema, fields, post_dump
+
+
+class Category(object):
+
+    def __init__(self, idx, width, depth):
+        self.id = idx
+        self.name = 'Category {0}'.format(idx)
+        self.children = [Category(idx * width + offset, width, depth - 1)
+                         for offset in range(width)] if depth else []
+
+
+class CategorySchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+    children = fields.Nested('self', many=True)
+
+
+class ColumnarCategorySchema(CategorySchema):
+
+    class Meta:
+        columnar = True
+
+
+class PerObjectCategorySchema(CategorySchema):
+
+    @post_dump(pass_many=True)
+    def identity(self, data, many):
+        return data
+
+
+def count(categories):
+    return sum(1 + count(each.children) for each in categories)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--width', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    roots = [Category(idx, args.width, args.depth - 1) for idx in range(args.width)]
+    total = count(roots)
+    expected = CategorySchema(many=True).dump(roots).data
+    for schema_class in (ColumnarCategorySchema, PerObjectCategorySchema):
+        assert schema_class(many=True).dump(roots).data == expected, \
+            '{0} output differs'.format(schema_class.__name__)
+
+    for label, schema_class in (('per object', PerObjectCategorySchema),
+                                ('rows', CategorySchema),
+                                ('columns', ColumnarCategorySchema)):
+        best = min(timeit.repeat(lambda: schema_class(many=True).dump(roots),
+                                 number=1, repeat=args.repeat))
+        print('{0:<11} {1:>12,.0f} objects/sec'.format(label + ':', total / best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Time defining and first instantiating `ModelSchema` classes for many
+generated SQLAlchemy models, as an application does at startup.
+
+Usage: ::
+
+    python -m benchmarks.bench_startup [--models 300] [--columns 12] [--repeat 3]
+
+Reports the time taken to define one schema per model, whether the mappers
+are configured by then, the time taken to instantiate every schema once
+(which converts the models), and the time taken to define and instantiate a
+second schema over each model, which reuses the converted fields.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import timeit
+import warnings
+
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from marshmallow_sqlalchemy import ModelSchema
+
+COLUMN_TYPES = (
+    lambda: sa.Integer(), lambda: sa.String(64), lambda: sa.Text(),
+    lambda: sa.DateTime(), lambda: sa.Numeric(10, 2), lambda: sa.Boolean(),
+    lambda: sa.Float(), lambda: sa.Date(),
+)
+
+
+def make_models(count, columns):
+    """Return ``count`` models of ``columns`` columns each; every model but
+    the first references the previous one.
+    """
+    Base = declarative_base()
+    models = []
+    for idx in range(count):
+        attrs = {
+            '__tablename__': 'startup_{0}'.format(idx),
+            'id': sa.Column(sa.Integer, primary_key=True),
+        }
+        for col in range(columns):
+            attrs['col_{0}'.format(col)] = sa.Column(
+                COLUMN_TYPES[col % len(COLUMN_TYPES)](), nullable=col % 2 == 0)
+        if idx:
+            attrs['parent_id'] = sa.Column(
+                sa.ForeignKey('startup_{0}.id'.format(idx - 1)))
+            attrs['parent'] = relationship('Model{0}'.format(idx - 1))
+        models.append(type(str('Model{0}'.format(idx)), (Base, ), attrs))
+    return models
+
+
+def define_schemas(models):
+    return [
+        type(str('{0}Schema'.format(model.__name__)), (ModelSchema, ),
+             {'Meta': type(str('Meta'), (object, ), {'model': model})})
+        for model in models
+    ]
+
+
+def run(count, columns):
+    models = make_models(count, columns)
+    start = timeit.default_timer()
+    schemas = define_schemas(models)
+    defined = timeit.default_timer() - start
+    configured = models[0].__mapper__.configured
+    start = timeit.default_timer()
+    for schema in schemas:
+        schema()
+    instantiated = timeit.default_timer() - start
+    start = timeit.default_timer()
+    for schema in define_schemas(models):
+        schema()
+    shared = timeit.default_timer() - start
+    return defined, configured, instantiated, shared
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--models', type=int, default=300)
+    parser.add_argument('--columns', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        results = [run(args.models, args.columns) for _ in range(args.repeat)]
+    defined, configured, instantiated, shared = min(results, key=lambda each: each[0])
+    print('{0} models of {1} columns'.format(args.models, args.columns))
+    print('define schemas:          {0:>9.1f} ms (mappers configured: {1})'.format(
+        defined * 1000, 'yes' if configured else 'no'))
+    print('first instantiation:     {0:>9.1f} ms'.format(
+        min(each[2] for each in results) * 1000))
+    print('second schema per model: {0:>9.1f} ms'.format(
+        min(each[3] for each in results) * 1000))
+
+
+if __name__ == '__main__':
+    main()
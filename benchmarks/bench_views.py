@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""Drive the generic views end to end through an in-process HTTP client.
+
+Usage: ::
+
+    python -m benchmarks.bench_views [--users 1000] [--requests 100] [--phases]
+                                     [--save results.json]
+                                     [--compare baseline.json] [--threshold 0.2]
+
+For each endpoint, report latency percentiles, the SQL statements executed
+per request, the time view tasks wait for an executor thread and the bytes
+rendered, then the hit rates of the statement cache; with ``--phases``,
+also turn on the ``phase_timing`` setting and report where each handler
+spends its time. With ``--compare``, exit with
+status 1 if an endpoint runs more SQL statements per request than in the
+baseline, if its p95 latency grows by more than ``--threshold``, or if any
+request fails.
+"""
+from __future__ import division, print_function, unicode_literals
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from tornado import gen
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+from tornado.testing import bind_unused_port
+
+from benchmarks import views
+
+HEADERS = {'userId': '1', 'Authorization': 'token'}
+#: Description of the roles created by the benchmark, and deleted afterwards
+CREATED = 'Created by the benchmark'
+
+
+def percentile(values, percent):
+    """Return the ``percent`` percentile of ``values`` (nearest rank)."""
+    ordered = sorted(values)
+    rank = max(int(round(percent / 100.0 * len(ordered))) - 1, 0)
+    return ordered[rank]
+
+
+def endpoints(users, requests):
+    """Return ``(name, method, path(idx), body(idx))`` tuples, in running
+    order. The DELETE endpoints remove roles created by the POST one, or by
+    the harness when too few are left, and take ``path(role_id)``; the batch
+    upsert endpoint writes the same 20 roles on every request.
+    """
+    created_role = lambda idx: {'name': 'Role {0}'.format(idx), 'description': CREATED}
+    updated_role = lambda idx: {'name': 'Role {0}'.format(idx), 'description': 'Updated'}
+    upserted_roles = lambda idx: {'list': [
+        {'id': 10000 + each, 'name': 'Role {0}'.format(each), 'description': 'Upserted'}
+        for each in range(20)
+    ]}
+    return [
+        ('GET /users', 'GET',
+         lambda idx: '/users?page={0}&pageSize=20'.format(idx % max(users // 20, 1) + 1),
+         None),
+        ('GET /users/rows', 'GET',
+         lambda idx: '/users/rows?page={0}&pageSize=20'.format(idx % max(users // 20, 1) + 1),
+         None),
+        ('GET /users/<id>', 'GET', lambda idx: '/users/{0}'.format(idx % users + 1), None),
+        ('GET /roles', 'GET', lambda idx: '/roles', None),
+        ('POST /roles', 'POST', lambda idx: '/roles', created_role),
+        ('GET /roles/<id>', 'GET', lambda idx: '/roles/{0}'.format(idx % 20 + 1), None),
+        ('PUT /roles/<id>', 'PUT', lambda idx: '/roles/{0}'.format(idx % 20 + 1),
+         updated_role),
+        ('PATCH /roles/<id>', 'PATCH', lambda idx: '/roles/{0}'.format(idx % 20 + 1),
+         lambda idx: {'description': 'Patched'}),
+        ('PUT upsert', 'PUT', lambda idx: '/roles/upsert/{0}'.format(idx % 20 + 1),
+         updated_role),
+        ('POST upsert x20', 'POST', lambda idx: '/roles/upsert', upserted_roles),
+        ('PUT direct', 'PUT', lambda idx: '/roles/direct/{0}'.format(idx % 20 + 1),
+         updated_role),
+        ('DELETE /roles/<id>', 'DELETE', lambda role_id: '/roles/{0}'.format(role_id),
+         None),
+        ('DELETE direct', 'DELETE',
+         lambda role_id: '/roles/direct/{0}'.format(role_id), None),
+    ]
+
+
+class Harness(object):
+    """Serve the views of :mod:`benchmarks.views` over a fresh SQLite database
+    and count the SQL statements executed.
+    """
+
+    def __init__(self, users, workers=4, **settings):
+        models = views.install_models()
+        from restornado.database import initialize_sessionmaker
+
+        self.tmpdir = tempfile.mkdtemp(prefix='restornado-bench-')
+        self.engine = sa.create_engine(
+            'sqlite:///' + os.path.join(self.tmpdir, 'bench.db'),
+            connect_args={'check_same_thread': False},
+        )
+        self.statements = 0
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        models.Base.metadata.create_all(self.engine)
+        initialize_sessionmaker(self.engine)
+        from restornado.database import get_session
+        session = get_session()
+        views.populate(session, models, users=users)
+        session.close()
+
+        self.models = models
+        self.app = views.make_app(models, workers=workers, **settings)
+        self.io_loop = IOLoop.current()
+        sock, self.port = bind_unused_port()
+        self.server = HTTPServer(self.app)
+        self.server.add_sockets([sock])
+        self.client = AsyncHTTPClient()
+
+    def _count(self, *args):
+        self.statements += 1
+
+    def close(self):
+        self.server.stop()
+        self.app.executor.shutdown()
+        self.engine.dispose()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    @gen.coroutine
+    def fetch(self, method, path, body=None):
+        """Return ``(response, seconds, statements, queue_seconds)``."""
+        self.app.executor.pop_queue_times()
+        statements = self.statements
+        start = time.time()
+        response = yield self.client.fetch(
+            'http://127.0.0.1:{0}{1}'.format(self.port, path),
+            method=method, headers=HEADERS, raise_error=False,
+            body=None if body is None else json.dumps(body),
+        )
+        elapsed = time.time() - start
+        raise gen.Return((response, elapsed, self.statements - statements,
+                          sum(self.app.executor.pop_queue_times())))
+
+    def created_role_ids(self, count):
+        """Return the ids of ``count`` roles created by the benchmark,
+        creating the missing ones.
+        """
+        from restornado.database import get_session
+        session = get_session()
+        try:
+            query = session.query(self.models.Role.id).filter(
+                self.models.Role.description == CREATED)
+            missing = count - query.count()
+            if missing > 0:
+                session.add_all([
+                    self.models.Role(name='Extra {0}'.format(idx), description=CREATED)
+                    for idx in range(missing)
+                ])
+                session.commit()
+            return [row[0] for row in query.order_by(self.models.Role.id).limit(count)]
+        finally:
+            session.close()
+
+    @gen.coroutine
+    def run_endpoint(self, method, path, body, requests):
+        latencies, statements, queue_times, sizes, failures = [], [], [], [], 0
+        for idx in range(requests):
+            response, elapsed, count, queued = yield self.fetch(
+                method, path(idx), body(idx) if body else None)
+            latencies.append(elapsed)
+            statements.append(count)
+            queue_times.append(queued)
+            sizes.append(len(response.body or b''))
+            if response.code != 200 or b'"code":1' in (response.body or b''):
+                failures += 1
+        raise gen.Return(OrderedDict([
+            ('requests', requests),
+            ('failures', failures),
+            ('p50_ms', percentile(latencies, 50) * 1000),
+            ('p95_ms', percentile(latencies, 95) * 1000),
+            ('p99_ms', percentile(latencies, 99) * 1000),
+            ('statements_per_request', sum(statements) / requests),
+            ('queue_ms', sum(queue_times) / requests * 1000),
+            ('bytes_per_request', sum(sizes) / requests),
+        ]))
+
+    @gen.coroutine
+    def run(self, users, requests, warmup=5):
+        results = OrderedDict()
+        for name, method, path, body in endpoints(users, requests):
+            if method == 'DELETE':
+                ids = self.created_role_ids(requests)
+                count = requests
+                path = lambda idx, ids=ids, path=path: path(ids[idx])
+            else:
+                count = requests
+                yield self.run_endpoint(method, path, body, min(warmup, requests))
+            results[name] = yield self.run_endpoint(method, path, body, count)
+        raise gen.Return(results)
+
+
+def report(results):
+    print('{0:<20} {1:>8} {2:>8} {3:>8} {4:>6} {5:>9} {6:>9} {7:>5}'.format(
+        'endpoint', 'p50 ms', 'p95 ms', 'p99 ms', 'sql', 'queue ms', 'bytes', 'fail'))
+    for name, each in results.items():
+        print('{0:<20} {1:>8.2f} {2:>8.2f} {3:>8.2f} {4:>6.1f} {5:>9.3f} {6:>9,.0f} {7:>5}'
+              .format(name, each['p50_ms'], each['p95_ms'], each['p99_ms'],
+                      each['statements_per_request'], each['queue_ms'],
+                      each['bytes_per_request'], each['failures']))
+
+
+def report_phases(stats):
+    print('\n{0:<28} {1:<12} {2:>8} {3:>9} {4:>9}'.format(
+        'handler', 'phase', 'count', 'mean ms', 'p95 ms'))
+    for handler_name, phases in stats.items():
+        for name, histogram in phases.items():
+            print('{0:<28} {1:<12} {2:>8} {3:>9.3f} {4:>9.3f}'.format(
+                handler_name, name, histogram['count'], histogram['mean_ms'],
+                histogram['p95_ms']))
+
+
+def report_statements(stats):
+    print('\n{0:<28} {1:<12} {2:>8} {3:>8} {4:>9}'.format(
+        'handler', 'statement', 'hits', 'misses', 'hit rate'))
+    for handler_name, shapes in stats.items():
+        for shape, counts in shapes.items():
+            print('{0:<28} {1:<12} {2:>8} {3:>8} {4:>8.1%}'.format(
+                handler_name, shape, counts['hits'], counts['misses'],
+                counts['hit_rate']))
+
+
+def compare(results, baseline, threshold):
+    """Return a list of messages describing the regressions of ``results``
+    relative to ``baseline``.
+    """
+    problems = []
+    for name, each in results.items():
+        if each['failures']:
+            problems.append('{0}: {1} failed requests'.format(name, each['failures']))
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if each['statements_per_request'] > before['statements_per_request']:
+            problems.append('{0}: {1:.1f} SQL statements per request (baseline {2:.1f})'
+                            .format(name, each['statements_per_request'],
+                                    before['statements_per_request']))
+        if each['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            problems.append('{0}: p95 {1:.2f}ms (baseline {2:.2f}ms)'.format(
+                name, each['p95_ms'], before['p95_ms']))
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=100,
+                        help='requests per endpoint')
+    parser.add_argument('--workers', type=int, default=4, help='executor threads')
+    parser.add_argument('--phases', action='store_true',
+                        help='turn on phase timing and report the phases')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='p95 latency growth ratio above which a run fails')
+    args = parser.parse_args(argv)
+
+    harness = Harness(args.users, workers=args.workers, phase_timing=args.phases)
+    try:
+        results = harness.io_loop.run_sync(
+            lambda: harness.run(args.users, args.requests), timeout=3600)
+    finally:
+        harness.close()
+    report(results)
+    from restornado.database import statements
+    report_statements(statements.stats.as_dict())
+    if args.phases:
+        from restornado import timing
+        report_phases(timing.stats.as_dict())
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump({'users': args.users, 'results': results}, fp, indent=2)
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)['results']
+        problems = compare(results, baseline, args.threshold)
+        if problems:
+            print('\n' + '\n'.join(problems))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""Run the benchmark suite for the serialization and validation hot paths.
+
+Usage: ::
+
+    python -m benchmarks.suite [--repeat 5] [--only dump] [--save results.json]
+                               [--compare baseline.json] [--threshold 0.1]
+
+Each case reports the best throughput over ``--repeat`` runs and the peak
+memory allocated per item (Python 3.4+, `tracemalloc`). With ``--save``, the
+results are written as JSON; store such a file as a baseline and pass it to
+``--compare`` to fail (exit status 1) when a case slows down by more than
+``--threshold``. Cases whose optional dependencies (SQLAlchemy) are not
+installed are skipped.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime as dt
+import decimal
+import gc
+import json
+import platform
+import sys
+import timeit
+import uuid
+from collections import OrderedDict
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+from marshmallow import Schema, fields, validate
+
+#: Registered cases, in running order: {<name>: <setup function>}
+CASES = OrderedDict()
+
+
+def case(name):
+    """Register a benchmark case. The decorated function takes the page size
+    and returns a ``(run, count)`` pair, where ``run()`` processes ``count``
+    items.
+    """
+    def decorator(func):
+        CASES[name] = func
+        return func
+    return decorator
+
+
+##### Data #####
+
+class Address(object):
+
+    def __init__(self, idx):
+        self.street = '{0} Main Street'.format(idx)
+        self.city = 'Shanghai'
+        self.zip_code = '2000{0:02d}'.format(idx % 100)
+
+
+class User(object):
+
+    def __init__(self, idx):
+        self.id = idx
+        self.name = 'User {0}'.format(idx)
+        self.email = 'user{0}@example.com'.format(idx)
+        self.role = 'admin' if idx % 10 == 0 else 'member'
+        self.score = idx * 1.5
+        self.balance = decimal.Decimal('12.34')
+        self.active = idx % 2 == 0
+        self.created = dt.datetime(2016, 1, 1, 12, 30, idx % 60)
+        self.tags = ['a', 'b']
+        self.address = Address(idx)
+        self.friends = [Address(idx + offset) for offset in range(3)]
+
+
+class AddressSchema(Schema):
+    street = fields.Str(required=True)
+    city = fields.Str(validate=validate.Length(max=64))
+    zip_code = fields.Str()
+
+
+class UserSchema(Schema):
+    id = fields.Int(dump_only=True)
+    name = fields.Str(required=True, validate=validate.Length(min=1, max=64))
+    email = fields.Email()
+    role = fields.Str(validate=validate.OneOf(['admin', 'member']), missing='member')
+    score = fields.Float()
+    balance = fields.Decimal(as_string=True)
+    active = fields.Bool()
+    created = fields.DateTime()
+    tags = fields.List(fields.Str())
+
+
+class NestedUserSchema(UserSchema):
+    address = fields.Nested(AddressSchema)
+    friends = fields.Nested(AddressSchema, many=True)
+
+
+def dump_all(schema_class, objs):
+    return schema_class(many=True).dump(objs).data
+
+
+##### Cases #####
+
+@case('dump.flat')
+def dump_flat(size):
+    schema, obj = UserSchema(), User(1)
+    return (lambda: [schema.dump(obj) for _ in range(size)]), size
+
+
+@case('dump.flat.many')
+def dump_flat_many(size):
+    schema, objs = UserSchema(many=True), [User(idx) for idx in range(size)]
+    return (lambda: schema.dump(objs)), size
+
+
+@case('dump.nested.many')
+def dump_nested_many(size):
+    schema, objs = NestedUserSchema(many=True), [User(idx) for idx in range(size)]
+    return (lambda: schema.dump(objs)), size
+
+
+@case('load.flat')
+def load_flat(size):
+    schema = UserSchema()
+    data = dump_all(UserSchema, [User(1)])[0]
+    return (lambda: [schema.load(data) for _ in range(size)]), size
+
+
+@case('load.flat.many')
+def load_flat_many(size):
+    schema = UserSchema(many=True)
+    data = dump_all(UserSchema, [User(idx) for idx in range(size)])
+    return (lambda: schema.load(data)), size
+
+
+@case('load.nested.many')
+def load_nested_many(size):
+    schema = NestedUserSchema(many=True)
+    data = dump_all(NestedUserSchema, [User(idx) for idx in range(size)])
+    return (lambda: schema.load(data)), size
+
+
+def _sqlalchemy_models():
+    """Return a ``(model, session)`` pair backed by an in-memory SQLite
+    database, or `None` if SQLAlchemy is not installed.
+    """
+    try:
+        import sqlalchemy as sa
+        from sqlalchemy.ext.declarative import declarative_base
+        from sqlalchemy.orm import sessionmaker
+    except ImportError:
+        return None
+    Base = declarative_base()
+
+    class Account(Base):
+        __tablename__ = 'benchmark_account'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String(64), nullable=False)
+        email = sa.Column(sa.String(128))
+        balance = sa.Column(sa.Numeric(10, 2))
+        active = sa.Column(sa.Boolean, default=True)
+        created = sa.Column(sa.DateTime)
+
+    engine = sa.create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    return Account, sessionmaker(bind=engine)()
+
+
+def _model_schema(size):
+    models = _sqlalchemy_models()
+    if models is None:
+        return None
+    from marshmallow_sqlalchemy import ModelSchema
+    Account, session = models
+    session.add_all([
+        Account(id=idx, name='Account {0}'.format(idx),
+                email='account{0}@example.com'.format(idx),
+                balance=decimal.Decimal('12.34'), active=idx % 2 == 0,
+                created=dt.datetime(2016, 1, 1, 12, 30, idx % 60))
+        for idx in range(size)
+    ])
+    session.commit()
+
+    class AccountSchema(ModelSchema):
+        class Meta:
+            model = Account
+            sqla_session = session
+
+    return AccountSchema, session, session.query(Account).all()
+
+
+@case('sqla.dump.many')
+def sqla_dump_many(size):
+    setup = _model_schema(size)
+    if setup is None:
+        return None
+    schema_class, session, accounts = setup
+    schema = schema_class(many=True)
+    return (lambda: schema.dump(accounts)), size
+
+
+@case('sqla.load.many')
+def sqla_load_many(size):
+    setup = _model_schema(size)
+    if setup is None:
+        return None
+    schema_class, session, accounts = setup
+    schema = schema_class(many=True)
+    data = schema.dump(accounts).data
+    for each in data:
+        each['id'] += size  # New rows: no primary key lookup hits
+
+    def run():
+        schema.load(data)
+        session.expunge_all()
+    return run, size
+
+
+@case('sqla.fetch_dump.orm')
+def sqla_fetch_dump_orm(size):
+    setup = _model_schema(size)
+    if setup is None:
+        return None
+    schema_class, session, accounts = setup
+    schema, model = schema_class(many=True), schema_class.opts.model
+    del accounts[:]
+
+    def run():
+        schema.dump(session.query(model).all())
+        session.expunge_all()
+    return run, size
+
+
+@case('sqla.fetch_dump.core')
+def sqla_fetch_dump_core(size):
+    setup = _model_schema(size)
+    if setup is None:
+        return None
+    from marshmallow_sqlalchemy.rows import RowDumper
+    schema_class, session, accounts = setup
+    dumper, model = RowDumper(schema_class(many=True)), schema_class.opts.model
+    statement = session.query(model).with_entities(*dumper.columns).statement
+    return (lambda: dumper.dump(session.execute(statement).fetchall())), size
+
+
+@case('render.json')
+def render_json(size):
+    from restornado.renderers import JSONRenderer
+    renderer = JSONRenderer()
+    data = [
+        {
+            'id': idx,
+            'uuid': uuid.UUID(int=idx),
+            'created': dt.datetime(2016, 1, 1, 12, 30, idx % 60, 123456),
+            'day': dt.date(2016, 1, 1 + idx % 28),
+            'at': dt.time(12, idx % 60),
+            'price': decimal.Decimal('12.34'),
+            'total': decimal.Decimal(idx) / 3,
+            'tags': ('a', 'b'),
+        }
+        for idx in range(size)
+    ]
+    return (lambda: renderer.render(data)), size
+
+
+@case('voluptuous.query')
+def voluptuous_query(size):
+    from restornado import voluptuous as vol
+    schema = vol.Schema({
+        vol.Optional('page', default=1): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional('per_page', default=20): vol.All(vol.Coerce(int), vol.Range(1, 100)),
+        vol.Optional('order'): vol.Any('asc', 'desc'),
+        vol.Optional('q'): vol.All(vol.Coerce(str), vol.Length(max=64)),
+    })
+    queries = [{'page': str(idx % 10 + 1), 'per_page': '50', 'order': 'asc', 'q': 'name'}
+               for idx in range(size)]
+    return (lambda: [schema(each) for each in queries]), size
+
+
+@case('voluptuous.body')
+def voluptuous_body(size):
+    from restornado import voluptuous as vol
+    schema = vol.Schema({
+        vol.Required('name'): vol.All(vol.Coerce(str), vol.Length(min=1, max=64)),
+        vol.Required('email'): vol.Match(r'^[^@]+@[^@]+$'),
+        vol.Optional('role', default='member'): vol.Any('admin', 'member'),
+        vol.Optional('tags', default=[]): [str],
+        vol.Optional('address'): {
+            vol.Required('street'): str,
+            vol.Required('city'): str,
+            vol.Optional('zip_code'): str,
+        },
+    })
+    bodies = [
+        {
+            'name': 'User {0}'.format(idx),
+            'email': 'user{0}@example.com'.format(idx),
+            'role': 'admin',
+            'tags': ['a', 'b'],
+            'address': {'street': 'Main Street', 'city': 'Shanghai', 'zip_code': '200000'},
+        }
+        for idx in range(size)
+    ]
+    return (lambda: [schema(each) for each in bodies]), size
+
+
+##### Runner #####
+
+def measure(run, count, repeat):
+    """Return ``(ops_per_sec, peak_bytes_per_op)`` for ``run``, which
+    processes ``count`` items per call.
+    """
+    run()  # Warm up caches and compiled functions
+    ops = count / min(timeit.repeat(run, number=1, repeat=repeat))
+    peak = None
+    if tracemalloc is not None:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1] / float(count)
+        tracemalloc.stop()
+    return ops, peak
+
+
+def run_cases(size, repeat, only=None):
+    """Run the registered cases whose name contains one of ``only`` and
+    return their results, keyed by case name.
+    """
+    results = OrderedDict()
+    for name, setup in CASES.items():
+        if only and not any(each in name for each in only):
+            continue
+        prepared = setup(size)
+        if prepared is None:
+            print('{0:<20} skipped (missing dependency)'.format(name))
+            continue
+        run, count = prepared
+        ops, peak = measure(run, count, repeat)
+        results[name] = {'ops_per_sec': ops, 'peak_bytes_per_op': peak}
+        print('{0:<20} {1:>12,.0f} ops/sec {2:>10} bytes/op'.format(
+            name, ops, '-' if peak is None else '{0:,.0f}'.format(peak)))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change of each case relative to ``baseline`` and return the
+    names of the cases which slowed down by more than ``threshold``.
+    """
+    regressions = []
+    print('\n{0:<20} {1:>12} {2:>12} {3:>8}'.format('case', 'baseline', 'current', 'change'))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['ops_per_sec']
+        change = result['ops_per_sec'] / before - 1
+        flag = ''
+        if change < -threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('{0:<20} {1:>12,.0f} {2:>12,.0f} {3:>+7.1%}{4}'.format(
+            name, before, result['ops_per_sec'], change, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200,
+                        help='number of items processed per run')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', action='append',
+                        help='only run cases whose name contains this string')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='slowdown ratio above which a case fails the comparison')
+    args = parser.parse_args(argv)
+
+    results = run_cases(args.size, args.repeat, only=args.only)
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump({
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'size': args.size,
+                'results': results,
+            }, fp, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('\n{0} case(s) slowed down by more than {1:.0%}: {2}'.format(
+                len(regressions), args.threshold, ', '.join(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""An in-process application mounting the generic views of
+:mod:`restornado.generic` over a generated SQLite dataset.
+
+:mod:`restornado.generic` imports its ``User``, ``Role`` and ``Permission``
+models from the application's ``modules.account.models`` module;
+:func:`install_models` registers SQLite-backed models under that name, so it
+must run before :mod:`restornado.generic` is imported.
+"""
+from __future__ import unicode_literals
+
+import datetime as dt
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy as sa
+import tornado.web
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+MODELS_MODULE = 'modules.account.models'
+
+#: Permission codes checked by the mounted views
+PERMISSIONS = {
+    'get': 'account.view',
+    'post': 'account.add',
+    'put': 'account.change',
+    'delete': 'account.delete',
+}
+
+
+def _make_models():
+    Base = declarative_base()
+
+    user_roles = sa.Table(
+        'account_user_roles', Base.metadata,
+        sa.Column('user_id', sa.ForeignKey('account_user.id'), primary_key=True),
+        sa.Column('role_id', sa.ForeignKey('account_role.id'), primary_key=True),
+    )
+    role_permissions = sa.Table(
+        'account_role_permissions', Base.metadata,
+        sa.Column('role_id', sa.ForeignKey('account_role.id'), primary_key=True),
+        sa.Column('permission_id', sa.ForeignKey('account_permission.id'),
+                  primary_key=True),
+    )
+
+    class User(Base):
+        __tablename__ = 'account_user'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String(64), nullable=False)
+        email = sa.Column(sa.String(128))
+        status = sa.Column(sa.Boolean, default=True)
+        created = sa.Column(sa.DateTime)
+        roles = relationship('Role', secondary=user_roles, backref='users')
+
+    class Role(Base):
+        __tablename__ = 'account_role'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String(64), nullable=False)
+        description = sa.Column(sa.String(255))
+        permissions = relationship('Permission', secondary=role_permissions,
+                                   backref='roles')
+
+    class Permission(Base):
+        __tablename__ = 'account_permission'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String(64), nullable=False)
+        perm_code = sa.Column(sa.String(64), nullable=False, index=True)
+
+    return Base, User, Role, Permission
+
+
+def install_models():
+    """Register the SQLite-backed models as ``modules.account.models`` and
+    return that module. Does nothing if the module is already registered.
+    """
+    if MODELS_MODULE in sys.modules:
+        return sys.modules[MODELS_MODULE]
+    parent = None
+    name = ''
+    for part in MODELS_MODULE.split('.'):
+        name = '.'.join([name, part]) if name else part
+        module = sys.modules.get(name)
+        if module is None:
+            module = sys.modules[name] = types.ModuleType(str(name))
+            module.__path__ = []
+        if parent is not None:
+            setattr(parent, part, module)
+        parent = module
+    module.Base, module.User, module.Role, module.Permission = _make_models()
+    return module
+
+
+def populate(session, models, users=1000, roles=20, permissions=40):
+    """Fill the database with ``users`` users, ``roles`` roles and
+    ``permissions`` permissions. User 1 is granted every permission in
+    `PERMISSIONS` through the first role.
+    """
+    codes = list(PERMISSIONS.values())
+    perms = [
+        models.Permission(id=idx, name='Permission {0}'.format(idx),
+                          perm_code=codes[idx - 1] if idx <= len(codes)
+                          else 'extra.{0}'.format(idx))
+        for idx in range(1, permissions + 1)
+    ]
+    role_objs = [
+        models.Role(id=idx, name='Role {0}'.format(idx),
+                    description='Generated role {0}'.format(idx),
+                    permissions=perms if idx == 1 else perms[idx % permissions::roles])
+        for idx in range(1, roles + 1)
+    ]
+    created = dt.datetime(2016, 1, 1)
+    session.add_all(perms + role_objs)
+    session.add_all(
+        models.User(id=idx, name='User {0}'.format(idx),
+                    email='user{0}@example.com'.format(idx), status=True,
+                    created=created + dt.timedelta(minutes=idx),
+                    roles=[role_objs[0]] if idx == 1 else role_objs[idx % roles:][:2])
+        for idx in range(1, users + 1)
+    )
+    session.commit()
+
+
+class TimedExecutor(ThreadPoolExecutor):
+    """Thread pool recording how long each task waited in the queue."""
+
+    def __init__(self, *args, **kwargs):
+        super(TimedExecutor, self).__init__(*args, **kwargs)
+        #: Queue times of the tasks run since the last call to `pop_queue_times`
+        self.queue_times = []
+
+    def submit(self, fn, *args, **kwargs):
+        queued = time.time()
+
+        def timed(*args, **kwargs):
+            self.queue_times.append(time.time() - queued)
+            return fn(*args, **kwargs)
+        return super(TimedExecutor, self).submit(timed, *args, **kwargs)
+
+    def pop_queue_times(self):
+        ret, self.queue_times = self.queue_times, []
+        return ret
+
+
+def make_app(models, workers=4, **settings):
+    """Return a Tornado application mounting list (from ORM instances and from
+    Core rows), retrieve, list/create, retrieve/update/destroy, upsert and
+    direct update/destroy views for the models of `install_models`, the
+    phase timing stats at ``/_stats`` and the profiler at ``/_profile``.
+    """
+    from marshmallow_sqlalchemy import ModelSchema
+    from restornado import generic
+    from restornado import voluptuous as vol
+    from restornado.database.statements import StatementStatsHandler
+    from restornado.profiling import ProfilerHandler
+    from restornado.timing import PhaseStatsHandler
+
+    class ViewSchema(ModelSchema):
+        """Accepts the extra context `GenericAPIView.get_schema` passes."""
+
+        def __init__(self, *args, **kwargs):
+            self.redis = kwargs.pop('redis', None)
+            self.view = kwargs.pop('view', None)
+            super(ViewSchema, self).__init__(*args, **kwargs)
+
+    class UserSchema(ViewSchema):
+        class Meta:
+            model = models.User
+
+    class UserRowSchema(ViewSchema):
+        class Meta:
+            model = models.User
+            exclude = ('roles', )
+
+    class RoleSchema(ViewSchema):
+        class Meta:
+            model = models.Role
+            exclude = ('users', )
+
+    role_body = vol.Schema({
+        vol.Required('name'): vol.All(vol.Coerce(str), vol.Length(min=1, max=64)),
+        vol.Optional('description'): vol.Coerce(str),
+    })
+
+    class UserListView(generic.ListAPIView):
+        model = models.User
+        schema_class = UserSchema
+        permissions = PERMISSIONS
+        cache_statements = True
+        pagination = True
+
+        def get_queryset(self, session):
+            return session.query(models.User).order_by(models.User.id)
+
+    class UserRowListView(UserListView):
+        schema_class = UserRowSchema
+        core_read = True
+
+    class UserDetailView(generic.RetrieveAPIView):
+        model = models.User
+        schema_class = UserSchema
+        permissions = PERMISSIONS
+        cache_statements = True
+
+        def get_queryset(self, session):
+            return session.query(models.User)
+
+    class RoleListCreateView(generic.ListCreateAPIView):
+        model = models.Role
+        schema_class = RoleSchema
+        schema = role_body
+        permissions = PERMISSIONS
+        cache_statements = True
+
+        def get_queryset(self, session):
+            return session.query(models.Role).order_by(models.Role.id)
+
+    class RoleDetailView(generic.RetrieveUpdateDestroyAPIView):
+        model = models.Role
+        schema_class = RoleSchema
+        schema = role_body
+        permissions = PERMISSIONS
+        cache_statements = True
+
+        def get_queryset(self, session):
+            return session.query(models.Role)
+
+    class RoleUpsertView(generic.CreateAPIView):
+        model = models.Role
+        schema_class = RoleSchema
+        schema = role_body.extend({vol.Required('id'): vol.Coerce(int)})
+        permissions = PERMISSIONS
+        upsert = True
+
+    class RoleUpsertDetailView(generic.UpdateAPIView):
+        model = models.Role
+        schema_class = RoleSchema
+        schema = role_body
+        permissions = PERMISSIONS
+        upsert = True
+
+    class RoleDirectDetailView(RoleDetailView):
+        direct = True
+
+    app = tornado.web.Application([
+        (r'/users', UserListView),
+        (r'/users/rows', UserRowListView),
+        (r'/users/(?P<id>\d+)', UserDetailView),
+        (r'/roles', RoleListCreateView),
+        (r'/roles/(?P<id>\d+)', RoleDetailView),
+        (r'/roles/upsert', RoleUpsertView),
+        (r'/roles/upsert/(?P<id>\d+)', RoleUpsertDetailView),
+        (r'/roles/direct/(?P<id>\d+)', RoleDirectDetailView),
+        (r'/_stats', PhaseStatsHandler),
+        (r'/_statements', StatementStatsHandler),
+        (r'/_profile', ProfilerHandler),
+    ], **settings)
+    app.executor = TimedExecutor(workers)
+    app.redis = None
+    return app
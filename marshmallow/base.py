@@ -9,6 +9,8 @@ import copy
 class FieldABC(object):
     """Abstract base class from which all Field classes inherit.
     """
+    __slots__ = ()
+
     parent = None
     name = None
 
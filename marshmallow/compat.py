@@ -37,6 +37,22 @@ else:
     from collections import OrderedDict
     OrderedDict = OrderedDict
 
+# Whether plain dicts preserve insertion order as part of the language
+ORDERED_DICTS = sys.version_info >= (3, 7)
+
+try:
+    from types import MappingProxyType
+except ImportError:  # Python 2
+    class MappingProxyType(dict):
+        """Read-only dictionary standing in for `types.MappingProxyType`."""
+
+        def _readonly(self, *args, **kwargs):
+            raise TypeError('{0!r} object does not support item assignment'
+                            .format(self.__class__.__name__))
+
+        __setitem__ = __delitem__ = _readonly
+        clear = pop = popitem = setdefault = update = _readonly
+
 
 # From six
 def with_metaclass(meta, *bases):
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+"""Code generation of specialized (de)serialization functions for a bound
+set of fields.
+
+The generated functions unroll the per-field loop of
+:class:`Marshaller <marshmallow.marshalling.Marshaller>` into straight-line
+code. Only the *shape* of a field set (which code path each field takes) is
+baked into the generated source, so schemas with the same shape share the
+compiled code and only pay for binding their own field objects.
+
+.. warning::
+
+    This module is treated as private API.
+    Users should not need to use this module directly.
+"""
+
+from __future__ import unicode_literals
+
+from marshmallow import utils
+from marshmallow.compat import iteritems
+from marshmallow.exceptions import ValidationError
+from marshmallow.fields import Field, Number
+from marshmallow.utils import missing
+
+__all__ = [
+    'Interrupted',
+    'dump_signature',
+    'compile_dump',
+    'load_signature',
+    'partial_key',
+    'compile_load',
+]
+
+# Field code paths
+GENERIC = 'generic'  # Call ``field.serialize``
+ATTRIBUTE = 'attribute'  # Inline ``Field.serialize`` with attribute lookup
+NO_ATTRIBUTE = 'no_attribute'  # Inline ``Field.serialize`` without attribute lookup
+PRESET = 'preset'  # Take the serialized value from the getter
+
+# Kinds of ``Field.default`` and ``Field.missing``
+DEFAULT_MISSING = 'missing'
+DEFAULT_CALLABLE = 'callable'
+DEFAULT_VALUE = 'value'
+
+# {<shape>: <factory function>}
+_dump_factories = {}
+_load_factories = {}
+
+
+class Interrupted(ValidationError):
+    """Raised by a generated function when a field fails, so that the caller
+    can carry on from that field without running the others again.
+
+    :param ValidationError error: The error raised by the field.
+    :param int position: Position of the field among the fields taking part.
+    :param output: The output of the fields before it.
+    """
+
+    def __init__(self, error, position, output):
+        ValidationError.__init__(
+            self, error.messages, field_names=error.field_names,
+            fields=error.fields, data=error.data,
+        )
+        self.error = error
+        self.position = position
+        self.output = output
+
+
+def _get_func(cls, name):
+    """Return the plain function ``cls.<name>`` resolves to."""
+    method = getattr(cls, name)
+    return getattr(method, '__func__', method)
+
+
+def _dump_kind(field_obj):
+    cls = type(field_obj)
+    serialize = _get_func(cls, 'serialize')
+    if serialize is Number.__dict__['serialize']:
+        # Number.serialize only differs from Field.serialize for as_string=True
+        if field_obj.as_string:
+            return GENERIC
+    elif serialize is not Field.__dict__['serialize']:
+        return GENERIC
+    if _get_func(cls, 'get_value') is not Field.__dict__['get_value']:
+        return GENERIC
+    return ATTRIBUTE if field_obj._CHECK_ATTRIBUTE else NO_ATTRIBUTE
+
+
+def _default_kind(field_obj, attr='default'):
+    default = getattr(field_obj, attr)
+    if default is missing:
+        return DEFAULT_MISSING
+    return DEFAULT_CALLABLE if callable(default) else DEFAULT_VALUE
+
+
+def dump_signature(fields_dict):
+    """Return a hashable value that changes whenever a dump function compiled
+    for ``fields_dict`` would have to be regenerated.
+    """
+    return tuple(
+        (attr_name, id(field_obj), field_obj.load_only, field_obj.dump_to,
+         getattr(field_obj, 'attribute', None), _default_kind(field_obj),
+         getattr(field_obj, 'as_string', False))
+        for attr_name, field_obj in iteritems(fields_dict)
+    )
+
+
+def _dump_field_source(kind, default_kind):
+    """Return the lines of ``dump`` that serialize a single field, with ``{0}``
+    standing in for the field's index.
+    """
+    if kind == GENERIC:
+        lines = ['value = f{0}.serialize(a{0}, obj, accessor=accessor)']
+    elif kind == PRESET:
+        lines = ['value = g{0}(obj, missing)']
+    elif kind == NO_ATTRIBUTE:
+        lines = ['value = s{0}(None, a{0}, obj)']
+    elif default_kind == DEFAULT_MISSING:
+        lines = [
+            'value = g{0}(obj, missing)',
+            'if value is not missing:',
+            '    value = s{0}(value, a{0}, obj)',
+        ]
+    else:
+        lines = [
+            'value = g{0}(obj, missing)',
+            'if value is missing:',
+            ('    value = f{0}.default()' if default_kind == DEFAULT_CALLABLE
+             else '    value = f{0}.default'),
+            'else:',
+            '    value = s{0}(value, a{0}, obj)',
+        ]
+    lines.extend([
+        'if value is not missing:',
+        '    ret[k{0}] = value',
+    ])
+    return _guarded(lines)
+
+
+def _guarded(lines):
+    """Wrap the lines of a single field in a ``try`` block raising
+    `Interrupted` with the output so far.
+    """
+    return ['try:'] + ['    ' + line for line in lines] + [
+        'except ValidationError as err:',
+        '    raise Interrupted(err, {0}, ret)',
+    ]
+
+
+def _dump_source(shape):
+    """Return the source of a factory which binds field objects to a dump
+    function for field sets of the given shape.
+    """
+    header = [
+        'def make_dump(fields, keys, attrs, getters, accessor, dict_class, missing):',
+    ]
+    body = []
+    for idx, (kind, default_kind) in enumerate(shape):
+        header.append('    f{0} = fields[{0}]'.format(idx))
+        header.append('    k{0} = keys[{0}]'.format(idx))
+        header.append('    a{0} = attrs[{0}]'.format(idx))
+        if kind in (ATTRIBUTE, NO_ATTRIBUTE):
+            header.append('    s{0} = f{0}._serialize'.format(idx))
+        if kind in (ATTRIBUTE, PRESET):
+            header.append('    g{0} = getters[{0}]'.format(idx))
+        body.extend(
+            '        ' + line.format(idx)
+            for line in _dump_field_source(kind, default_kind)
+        )
+    return '\n'.join(
+        header +
+        ['    def dump(obj):', '        ret = dict_class()'] +
+        body +
+        ['        return ret', '    return dump', '']
+    )
+
+
+def _get_factory(factories, shape, source_func, name):
+    try:
+        return factories[shape]
+    except KeyError:
+        namespace = {'ValidationError': ValidationError, 'Interrupted': Interrupted}
+        code = compile(source_func(shape), '<marshmallow {0}>'.format(name), 'exec')
+        exec(code, namespace)
+        factory = factories[shape] = namespace['make_{0}'.format(name)]
+        return factory
+
+
+def compile_dump(fields_dict, prefix='', accessor=None, dict_class=dict, getters=None,
+                 preset=()):
+    """Return a function that serializes a single object the same way
+    :meth:`Marshaller.serialize <marshmallow.marshalling.Marshaller.serialize>`
+    does, but without per-field bookkeeping. The function raises `Interrupted`
+    as soon as any field fails; callers are expected to store its error and
+    serialize the remaining fields with the generic path.
+
+    :param dict fields_dict: Mapping of field names to :class:`Field` objects.
+    :param str prefix: Optional prefix prepended to all the serialized field names.
+    :param callable accessor: Function to use for getting values from objects.
+    :param type dict_class: Dictionary class used to construct the output.
+    :param dict getters: Optional mapping of field names to ``getter(obj, default)``
+        functions used instead of ``accessor`` to get the values of these fields.
+    :param preset: Names of the fields in ``getters`` whose getters return the
+        serialized values, or `missing` to leave the field out.
+    """
+    overrides = getters or {}
+    shape, field_objs, keys, attrs, getters = [], [], [], [], []
+    for attr_name, field_obj in iteritems(fields_dict):
+        if getattr(field_obj, 'load_only', False):
+            continue
+        kind = PRESET if attr_name in preset else _dump_kind(field_obj)
+        shape.append((kind, _default_kind(field_obj)))
+        field_objs.append(field_obj)
+        keys.append(''.join([prefix or '', field_obj.dump_to or attr_name]))
+        attrs.append(attr_name)
+        getter = overrides.get(attr_name)
+        getters.append(getter or field_obj._value_getter(attr_name, accessor))
+    factory = _get_factory(_dump_factories, tuple(shape), _dump_source, 'dump')
+    return factory(
+        tuple(field_objs), tuple(keys), tuple(attrs), tuple(getters),
+        accessor, dict_class, missing,
+    )
+
+
+def _inline_load(field_obj):
+    """Whether ``Field.deserialize`` can be inlined for ``field_obj``."""
+    cls = type(field_obj)
+    return (
+        _get_func(cls, 'deserialize') is Field.__dict__['deserialize'] and
+        _get_func(cls, '_validate_missing') is Field.__dict__['_validate_missing']
+    )
+
+
+def _has_validation(field_obj):
+    """Whether ``Field._validate`` has any work to do for ``field_obj``."""
+    return (
+        bool(field_obj._validators) or
+        _get_func(type(field_obj), '_validate') is not Field.__dict__['_validate']
+    )
+
+
+def partial_key(partial):
+    """Return a hashable value describing the ``partial`` argument of
+    :meth:`Unmarshaller.deserialize <marshmallow.marshalling.Unmarshaller.deserialize>`.
+    """
+    if partial is True:
+        return True
+    if utils.is_collection(partial):
+        return frozenset(partial)
+    return False
+
+
+def load_signature(fields_dict):
+    """Return a hashable value that changes whenever a load function compiled
+    for ``fields_dict`` would have to be regenerated.
+    """
+    return tuple(
+        (attr_name, id(field_obj), field_obj.dump_only, field_obj.load_from,
+         field_obj.attribute, field_obj.required, field_obj.allow_none is True,
+         _default_kind(field_obj, 'missing'), _has_validation(field_obj))
+        for attr_name, field_obj in iteritems(fields_dict)
+    )
+
+
+def _load_field_source(inline, has_load_from, skip_missing, missing_kind,
+                       required, allow_none, validate):
+    """Return the lines of ``load`` that deserialize a single field, with ``{0}``
+    standing in for the field's index.
+    """
+    lines = ['raw = get(n{0}, missing)']
+    if has_load_from:
+        lines.extend([
+            'if raw is missing:',
+            '    raw = get(l{0}, missing)',
+        ])
+    if not skip_missing and missing_kind != DEFAULT_MISSING:
+        lines.extend([
+            'if raw is missing:',
+            ('    raw = f{0}.missing()' if missing_kind == DEFAULT_CALLABLE
+             else '    raw = f{0}.missing'),
+        ])
+    wrapped = skip_missing or not required
+    if inline:
+        block = []
+        if not wrapped:
+            block.extend([
+                'if raw is missing:',
+                "    f{0}.fail('required')",
+            ])
+        block.append('if raw is None:')
+        block.append('    value = None' if allow_none else "    f{0}.fail('null')")
+        block.extend([
+            'else:',
+            '    value = d{0}(raw, a{0}, data)',
+        ])
+        if validate:
+            block.append('    v{0}(value)')
+    else:
+        block = ['value = f{0}.deserialize(raw, a{0}, data)']
+    block.extend([
+        'if value is not missing:',
+        '    ret[k{0}] = value',
+    ])
+    if wrapped:
+        return _guarded(
+            lines + ['if raw is not missing:'] + ['    ' + line for line in block])
+    return _guarded(lines + block)
+
+
+def _load_source(shape):
+    """Return the source of a factory which binds field objects to a load
+    function for field sets of the given shape.
+    """
+    header = [
+        'def make_load(fields, names, load_froms, attrs, keys, dict_class, missing):',
+    ]
+    body = []
+    for idx, field_shape in enumerate(shape):
+        inline, has_load_from, validate = field_shape[0], field_shape[1], field_shape[6]
+        header.append('    f{0} = fields[{0}]'.format(idx))
+        header.append('    n{0} = names[{0}]'.format(idx))
+        header.append('    a{0} = attrs[{0}]'.format(idx))
+        header.append('    k{0} = keys[{0}]'.format(idx))
+        if has_load_from:
+            header.append('    l{0} = load_froms[{0}]'.format(idx))
+        if inline:
+            header.append('    d{0} = f{0}._deserialize'.format(idx))
+            if validate:
+                header.append('    v{0} = f{0}._validate'.format(idx))
+        body.extend(
+            '        ' + line.format(idx)
+            for line in _load_field_source(*field_shape)
+        )
+    return '\n'.join(
+        header +
+        [
+            '    def load(data):',
+            '        try:',
+            '            get = data.get',
+            '        except AttributeError:',
+            '            return None',
+            '        ret = dict_class()',
+        ] +
+        body +
+        ['        return ret', '    return load', '']
+    )
+
+
+def compile_load(fields_dict, partial=False, dict_class=dict):
+    """Return a function that deserializes a single item the same way
+    :meth:`Unmarshaller.deserialize <marshmallow.marshalling.Unmarshaller.deserialize>`
+    does, but with the field loop unrolled and key lookups, partial,
+    required and allow_none checks resolved ahead of time. The function
+    raises `Interrupted` as soon as any field fails; callers are expected to
+    store its error and deserialize the remaining fields with the generic
+    path. It returns `None` if the item is not a dictionary, which the
+    generic path reports.
+
+    :param dict fields_dict: Mapping of field names to :class:`Field` objects.
+    :param bool|tuple partial: Whether to ignore missing fields. If its
+        value is an iterable, only missing fields listed in that iterable
+        will be ignored.
+    :param type dict_class: Dictionary class used to construct the output.
+    """
+    partial = partial_key(partial)
+    shape, field_objs, names, load_froms, attrs, keys = [], [], [], [], [], []
+    for attr_name, field_obj in iteritems(fields_dict):
+        if field_obj.dump_only:
+            continue
+        skip_missing = partial is True or (
+            isinstance(partial, frozenset) and attr_name in partial
+        )
+        shape.append((
+            _inline_load(field_obj),
+            bool(field_obj.load_from),
+            skip_missing,
+            _default_kind(field_obj, 'missing'),
+            bool(field_obj.required),
+            field_obj.allow_none is True,
+            _has_validation(field_obj),
+        ))
+        field_objs.append(field_obj)
+        names.append(attr_name)
+        load_froms.append(field_obj.load_from)
+        attrs.append(field_obj.load_from or attr_name)
+        keys.append(field_obj.attribute or attr_name)
+    factory = _get_factory(_load_factories, tuple(shape), _load_source, 'load')
+    return factory(
+        tuple(field_objs), tuple(names), tuple(load_froms), tuple(attrs),
+        tuple(keys), dict_class, missing,
+    )
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """Exception classes for marshmallow-related errors."""
 
-from marshmallow.compat import basestring
+from marshmallow.compat import basestring, iteritems
 
 class MarshmallowError(Exception):
     """Base class for all marshmallow-related errors."""
@@ -41,6 +41,26 @@ class ValidationError(MarshmallowError):
         MarshmallowError.__init__(self, message)
 
 
+class ColumnError(ValidationError):
+    """Raised by :meth:`Field.serialize_many <marshmallow.fields.Field.serialize_many>`
+    when some of the values fail to serialize.
+
+    :param dict errors: Mapping of the positions of the failing values to
+        their `ValidationError`.
+    :param list data: The serialized values, with `None` at the failing
+        positions.
+    """
+
+    def __init__(self, errors, data):
+        #: Mapping of the positions of the failing values to their `ValidationError`.
+        self.errors = errors
+        ValidationError.__init__(
+            self,
+            dict((position, err.messages) for position, err in iteritems(errors)),
+            data=data,
+        )
+
+
 class RegistryError(NameError):
     """Raised when an invalid operation is performed on the serializer
     class registry.
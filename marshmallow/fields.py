@@ -3,18 +3,21 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import bisect
 import collections
+import copy
 import datetime as dt
 import uuid
 import warnings
 import decimal
+import functools
 from operator import attrgetter
 
 from marshmallow import validate, utils, class_registry
 from marshmallow.base import FieldABC, SchemaABC
 from marshmallow.utils import missing as missing_
-from marshmallow.compat import text_type, basestring
-from marshmallow.exceptions import ValidationError
+from marshmallow.compat import text_type, basestring, iteritems, MappingProxyType
+from marshmallow.exceptions import ValidationError, ColumnError
 
 __all__ = [
     'Field',
@@ -53,6 +56,150 @@ MISSING_ERROR_MESSAGE = (
 _RECURSIVE_NESTED = 'self'
 
 
+# {<field class>: <read-only merged default error messages>}
+_default_error_messages = {}
+
+
+def _get_default_error_messages(field_class):
+    """Return the `default_error_messages` of ``field_class`` and its parent
+    classes merged into a single read-only mapping.
+    """
+    try:
+        return _default_error_messages[field_class]
+    except KeyError:
+        messages = {}
+        for cls in reversed(field_class.__mro__):
+            messages.update(getattr(cls, 'default_error_messages', {}))
+        ret = _default_error_messages[field_class] = MappingProxyType(messages)
+        return ret
+
+
+# {<field class>: <names of the slots of its instances>}
+_slot_names = {}
+
+
+def _get_slot_names(field_class):
+    """Return the (mangled) names of all the slots of ``field_class``."""
+    try:
+        return _slot_names[field_class]
+    except KeyError:
+        names = []
+        for cls in field_class.__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            if isinstance(slots, basestring):
+                slots = (slots, )
+            for name in slots:
+                if name.startswith('__') and not name.endswith('__'):
+                    name = '_{0}{1}'.format(cls.__name__.lstrip('_'), name)
+                if name not in ('__dict__', '__weakref__'):
+                    names.append(name)
+        ret = _slot_names[field_class] = tuple(names)
+        return ret
+
+
+#: Options of the fields which the dump and load plans of schemas depend on
+_PLAN_OPTIONS = frozenset([
+    'default', 'attribute', 'load_from', 'dump_to', '_validators', 'required',
+    'allow_none', 'load_only', 'dump_only', 'missing', 'as_string',
+])
+
+
+#: `Field._validators` of the fields constructed without validators, until
+#: `Field.validators` is first read
+_NO_VALIDATORS = ()
+
+
+class _ValidatorList(list):
+    """List of the validators of a field. It counts its modifications in
+    `version`, so that the validator chain compiled from it only has to be
+    compared with the version, not with a copy of the list, on each call.
+    """
+
+    version = 0
+
+
+def _counting_modifications(name):
+    method = getattr(list, name)
+
+    def modify(self, *args, **kwargs):
+        self.version += 1
+        Field._options_changes += 1
+        return method(self, *args, **kwargs)
+    modify.__name__ = name
+    return modify
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort',
+              'reverse', '__setitem__', '__delitem__', '__iadd__', '__imul__',
+              '__setslice__', '__delslice__'):
+    if hasattr(list, _name):
+        setattr(_ValidatorList, _name, _counting_modifications(_name))
+del _name
+
+
+def _validator_list(validators):
+    """Return ``validators`` as a list whose modifications are counted;
+    tuples, which cannot be modified, are kept as they are.
+    """
+    if isinstance(validators, (tuple, _ValidatorList)):
+        return validators
+    return _ValidatorList(validators)
+
+
+def _validate_nothing(value, field):
+    pass
+
+
+def _chain_validators(validators):
+    """Return a ``validate(value, field)`` function which runs each of
+    ``validators`` on ``value`` and raises a single :exc:`ValidationError`
+    with all of their messages if any of them fails.
+    """
+    if not validators:
+        return _validate_nothing
+
+    if len(validators) == 1:
+        validator = validators[0]
+
+        def validate(value, field):
+            try:
+                if validator(value) is False:
+                    field.fail('validator_failed')
+            except ValidationError as err:
+                messages = err.messages
+            else:
+                return
+            if isinstance(messages, dict):
+                raise ValidationError([messages])
+            if messages:
+                raise ValidationError(list(messages))
+        return validate
+
+    def validate(value, field):
+        errors = None
+        for validator in validators:
+            try:
+                if validator(value) is False:
+                    field.fail('validator_failed')
+            except ValidationError as err:
+                if errors is None:
+                    errors = []
+                if isinstance(err.messages, dict):
+                    errors.append(err.messages)
+                else:
+                    errors.extend(err.messages)
+        if errors:
+            raise ValidationError(errors)
+    return validate
+
+
+def _uses_methods_of(field_obj, cls, *names):
+    """Return True if ``field_obj`` uses the implementation of each of the
+    methods in ``names`` that ``cls`` does.
+    """
+    field_class = type(field_obj)
+    return all(getattr(field_class, name) == getattr(cls, name) for name in names)
+
+
 class Field(FieldABC):
     """Basic field from which other fields should extend. It applies no
     formatting by default, and should only be used in cases where
@@ -106,11 +253,22 @@ class Field(FieldABC):
         ``default`` value is only used if explicitly set. Otherwise, missing values
         inputs are excluded from serialized output.
     """
+
+    # __dict__ keeps arbitrary attributes working, as on any other object;
+    # it is only allocated for the fields which get one
+    __slots__ = ('default', 'attribute', 'load_from', 'dump_to', 'validate', '_validators',
+                 'required', 'allow_none', 'load_only', 'dump_only', 'missing',
+                 'metadata', '_error_messages', 'parent', 'name', '_creation_index',
+                 '_accessor', '_validator_chain', '__dict__', '__weakref__')
+
     # Some fields, such as Method fields and Function fields, are not expected
     #  to exists as attributes on the objects to serialize. Set this to False
     #  for those fields
     _CHECK_ATTRIBUTE = True
-    _creation_index = 0  # Used for sorting
+    _creation_counter = 0  # Used for sorting
+    #: Number of changes to the options of fields bound to a schema, which
+    #: tells schemas to build their dump and load plans again
+    _options_changes = 0
 
     #: Default error messages for various kinds of errors. The keys in this dictionary
     #: are passed to `Field.fail`. The values are error messages passed to
@@ -125,20 +283,20 @@ class Field(FieldABC):
     def __init__(self, default=missing_, attribute=None, load_from=None, dump_to=None,
                  error=None, validate=None, required=False, allow_none=None, load_only=False,
                  dump_only=False, missing=missing_, error_messages=None, **metadata):
+        # Bound first, so that setting the options below is not counted in
+        # `_options_changes`
+        self.parent = FieldABC.parent
         self.default = default
         self.attribute = attribute
         self.load_from = load_from  # this flag is used by Unmarshaller
         self.dump_to = dump_to  # this flag is used by Marshaller
         self.validate = validate
         if utils.is_iterable_but_not_string(validate):
-            if not utils.is_generator(validate):
-                self.validators = validate
-            else:
-                self.validators = list(validate)
+            self._validators = _validator_list(validate)
         elif callable(validate):
-            self.validators = [validate]
+            self._validators = _ValidatorList([validate])
         elif validate is None:
-            self.validators = []
+            self._validators = _NO_VALIDATORS
         else:
             raise ValueError("The 'validate' parameter must be a callable "
                              "or a collection of callables.")
@@ -156,16 +314,89 @@ class Field(FieldABC):
         self.dump_only = dump_only
         self.missing = missing
         self.metadata = metadata
-        self._creation_index = Field._creation_index
-        Field._creation_index += 1
-        self.parent = FieldABC.parent
+        self._creation_index = Field._creation_counter
+        Field._creation_counter += 1
+        self.name = FieldABC.name
+        #: `utils.Accessor` compiled when the field is bound to a schema
+        self._accessor = None
+        #: ``(validators, version, validate)`` compiled from `validators` on
+        #: first use
+        self._validator_chain = None
+
+        # Default error messages are shared by all the instances of a class
+        # until `error_messages` is first read; fields with overrides get
+        # their own dictionary right away
+        messages = _get_default_error_messages(self.__class__)
+        if error_messages:
+            messages = dict(messages)
+            messages.update(error_messages)
+        self._error_messages = messages
+
+    def __setattr__(self, name, value):
+        if name in _PLAN_OPTIONS and getattr(self, 'parent', None) is not None and \
+                getattr(self, name, missing_) is not value:
+            Field._options_changes += 1
+        object.__setattr__(self, name, value)
 
-        # Collect default error message from self and parent classes
-        messages = {}
-        for cls in reversed(self.__class__.__mro__):
-            messages.update(getattr(cls, 'default_error_messages', {}))
-        messages.update(error_messages or {})
-        self.error_messages = messages
+    @property
+    def validators(self):
+        """List of the validators of the field."""
+        validators = self._validators
+        if validators is _NO_VALIDATORS:
+            # Copy on first use, since the caller may modify the list
+            validators = self._validators = _ValidatorList()
+        return validators
+
+    @validators.setter
+    def validators(self, value):
+        self._validators = _validator_list(value)
+
+    @property
+    def error_messages(self):
+        """Dictionary of the error messages of the field, by `fail` key."""
+        messages = self._error_messages
+        if not isinstance(messages, dict):
+            # Copy on first use, since the caller may modify the dictionary
+            messages = self._error_messages = dict(messages)
+        return messages
+
+    @error_messages.setter
+    def error_messages(self, value):
+        self._error_messages = value
+
+    def __copy__(self):
+        cls = self.__class__
+        ret = cls.__new__(cls)
+        for name in _get_slot_names(cls):
+            try:
+                value = getattr(self, name)
+            except AttributeError:  # Unset slot
+                continue
+            object.__setattr__(ret, name, value)
+        attrs = self.__dict__
+        if attrs:
+            ret.__dict__.update(attrs)
+        return ret
+
+    def __getstate__(self):
+        cls = self.__class__
+        state = {}
+        for name in _get_slot_names(cls):
+            try:
+                state[name] = getattr(self, name)
+            except AttributeError:  # Unset slot
+                continue
+        # Compiled functions cannot be pickled; they are compiled again on use
+        state['_accessor'] = state['_validator_chain'] = None
+        if state.get('_error_messages') is _get_default_error_messages(cls):
+            del state['_error_messages']
+        state.update(self.__dict__)
+        return state
+
+    def __setstate__(self, state):
+        self._error_messages = _get_default_error_messages(self.__class__)
+        for name, value in iteritems(state):
+            object.__setattr__(self, name, value)
 
     def __repr__(self):
         return ('<fields.{ClassName}(default={self.default!r}, '
@@ -173,41 +404,64 @@ class Field(FieldABC):
                 'validate={self.validate}, required={self.required}, '
                 'load_only={self.load_only}, dump_only={self.dump_only}, '
                 'missing={self.missing}, allow_none={self.allow_none}, '
-                'error_messages={self.error_messages})>'
-                .format(ClassName=self.__class__.__name__, self=self))
+                'error_messages={messages})>'
+                .format(ClassName=self.__class__.__name__, self=self,
+                        messages=dict(self._error_messages)))
 
     def get_value(self, attr, obj, accessor=None, default=missing_):
         """Return the value for a given key from an object."""
         # NOTE: Use getattr instead of direct attribute access here so that
         # subclasses aren't required to define `attribute` member
         attribute = getattr(self, 'attribute', None)
-        accessor_func = accessor or utils.get_value
         check_key = attr if attribute is None else attribute
-        return accessor_func(check_key, obj, default)
+        if accessor:
+            return accessor(check_key, obj, default)
+        compiled = getattr(self, '_accessor', None)
+        if compiled is not None and compiled.key == check_key:
+            return compiled(obj, default)
+        return utils.get_value(check_key, obj, default)
+
+    def _value_getter(self, attr, accessor=None):
+        """Return a ``getter(obj, default)`` function equivalent to
+        ``Field.get_value(self, attr, obj, accessor, default)``.
+        """
+        attribute = getattr(self, 'attribute', None)
+        check_key = attr if attribute is None else attribute
+        if accessor:
+            return functools.partial(accessor, check_key)
+        compiled = getattr(self, '_accessor', None)
+        if compiled is not None and compiled.key == check_key:
+            return compiled
+        return utils.get_accessor(check_key)
 
     def _validate(self, value):
         """Perform validation on ``value``. Raise a :exc:`ValidationError` if validation
         does not succeed.
         """
-        errors = []
-        for validator in self.validators:
-            try:
-                if validator(value) is False:
-                    self.fail('validator_failed')
-            except ValidationError as err:
-                if isinstance(err.messages, dict):
-                    errors.append(err.messages)
-                else:
-                    errors.extend(err.messages)
-        if errors:
-            raise ValidationError(errors)
+        chain = self._validator_chain
+        validators = self._validators
+        if (chain is None or chain[0] is not validators or
+                # Lists may have been modified in place
+                chain[1] != getattr(validators, 'version', 0)):
+            chain = self._compile_validators()
+        chain[2](value, self)
+
+    def _compile_validators(self):
+        """Compile `validators` into a single ``validate(value, field)`` function
+        and cache it until `validators` is replaced or modified.
+        """
+        validators = self._validators
+        chain = self._validator_chain = (
+            validators, getattr(validators, 'version', 0),
+            _chain_validators(tuple(validators)))
+        return chain
 
     # Hat tip to django-rest-framework.
     def fail(self, key, **kwargs):
         """A helper method that simply raises a `ValidationError`.
         """
         try:
-            msg = self.error_messages[key]
+            msg = self._error_messages[key]
         except KeyError:
             class_name = self.__class__.__name__
             msg = MISSING_ERROR_MESSAGE.format(class_name=class_name, key=key)
@@ -248,6 +502,63 @@ class Field(FieldABC):
             value = None
         return self._serialize(value, attr, obj)
 
+    def serialize_many(self, attr, objs, accessor=None):
+        """Serialize the value for the given key from each object in ``objs``.
+        Used by :meth:`Schema.dump <marshmallow.Schema.dump>` when the
+        ``columnar`` class Meta option is set.
+
+        Returns the same list as calling `serialize` on each object, which is
+        what the default implementation does. Subclasses may override this to
+        do per-call work once per column instead of once per object.
+
+        :param str attr: The attibute or key to get from the objects.
+        :param objs: Sequence of objects to pull the key from.
+        :param callable accessor: Function used to pull values from ``objs``.
+        :raise ColumnError: If any of the values cannot be serialized, after
+            serializing the others.
+        """
+        serialize = self.serialize
+        ret, errors = [], {}
+        append = ret.append
+        for position, obj in enumerate(objs):
+            try:
+                append(serialize(attr, obj, accessor=accessor))
+            except ValidationError as err:
+                errors[position] = err
+                append(None)
+        if errors:
+            raise ColumnError(errors, ret)
+        return ret
+
+    def _batches_column(self):
+        """Whether `serialize_many` does enough per-call work once per column
+        for schemas which are not ``columnar`` to call it too.
+        """
+        return False
+
+    def _serialize_values(self, attr, objs, accessor, serialize_value):
+        """Same as the default `serialize_many` with ``serialize_value(value)``
+        in place of ``self._serialize(value, attr, obj)``.
+        """
+        get_value = self._value_getter(attr, accessor)
+        default = getattr(self, 'default', missing_)
+        if callable(default):
+            get_default = default
+        else:
+            get_default = lambda: default
+        ret, errors = [], {}
+        append = ret.append
+        for position, obj in enumerate(objs):
+            value = get_value(obj, missing_)
+            try:
+                append(get_default() if value is missing_ else serialize_value(value))
+            except ValidationError as err:
+                errors[position] = err
+                append(None)
+        if errors:
+            raise ColumnError(errors, ret)
+        return ret
+
     def deserialize(self, value, attr=None, data=None):
         """Deserialize ``value``.
 
@@ -274,6 +585,9 @@ class Field(FieldABC):
         """
         self.parent = self.parent or schema
         self.name = self.name or field_name
+        self._accessor = utils.get_accessor(
+            field_name if self.attribute is None else self.attribute
+        )
 
     def _serialize(self, value, attr, obj):
         """Serializes ``value`` to a basic Python datatype. Noop by default.
@@ -326,7 +640,8 @@ class Field(FieldABC):
 
 class Raw(Field):
     """Field that applies no formatting or validation."""
-    pass
+
+    __slots__ = ()
 
 class Nested(Field):
     """Allows you to nest a :class:`Schema <marshmallow.Schema>`
@@ -353,19 +668,30 @@ class Nested(Field):
         value will be returned as output instead of a dictionary.
         This parameter takes precedence over ``exclude``.
     :param bool many: Whether the field is a collection of objects.
+    :param int max_depth: With ``"self"``, the number of nested levels to
+        serialize. The field is left out of the output of deeper levels.
+        If `None`, there is no limit.
+    :param bool report_errors: Whether to report the errors of serializing
+        the nested objects as errors of this field. By default they are left
+        out, and the output holds whatever the nested schema serialized.
     :param kwargs: The same keyword arguments that :class:`Field` receives.
     """
 
+    __slots__ = ('nested', 'only', 'exclude', 'many', 'max_depth',
+                 'report_errors', '__schema', '__updated_fields')
+
     default_error_messages = {
         'type': 'Invalid type.',
     }
 
     def __init__(self, nested, default=missing_, exclude=tuple(), only=None,
-                many=False, **kwargs):
+                many=False, max_depth=None, report_errors=False, **kwargs):
         self.nested = nested
         self.only = only
         self.exclude = exclude
         self.many = many
+        self.max_depth = max_depth
+        self.report_errors = report_errors
         self.__schema = None  # Cached Schema instance
         self.__updated_fields = False
         super(Nested, self).__init__(default=default, **kwargs)
@@ -391,9 +717,15 @@ class Nested(Field):
                         only=only, exclude=self.exclude)
             elif isinstance(self.nested, basestring):
                 if self.nested == _RECURSIVE_NESTED:
-                    parent_class = self.parent.__class__
-                    self.__schema = parent_class(many=self.many, only=only,
-                            exclude=self.exclude)
+                    parent = self.parent
+                    if self._parent_depth and \
+                            (parent.only, parent.exclude) == (only, self.exclude):
+                        # Built the same way as the parent: share its fields
+                        self.__schema = parent._copy_for_recursion(many=self.many)
+                    else:
+                        self.__schema = parent.__class__(many=self.many, only=only,
+                                exclude=self.exclude)
+                    self.__schema._recursion_depth = self._parent_depth + 1
                 else:
                     schema_class = class_registry.get_class(self.nested)
                     self.__schema = schema_class(many=self.many,
@@ -403,10 +735,108 @@ class Nested(Field):
                                  'Schema, not {0}.'.format(self.nested.__class__))
         self.__schema.ordered = getattr(self.parent, 'ordered', False)
         # Inherit context from parent
-        self.__schema.context.update(getattr(self.parent, 'context', {}))
+        context = getattr(self.parent, 'context', None)
+        if context:
+            self.__schema.context.update(context)
         return self.__schema
 
+    @property
+    def _parent_depth(self):
+        """Number of ``"self"`` nestings above the parent schema."""
+        return getattr(self.parent, '_recursion_depth', 0)
+
+    def _too_deep(self):
+        return (self.max_depth is not None and self.nested == _RECURSIVE_NESTED and
+                self._parent_depth >= self.max_depth)
+
+    def _copy_for_recursion(self):
+        """Return an unbound copy of this field, without its nested schema."""
+        field_obj = copy.copy(self)
+        field_obj.parent = None
+        field_obj.__schema = None
+        field_obj.__updated_fields = False
+        return field_obj
+
+    def _batches_column(self):
+        return _uses_methods_of(self, Nested, 'serialize', 'get_value', '_serialize') and \
+            not self._too_deep()
+
+    def serialize_many(self, attr, objs, accessor=None):
+        """Serialize the nested objects of all the objects in ``objs`` with a
+        single call to the nested schema's `dump <marshmallow.Schema.dump>`,
+        then split the output back per object.
+        """
+        if not self._batches_column():
+            return super(Nested, self).serialize_many(attr, objs, accessor=accessor)
+        schema = self.schema
+        get_value = self._value_getter(attr, accessor)
+        values = [get_value(obj, missing_) for obj in objs]
+        get_default = self.default if callable(self.default) else lambda: self.default
+        ret, children, slices = [], [], []
+        first = missing_
+        # Reported errors of the children must be told apart to find their
+        # parents
+        batch = schema._get_dump_plan().batches and \
+            (schema.opts.index_errors or not self.report_errors)
+        for value in values:
+            if value is missing_:
+                ret.append(get_default())
+                continue
+            if value is not None:
+                if first is missing_:
+                    first = value
+                if self.many and utils.is_collection(value):
+                    value = list(value)
+                elif not self.many and (utils.is_keyed_tuple(value) or
+                                        not utils.is_collection(value)):
+                    value = [value]
+                else:  # Let `dump` handle (or warn about) unexpected input
+                    batch = False
+                slices.append((len(ret), len(children), len(children) + len(value)))
+                children.extend(value)
+            ret.append(None)
+        if not batch:
+            ret, errors = [], {}
+            for position, (value, obj) in enumerate(zip(values, objs)):
+                try:
+                    ret.append(get_default() if value is missing_
+                               else self._serialize(value, attr, obj))
+                except ValidationError as err:
+                    errors[position] = err
+                    ret.append(None)
+            if errors:
+                raise ColumnError(errors, ret)
+            return ret
+        if not slices:
+            return ret
+        if not self.__updated_fields:
+            schema._update_fields(obj=first, many=self.many)
+            self.__updated_fields = True
+        data, errors = schema.dump(children, many=True, update_fields=False)
+        failed = {}
+        if errors and self.report_errors:
+            # Group the errors by parent, keyed by index among its children
+            starts = [start for _, start, _ in slices]
+            for index, messages in iteritems(errors):
+                slot = bisect.bisect_right(starts, index) - 1
+                failed.setdefault(slot, {})[index - starts[slot]] = messages
+        column_errors = {}
+        for slot, (position, start, stop) in enumerate(slices):
+            items = data[start:stop]
+            if isinstance(self.only, basestring):  # self.only is a field name
+                items = [self._pluck(item, errors) for item in items]
+            ret[position] = items if self.many else items[0]
+            if slot in failed:
+                messages = failed[slot] if self.many else failed[slot][0]
+                column_errors[position] = ValidationError(
+                    messages, data=ret[position])
+        if column_errors:
+            raise ColumnError(column_errors, ret)
+        return ret
+
     def _serialize(self, nested_obj, attr, obj):
+        if self._too_deep():
+            return missing_
         # Load up the schema first. This allows a RegistryError to be raised
         # if an invalid schema name was passed
         schema = self.schema
@@ -415,15 +845,24 @@ class Nested(Field):
         if not self.__updated_fields:
             schema._update_fields(obj=nested_obj, many=self.many)
             self.__updated_fields = True
-        ret = schema.dump(nested_obj, many=self.many,
-                update_fields=not self.__updated_fields).data
+        ret, errors = schema.dump(nested_obj, many=self.many,
+                update_fields=not self.__updated_fields)
         if isinstance(self.only, basestring):  # self.only is a field name
             if self.many:
-                return utils.pluck(ret, key=self.only)
+                ret = [self._pluck(each, errors) for each in ret]
             else:
-                return ret[self.only]
+                ret = self._pluck(ret, errors)
+        if errors and self.report_errors:
+            raise ValidationError(errors, data=ret)
         return ret
 
+    def _pluck(self, item, errors):
+        """Return the value of the `only` field in ``item``, a nested object
+        serialized by the nested schema. If serializing the nested objects
+        failed, the items without the field give `None`.
+        """
+        return item.get(self.only) if errors else item[self.only]
+
     def _deserialize(self, value, attr, data):
         if self.many and not utils.is_collection(value):
             self.fail('type', input=value, type=value.__class__.__name__)
@@ -487,6 +926,9 @@ class List(Field):
         The ``allow_none`` parameter now applies to deserialization and
         has the same semantics as the other fields.
     """
+
+    __slots__ = ('container', )
+
     default_error_messages = {
         'invalid': 'Not a valid list.',
     }
@@ -522,6 +964,8 @@ class List(Field):
         super(List, self)._add_to_schema(field_name, schema)
         self.container.parent = self
         self.container.name = field_name
+        if self.container.attribute:
+            self.container._accessor = utils.get_accessor(self.container.attribute)
 
     def _serialize(self, value, attr, obj):
         if value is None:
@@ -543,6 +987,8 @@ class String(Field):
     :param kwargs: The same keyword arguments that :class:`Field` receives.
     """
 
+    __slots__ = ()
+
     default_error_messages = {
         'invalid': 'Not a valid string.'
     }
@@ -563,6 +1009,9 @@ class String(Field):
 
 class UUID(String):
     """A UUID field."""
+
+    __slots__ = ()
+
     default_error_messages = {
         'invalid_guid': 'Not a valid UUID.'
     }
@@ -581,6 +1030,8 @@ class Number(Field):
     :param kwargs: The same keyword arguments that :class:`Field` receives.
     """
 
+    __slots__ = ('as_string', )
+
     num_type = float
     default_error_messages = {
         'invalid': 'Not a valid number.'
@@ -612,6 +1063,47 @@ class Number(Field):
         ret = Field.serialize(self, attr, obj, accessor=accessor)
         return str(ret) if (self.as_string and ret is not None) else ret
 
+    #: Kinds of NumPy arrays whose `tolist` gives the same values as `num_type`
+    ARRAY_KINDS = {int: 'iu', float: 'f'}
+
+    def serialize_many(self, attr, objs, accessor=None):
+        """Serialize a column of numbers. If ``objs`` is a NumPy structured
+        array, the column is converted with a single `tolist` call.
+        """
+        if not _uses_methods_of(self, Number, 'serialize', 'get_value', '_serialize',
+                                '_validated', '_format_num'):
+            return super(Number, self).serialize_many(attr, objs, accessor=accessor)
+        attribute = getattr(self, 'attribute', None)
+        column = None
+        if not accessor:
+            column = utils.get_array_column(objs, attr if attribute is None else attribute)
+        if column is not None and column.dtype.kind in self.ARRAY_KINDS.get(self.num_type, ''):
+            ret = column.tolist()
+        else:
+            num_type = self.num_type
+
+            def serialize_value(value):
+                if value is None:
+                    return None
+                try:
+                    return num_type(value)
+                except (TypeError, ValueError):
+                    self.fail('invalid')
+
+            try:
+                ret = self._serialize_values(attr, objs, accessor, serialize_value)
+            except ColumnError as err:
+                if self.as_string:
+                    err.data = self._as_strings(err.data)
+                raise
+        if self.as_string:
+            return self._as_strings(ret)
+        return ret
+
+    @staticmethod
+    def _as_strings(values):
+        return [str(each) if each is not None else each for each in values]
+
     def _serialize(self, value, attr, obj):
         return self._validated(value)
 
@@ -625,6 +1117,8 @@ class Integer(Number):
     :param kwargs: The same keyword arguments that :class:`Number` receives.
     """
 
+    __slots__ = ()
+
     num_type = int
     default_error_messages = {
         'invalid': 'Not a valid integer.'
@@ -658,6 +1152,8 @@ class Decimal(Number):
     .. versionadded:: 1.2.0
     """
 
+    __slots__ = ('places', 'rounding', 'allow_nan')
+
     num_type = decimal.Decimal
 
     default_error_messages = {
@@ -702,6 +1198,9 @@ class Boolean(Field):
 
     :param kwargs: The same keyword arguments that :class:`Field` receives.
     """
+
+    __slots__ = ()
+
     #: Values that will (de)serialize to `True`. If an empty set, any non-falsy
     #  value will deserialize to `True`.
     truthy = set(('t', 'T', 'true', 'True', 'TRUE', '1', 1, True))
@@ -749,6 +1248,9 @@ class FormattedString(Field):
         res = ser.dump(user)
         res.data  # => {'name': 'Monty', 'greeting': 'Hello Monty'}
     """
+
+    __slots__ = ('src_str', )
+
     default_error_messages = {
         'format': 'Cannot format string with given data.'
     }
@@ -774,6 +1276,8 @@ class Float(Number):
     :param kwargs: The same keyword arguments that :class:`Number` receives.
     """
 
+    __slots__ = ()
+
     num_type = float
 
 
@@ -793,6 +1297,8 @@ class DateTime(Field):
 
     """
 
+    __slots__ = ('dateformat', )
+
     DATEFORMAT_SERIALIZATION_FUNCS = {
         'iso': utils.isoformat,
         'iso8601': utils.isoformat,
@@ -839,6 +1345,32 @@ class DateTime(Field):
         else:
             return value.strftime(self.dateformat)
 
+    def serialize_many(self, attr, objs, accessor=None):
+        """Serialize a column of datetimes, looking up the format function
+        once for the whole column.
+        """
+        if not _uses_methods_of(self, DateTime, 'serialize', 'get_value', '_serialize'):
+            return super(DateTime, self).serialize_many(attr, objs, accessor=accessor)
+        self.dateformat = self.dateformat or self.DEFAULT_FORMAT
+        format_func = self.DATEFORMAT_SERIALIZATION_FUNCS.get(self.dateformat, None)
+        if format_func:
+            localtime = self.localtime
+
+            def serialize_value(value):
+                if value is None:
+                    return None
+                try:
+                    return format_func(value, localtime=localtime)
+                except (AttributeError, ValueError):
+                    self.fail('format', input=value)
+        else:
+            dateformat = self.dateformat
+
+            def serialize_value(value):
+                return None if value is None else value.strftime(dateformat)
+
+        return self._serialize_values(attr, objs, accessor, serialize_value)
+
     def _deserialize(self, value, attr, data):
         if not value:  # Falsy values, e.g. '', None, [] are not valid
             raise self.fail('invalid')
@@ -872,6 +1404,9 @@ class LocalDateTime(DateTime):
 
     Takes the same arguments as :class:`DateTime <marshmallow.fields.DateTime>`.
     """
+
+    __slots__ = ()
+
     localtime = True
 
 
@@ -880,6 +1415,9 @@ class Time(Field):
 
     :param kwargs: The same keyword arguments that :class:`Field` receives.
     """
+
+    __slots__ = ()
+
     default_error_messages = {
         'invalid': 'Not a valid time.',
         'format': '"{input}" cannot be formatted as a time.',
@@ -911,6 +1449,9 @@ class Date(Field):
 
     :param kwargs: The same keyword arguments that :class:`Field` receives.
     """
+
+    __slots__ = ()
+
     default_error_messages = {
         'invalid': 'Not a valid date.',
         'format': '"{input}" cannot be formatted as a date.',
@@ -952,6 +1493,8 @@ class TimeDelta(Field):
         Add `precision` parameter.
     """
 
+    __slots__ = ('precision', )
+
     DAYS = 'days'
     SECONDS = 'seconds'
     MICROSECONDS = 'microseconds'
@@ -1013,6 +1556,8 @@ class Dict(Field):
     .. versionadded:: 2.1.0
     """
 
+    __slots__ = ()
+
     default_error_messages = {
         'invalid': 'Not a valid mapping type.'
     }
@@ -1027,6 +1572,8 @@ class Dict(Field):
 class ValidatedField(Field):
     """A field that validates input on serialization."""
 
+    __slots__ = ()
+
     def _validated(self, value):
         raise NotImplementedError('Must implement _validate method')
 
@@ -1045,6 +1592,9 @@ class Url(ValidatedField, String):
     :param bool relative: Allow relative URLs.
     :param kwargs: The same keyword arguments that :class:`String` receives.
     """
+
+    __slots__ = ('relative', )
+
     default_error_messages = {'invalid': 'Not a valid URL.'}
 
     def __init__(self, relative=False, **kwargs):
@@ -1052,17 +1602,17 @@ class Url(ValidatedField, String):
         self.relative = relative
         # Insert validation into self.validators so that multiple errors can be
         # stored.
-        self.validators.insert(0, validate.URL(
+        self.validators = [validate.URL(
             relative=self.relative,
-            error=self.error_messages['invalid']
-        ))
+            error=self._error_messages['invalid']
+        )] + list(self._validators)
 
     def _validated(self, value):
         if value is None:
             return None
         return validate.URL(
             relative=self.relative,
-            error=self.error_messages['invalid']
+            error=self._error_messages['invalid']
         )(value)
 
 
@@ -1073,18 +1623,22 @@ class Email(ValidatedField, String):
     :param args: The same positional arguments that :class:`String` receives.
     :param kwargs: The same keyword arguments that :class:`String` receives.
     """
+
+    __slots__ = ()
+
     default_error_messages = {'invalid': 'Not a valid email address.'}
     def __init__(self, *args, **kwargs):
         String.__init__(self, *args, **kwargs)
         # Insert validation into self.validators so that multiple errors can be
         # stored.
-        self.validators.insert(0, validate.Email(error=self.error_messages['invalid']))
+        self.validators = [validate.Email(error=self._error_messages['invalid'])] + \
+            list(self._validators)
 
     def _validated(self, value):
         if value is None:
             return None
         return validate.Email(
-            error=self.error_messages['invalid']
+            error=self._error_messages['invalid']
         )(value)
 
 
@@ -1104,6 +1658,9 @@ class Method(Field):
         Deprecated ``method_name`` parameter in favor of ``serialize`` and allow
         ``serialize`` to not be passed at all.
     """
+
+    __slots__ = ('method_name', 'serialize_method_name', 'deserialize_method_name')
+
     _CHECK_ATTRIBUTE = False
 
     def __init__(self, serialize=None, deserialize=None, method_name=None, **kwargs):
@@ -1161,6 +1718,9 @@ class Function(Field):
     .. versionchanged:: 2.3.0
         Deprecated ``func`` parameter in favor of ``serialize``.
     """
+
+    __slots__ = ('func', 'serialize_func', 'deserialize_func')
+
     _CHECK_ATTRIBUTE = False
 
     def __init__(self, serialize=None, deserialize=None, func=None, **kwargs):
@@ -1204,6 +1764,9 @@ class Constant(Field):
 
     .. versionadded:: 2.0.0
     """
+
+    __slots__ = ('constant', )
+
     _CHECK_ATTRIBUTE = False
 
     def __init__(self, constant, **kwargs):
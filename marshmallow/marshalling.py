@@ -10,13 +10,22 @@ and from primitive types.
 
 from __future__ import unicode_literals
 
+from collections import namedtuple
+
+from marshmallow import compiler
 from marshmallow.utils import is_collection, missing
 from marshmallow.compat import text_type, iteritems
 from marshmallow.exceptions import (
     ValidationError,
+    ColumnError,
 )
+from marshmallow.fields import Field
 
 __all__ = [
+    'DumpPlan',
+    'dump_plan',
+    'LoadPlan',
+    'load_plan',
     'Marshaller',
     'Unmarshaller',
 ]
@@ -24,6 +33,83 @@ __all__ = [
 # Key used for field-level validation errors on nested fields
 FIELD = '_field'
 
+#: Fields taking part in serialization. ``entries`` is a tuple of
+#: ``(attr_name, key, field_obj)`` triples in output order, where ``key`` is the
+#: (prefixed) name of the field in the output. ``signature`` is the
+#: :func:`compiler.dump_signature <marshmallow.compiler.dump_signature>` of
+#: ``fields_dict`` and ``version`` the `Field._options_changes
+#: <marshmallow.fields.Field._options_changes>` the plan was built at. The
+#: other members are flags of the schema dumping with the plan: whether it has
+#: ``pre_dump`` and ``post_dump`` processors, its accessor (`None` for the
+#: accessors compiled by the fields), its dict class, and whether it can dump
+#: a list of objects in one batch.
+DumpPlan = namedtuple('DumpPlan', ['fields_dict', 'entries', 'signature', 'version',
+                                   'pre_dump', 'post_dump', 'accessor', 'dict_class',
+                                   'batches'])
+DumpPlan.__new__.__defaults__ = (False, False, None, dict, False)
+
+#: Fields taking part in deserialization. ``entries`` is a tuple of
+#: ``(attr_name, load_from, key, field_obj)`` tuples, where ``key`` is the name
+#: of the field in the output. ``signature`` is the
+#: :func:`compiler.load_signature <marshmallow.compiler.load_signature>` of
+#: ``fields_dict`` and ``version`` the `Field._options_changes
+#: <marshmallow.fields.Field._options_changes>` the plan was built at. The
+#: other members are flags of the schema loading with the plan: whether it has
+#: ``pre_load``, ``validates``, ``validates_schema`` (with and without
+#: ``pass_many``) and ``post_load`` processors, and its dict class.
+LoadPlan = namedtuple('LoadPlan', ['fields_dict', 'entries', 'signature', 'version',
+                                   'pre_load', 'validates', 'validates_schema_many',
+                                   'validates_schema', 'post_load', 'dict_class'])
+LoadPlan.__new__.__defaults__ = (False, False, False, False, False, dict)
+
+
+def dump_plan(fields_dict, prefix='', signature=None, **flags):
+    """Return the `DumpPlan` for ``fields_dict``, leaving out ``load_only``
+    fields.
+
+    Plans are snapshots: a plan must be built again if the fields or their
+    options change, which comparing its ``version`` with the current
+    `Field._options_changes <marshmallow.fields.Field._options_changes>`
+    tells.
+
+    :param signature: The ``dump_signature`` of ``fields_dict``, if already
+        computed.
+    :param flags: The schema flags of the plan, see `DumpPlan`.
+    """
+    version = Field._options_changes
+    entries = tuple(
+        (attr_name, ''.join([prefix or '', field_obj.dump_to or attr_name]), field_obj)
+        for attr_name, field_obj in iteritems(fields_dict)
+        if not getattr(field_obj, 'load_only', False)
+    )
+    if signature is None:
+        signature = compiler.dump_signature(fields_dict)
+    return DumpPlan(fields_dict, entries, signature, version, **flags)
+
+
+def load_plan(fields_dict, signature=None, **flags):
+    """Return the `LoadPlan` for ``fields_dict``, leaving out ``dump_only``
+    fields.
+
+    Plans are snapshots: a plan must be built again if the fields or their
+    options change, which comparing its ``version`` with the current
+    `Field._options_changes <marshmallow.fields.Field._options_changes>`
+    tells.
+
+    :param signature: The ``load_signature`` of ``fields_dict``, if already
+        computed.
+    :param flags: The schema flags of the plan, see `LoadPlan`.
+    """
+    version = Field._options_changes
+    entries = tuple(
+        (attr_name, field_obj.load_from, field_obj.attribute or attr_name, field_obj)
+        for attr_name, field_obj in iteritems(fields_dict)
+        if not field_obj.dump_only
+    )
+    if signature is None:
+        signature = compiler.load_signature(fields_dict)
+    return LoadPlan(fields_dict, entries, signature, version, **flags)
+
 class ErrorStore(object):
 
     def __init__(self):
@@ -64,33 +150,81 @@ class ErrorStore(object):
         try:
             value = getter_func(data)
         except ValidationError as err:  # Store validation errors
-            self.error_fields.append(field_obj)
-            self.error_field_names.append(field_name)
-            errors = self.get_errors(index=index)
-            # Warning: Mutation!
-            if isinstance(err.messages, dict):
-                errors[field_name] = err.messages
-            elif isinstance(errors.get(field_name), dict):
-                errors[field_name].setdefault(FIELD, []).extend(err.messages)
-            else:
-                errors.setdefault(field_name, []).extend(err.messages)
-            # When a Nested field fails validation, the marshalled data is stored
-            # on the ValidationError's data attribute
-            value = err.data or missing
+            value = self.store_error(err, field_name, field_obj, index=index)
         return value
 
+    def store_error(self, err, field_name, field_obj, index=None):
+        """Store the `ValidationError` ``err`` raised by ``field_obj`` and return
+        the value to use for the field.
+        """
+        self.error_fields.append(field_obj)
+        self.error_field_names.append(field_name)
+        errors = self.get_errors(index=index)
+        # Warning: Mutation!
+        if isinstance(err.messages, dict):
+            errors[field_name] = err.messages
+        elif isinstance(errors.get(field_name), dict):
+            errors[field_name].setdefault(FIELD, []).extend(err.messages)
+        else:
+            errors.setdefault(field_name, []).extend(err.messages)
+        # When a Nested field fails validation, the marshalled data is stored
+        # on the ValidationError's data attribute
+        return err.data or missing
+
 class Marshaller(ErrorStore):
     """Callable class responsible for serializing data and storing errors.
 
     :param str prefix: Optional prefix that will be prepended to all the
         serialized field names.
+    :param bool compiled: Whether to serialize objects with a dump function
+        generated for the field set (see :mod:`marshmallow.compiler`). When a
+        field raises a `ValidationError`, its error is stored and the fields
+        after it are serialized field by field.
+    :param bool columnar: Whether to serialize collections column by column
+        with :meth:`Field.serialize_many <marshmallow.fields.Field.serialize_many>`
+        rather than object by object. Otherwise only the fields whose
+        ``_batches_column`` returns `True`, such as `Nested`, are serialized
+        column by column before the objects.
     """
-    def __init__(self, prefix=''):
+    def __init__(self, prefix='', compiled=True, columnar=False):
         self.prefix = prefix
+        self.compiled = compiled
+        self.columnar = columnar
+        #: Generated dump function and the signature it was compiled for
+        self._dump_func = None
+        self._dump_key = None
+        #: Columns serialized before the objects, keyed by output key, as
+        #: ``(values, errors)`` pairs, and the position of the current object
+        self._columns = {}
+        self._position = None
         ErrorStore.__init__(self)
 
+    def get_dump_func(self, fields_dict, accessor=None, dict_class=dict, plan=None,
+                      columns=None):
+        """Return the generated dump function for ``fields_dict``, compiling it
+        if the field set changed since the last call.
+
+        :param dict columns: Mapping of the field names whose values are read
+            from the columns serialized beforehand to their getters.
+        """
+        signature = compiler.dump_signature(fields_dict) if plan is None else plan.signature
+        preset = frozenset(columns or ())
+        key = (signature, accessor, dict_class, preset)
+        if key != self._dump_key:
+            self._dump_func = compiler.compile_dump(
+                fields_dict,
+                prefix=self.prefix,
+                accessor=accessor,
+                dict_class=dict_class,
+                getters=columns,
+                preset=preset,
+            )
+            self._dump_key = key
+        return self._dump_func
+
     def serialize(self, obj, fields_dict, many=False,
-                  accessor=None, dict_class=dict, index_errors=True, index=None):
+                  accessor=None, dict_class=dict, index_errors=True, index=None,
+                  plan=None):
         """Takes raw data (a dict, list, or other object) and a dict of
         fields to output and serializes the data based on those fields.
 
@@ -104,6 +238,7 @@ class Marshaller(ErrorStore):
             ``self.errors`` when ``many=True``.
         :param int index: Index of the item being serialized (for storing errors) if
             serializing a collection, otherwise `None`.
+        :param DumpPlan plan: The `dump_plan` of ``fields_dict``, if already built.
         :return: A dictionary of the marshalled data
 
         .. versionchanged:: 1.0.0
@@ -112,12 +247,39 @@ class Marshaller(ErrorStore):
         # Reset errors dict if not serializing a collection
         if not self._pending:
             self.reset_errors()
+        if plan is None:
+            plan = dump_plan(fields_dict, self.prefix)
+        columns = None
+        if many and obj is not None and not self.columnar:
+            if not hasattr(obj, '__getitem__'):
+                obj = list(obj)
+            columns = self._serialize_batched_columns(obj, plan, accessor=accessor)
+        if many and obj is not None and self.columnar:
+            dump_func = None
+        elif self.compiled:
+            dump_func = self.get_dump_func(fields_dict, accessor, dict_class, plan=plan,
+                                           columns=columns)
+        else:
+            dump_func = None
         if many and obj is not None:
             self._pending = True
-            ret = [self.serialize(d, fields_dict, many=False,
-                                    dict_class=dict_class, accessor=accessor,
-                                    index=idx, index_errors=index_errors)
-                    for idx, d in enumerate(obj)]
+            if self.columnar:
+                ret = self._serialize_columns(obj, plan, accessor=accessor,
+                                              dict_class=dict_class,
+                                              index_errors=index_errors)
+            elif columns:
+                ret = []
+                for idx, d in enumerate(obj):
+                    self._position = idx
+                    ret.append(self._serialize_item(
+                        d, plan, dump_func, accessor=accessor, dict_class=dict_class,
+                        index=(idx if index_errors else None), columns=columns))
+                self._columns = {}
+            else:
+                ret = [self._serialize_item(d, plan, dump_func,
+                                            accessor=accessor, dict_class=dict_class,
+                                            index=(idx if index_errors else None))
+                        for idx, d in enumerate(obj)]
             self._pending = False
             if self.errors:
                 raise ValidationError(
@@ -127,34 +289,118 @@ class Marshaller(ErrorStore):
                     data=ret,
                 )
             return ret
-        items = []
-        for attr_name, field_obj in iteritems(fields_dict):
-            if getattr(field_obj, 'load_only', False):
+        ret = self._serialize_item(obj, plan, dump_func,
+                                   accessor=accessor, dict_class=dict_class,
+                                   index=(index if index_errors else None))
+        if self.errors and not self._pending:
+            raise ValidationError(
+                self.errors,
+                field_names=self.error_field_names,
+                fields=self.error_fields,
+                data=ret
+            )
+        return ret
+
+    def _serialize_batched_columns(self, objs, plan, accessor=None):
+        """Serialize the fields whose ``_batches_column`` returns `True` one
+        column at a time and return the mapping of their names to getters
+        reading the values of the current object, or `None` if there are
+        none. The errors are stored when the objects are serialized.
+        """
+        columns = {}
+        for attr_name, key, field_obj in plan.entries:
+            if not field_obj._batches_column():
+                continue
+            try:
+                values = field_obj.serialize_many(attr_name, objs, accessor=accessor)
+                errors = {}
+            except ColumnError as err:
+                values, errors = err.data, err.errors
+            except ValidationError:
+                # serialize_many does not tell which values failed: serialize
+                # the field object by object
                 continue
+            self._columns[key] = (values, errors)
+            columns[attr_name] = self._column_getter(key)
+        return columns or None
 
-            key = ''.join([self.prefix or '', field_obj.dump_to or attr_name])
+    def _column_getter(self, key):
+        def getter(obj, default):
+            values, errors = self._columns[key]
+            position = self._position
+            if position in errors:
+                raise errors[position]
+            return values[position]
+        return getter
 
-            getter = lambda d: field_obj.serialize(attr_name, d, accessor=accessor)
+    def _serialize_item(self, obj, plan, dump_func, accessor=None,
+                        dict_class=dict, index=None, columns=None):
+        entries = plan.entries
+        if dump_func is not None:
+            try:
+                return dump_func(obj)
+            except compiler.Interrupted as err:
+                # Store the error and carry on with the next fields, keeping
+                # the values already serialized
+                ret = err.output
+                _, key, field_obj = entries[err.position]
+                value = self.store_error(err.error, key, field_obj, index=index)
+                if value is not missing:
+                    ret[key] = value
+                entries = entries[err.position + 1:]
+        else:
+            ret = dict_class()
+        for attr_name, key, field_obj in entries:
+            if columns and attr_name in columns:
+                column_getter = columns[attr_name]
+                getter = lambda d: column_getter(d, missing)
+            else:
+                getter = lambda d: field_obj.serialize(attr_name, d, accessor=accessor)
             value = self.call_and_store(
                 getter_func=getter,
                 data=obj,
                 field_name=key,
                 field_obj=field_obj,
-                index=(index if index_errors else None)
+                index=index
             )
             if value is missing:
                 continue
-            items.append((key, value))
-        ret = dict_class(items)
-        if self.errors and not self._pending:
-            raise ValidationError(
-                self.errors,
-                field_names=self.error_field_names,
-                fields=self.error_fields,
-                data=ret
-            )
+            ret[key] = value
         return ret
 
+    def _serialize_columns(self, objs, plan, accessor=None, dict_class=dict,
+                           index_errors=True):
+        """Serialize a collection one field at a time and assemble the rows at
+        the end. The errors of the values which fail to serialize are stored
+        from the `ColumnError` raised by ``serialize_many``.
+        """
+        if not hasattr(objs, '__getitem__'):
+            objs = list(objs)
+        rows = [[] for _ in range(len(objs))]
+        for attr_name, key, field_obj in plan.entries:
+            try:
+                values = field_obj.serialize_many(attr_name, objs, accessor=accessor)
+            except ColumnError as err:
+                values = err.data
+                for position, error in sorted(iteritems(err.errors)):
+                    values[position] = self.store_error(
+                        error, key, field_obj,
+                        index=(position if index_errors else None))
+            except ValidationError:
+                # serialize_many does not tell which values failed: serialize
+                # the column again object by object
+                getter = lambda d: field_obj.serialize(attr_name, d, accessor=accessor)
+                values = [self.call_and_store(getter_func=getter,
+                                              data=d,
+                                              field_name=key,
+                                              field_obj=field_obj,
+                                              index=(idx if index_errors else None))
+                          for idx, d in enumerate(objs)]
+            for row, value in zip(rows, values):
+                if value is not missing:
+                    row.append((key, value))
+        return [dict_class(row) for row in rows]
+
     # Make an instance callable
     __call__ = serialize
 
@@ -169,6 +415,28 @@ class Unmarshaller(ErrorStore):
 
     default_schema_validation_error = 'Invalid data.'
 
+    def __init__(self, compiled=True):
+        self.compiled = compiled
+        #: Generated load function and the signature it was compiled for
+        self._load_func = None
+        self._load_key = None
+        ErrorStore.__init__(self)
+
+    def get_load_func(self, fields_dict, partial=False, dict_class=dict, plan=None):
+        """Return the generated load function for ``fields_dict`` and
+        ``partial``, compiling it if either changed since the last call.
+        """
+        signature = compiler.load_signature(fields_dict) if plan is None else plan.signature
+        key = (signature, compiler.partial_key(partial), dict_class)
+        if key != self._load_key:
+            self._load_func = compiler.compile_load(
+                fields_dict,
+                partial=partial,
+                dict_class=dict_class,
+            )
+            self._load_key = key
+        return self._load_func
+
     def run_validator(self, validator_func, output,
             original_data, fields_dict, index=None,
             many=False, pass_original=False):
@@ -206,7 +474,7 @@ class Unmarshaller(ErrorStore):
                     errors.setdefault(field_name, []).append(text_type(err))
 
     def deserialize(self, data, fields_dict, many=False, partial=False,
-            dict_class=dict, index_errors=True, index=None):
+            dict_class=dict, index_errors=True, index=None, plan=None):
         """Deserialize ``data`` based on the schema defined by ``fields_dict``.
 
         :param dict data: The data to deserialize.
@@ -221,14 +489,21 @@ class Unmarshaller(ErrorStore):
             ``self.errors`` when ``many=True``.
         :param int index: Index of the item being serialized (for storing errors) if
             serializing a collection, otherwise `None`.
+        :param LoadPlan plan: The `load_plan` of ``fields_dict``, if already built.
         :return: A dictionary of the deserialized data.
         """
         # Reset errors if not deserializing a collection
         if not self._pending:
             self.reset_errors()
+        if plan is None:
+            plan = load_plan(fields_dict)
+        if self.compiled:
+            load_func = self.get_load_func(fields_dict, partial, dict_class, plan=plan)
+        else:
+            load_func = None
         if many and data is not None:
             self._pending = True
-            ret = [self.deserialize(d, fields_dict, many=False,
+            ret = [self._deserialize_item(d, plan, load_func,
                         partial=partial, dict_class=dict_class,
                         index=idx, index_errors=index_errors)
                     for idx, d in enumerate(data)]
@@ -242,12 +517,48 @@ class Unmarshaller(ErrorStore):
                     data=ret,
                 )
             return ret
+        ret = self._deserialize_item(data, plan, load_func,
+                    partial=partial, dict_class=dict_class,
+                    index=index, index_errors=index_errors)
+
+        if self.errors and not self._pending:
+            raise ValidationError(
+                self.errors,
+                field_names=self.error_field_names,
+                fields=self.error_fields,
+                data=ret,
+            )
+        return ret
+
+    def _deserialize_item(self, data, plan, load_func, partial=False,
+            dict_class=dict, index_errors=True, index=None):
+        entries = plan.entries
+        ret = None
+        if load_func is not None and data is not None:
+            try:
+                ret = load_func(data)
+            except compiler.Interrupted as err:
+                # Store the error and carry on with the next fields, keeping
+                # the values already deserialized
+                ret = err.output
+                attr_name, load_from, key, field_obj = entries[err.position]
+                field_name = attr_name
+                if load_from and data.get(attr_name, missing) is missing:
+                    field_name = load_from
+                value = self.store_error(err.error, field_name, field_obj,
+                                         index=(index if index_errors else None))
+                if value is not missing:
+                    ret[key] = value
+                entries = entries[err.position + 1:]
+            else:
+                # ret is None if data is not a dict; the generic path reports it
+                if ret is not None:
+                    return ret
         if data is not None:
-            items = []
+            if ret is None:
+                ret = dict_class()
             partial_is_collection = is_collection(partial)
-            for attr_name, field_obj in iteritems(fields_dict):
-                if field_obj.dump_only:
-                    continue
+            for attr_name, load_from, key, field_obj in entries:
                 try:
                     raw_value = data.get(attr_name, missing)
                 except AttributeError:  # Input data is not a dict
@@ -262,9 +573,9 @@ class Unmarshaller(ErrorStore):
                     # Input data type is incorrect, so we can bail out early
                     break
                 field_name = attr_name
-                if raw_value is missing and field_obj.load_from:
-                    field_name = field_obj.load_from
-                    raw_value = data.get(field_obj.load_from, missing)
+                if raw_value is missing and load_from:
+                    field_name = load_from
+                    raw_value = data.get(load_from, missing)
                 if raw_value is missing:
                     # Ignore missing field if we're allowed to.
                     if (
@@ -279,7 +590,7 @@ class Unmarshaller(ErrorStore):
 
                 getter = lambda val: field_obj.deserialize(
                     val,
-                    field_obj.load_from or attr_name,
+                    load_from or attr_name,
                     data
                 )
                 value = self.call_and_store(
@@ -290,19 +601,7 @@ class Unmarshaller(ErrorStore):
                     index=(index if index_errors else None)
                 )
                 if value is not missing:
-                    key = fields_dict[attr_name].attribute or attr_name
-                    items.append((key, value))
-            ret = dict_class(items)
-        else:
-            ret = None
-
-        if self.errors and not self._pending:
-            raise ValidationError(
-                self.errors,
-                field_names=self.error_field_names,
-                fields=self.error_fields,
-                data=ret,
-            )
+                    ret[key] = value
         return ret
 
     # Make an instance callable
@@ -15,18 +15,69 @@ import functools
 
 from marshmallow import base, fields, utils, class_registry, marshalling
 from marshmallow.compat import (with_metaclass, iteritems, text_type,
-                                binary_type, OrderedDict)
+                                binary_type, OrderedDict, ORDERED_DICTS)
 from marshmallow.exceptions import ValidationError
 from marshmallow.orderedset import OrderedSet
 from marshmallow.decorators import (PRE_DUMP, POST_DUMP, PRE_LOAD, POST_LOAD,
                                     VALIDATES, VALIDATES_SCHEMA)
 
 
+#: Dictionary class for field mappings that must keep declaration order
+_OrderedFieldsDict = dict if ORDERED_DICTS else OrderedDict
+
 #: Return type of :meth:`Schema.dump` including serialized data and errors
 MarshalResult = namedtuple('MarshalResult', ['data', 'errors'])
 #: Return type of :meth:`Schema.load`, including deserialized data and errors
 UnmarshalResult = namedtuple('UnmarshalResult', ['data', 'errors'])
 
+#: Maximum number of implicit field sets a schema instance keeps around
+MAX_IMPLICIT_FIELD_SETS = 32
+
+#: Object to infer implicit fields from when a collection to dump is empty
+_NO_PROTOTYPE = object()
+
+# {(<schema class>, <object type>, <field names>): <attribute types>}
+_object_attribute_types = {}
+
+# {(<schema class>, <object type>, <field names>): <attribute types>}, as
+# found on the first object of the type which was dumped
+_inferred_attribute_types = {}
+
+
+def _snapshot(names):
+    """Return a copy of the collection of field names ``names`` which can be
+    compared with a later copy.
+    """
+    return tuple(names) if names else ()
+
+
+def _get_object_attribute_types(schema_class, object_type, keys):
+    """Return the types of the attributes ``keys`` of instances of
+    ``object_type``, as declared by its annotations or the class attributes
+    it defines. The type of attributes which are not declared is `None`.
+    """
+    cache_key = (schema_class, object_type, keys)
+    try:
+        return _object_attribute_types[cache_key]
+    except KeyError:
+        pass
+    annotations = {}
+    for klass in reversed(inspect.getmro(object_type)):
+        annotations.update(klass.__dict__.get('__annotations__', {}))
+    types = []
+    for key in keys:
+        attribute_type = annotations.get(key)
+        if not isinstance(attribute_type, type):
+            value = getattr(object_type, key, None)
+            if value is None or callable(value) or hasattr(value, '__get__'):
+                attribute_type = None  # Unknown, method or descriptor
+            else:
+                attribute_type = type(value)
+        types.append(attribute_type)
+    ret = _object_attribute_types[cache_key] = tuple(types)
+    return ret
+
+
 def _get_fields(attrs, field_class, pop=False, ordered=False):
     """Get fields from a class. If ordered=True, fields will sorted by creation index.
 
@@ -96,7 +147,7 @@ class SchemaMeta(type):
                 ordered = False
         cls_fields = _get_fields(attrs, base.FieldABC, pop=True, ordered=ordered)
         klass = super(SchemaMeta, mcs).__new__(mcs, name, bases, attrs)
-        inherited_fields = _get_fields_by_mro(klass, base.FieldABC)
+        inherited_fields = mcs.get_inherited_fields(klass)
 
         # Use getattr rather than attrs['Meta'] so that we get inheritance for free
         meta = getattr(klass, 'Meta')
@@ -106,7 +157,7 @@ class SchemaMeta(type):
         # Add fields specifid in the `include` class Meta option
         cls_fields += list(klass.opts.include.items())
 
-        dict_cls = OrderedDict if ordered else dict
+        dict_cls = _OrderedFieldsDict if ordered else dict
         # Assign _declared_fields on class
         klass._declared_fields = mcs.get_declared_fields(
             klass=klass,
@@ -116,6 +167,15 @@ class SchemaMeta(type):
         )
         return klass
 
+    @classmethod
+    def get_inherited_fields(mcs, klass):
+        """Returns a list of field_name, `Field` pairs inherited from the bases
+        of the class, following its method resolution order.
+
+        :param type klass: The class object.
+        """
+        return _get_fields_by_mro(klass, base.FieldABC)
+
     @classmethod
     def get_declared_fields(mcs, klass, cls_fields, inherited_fields, dict_cls):
         """Returns a dictionary of field_name => `Field` pairs declard on the class.
@@ -127,7 +187,8 @@ class SchemaMeta(type):
             by the ``include`` class Meta option.
         :param dict inherited_fileds: Inherited fields.
         :param type dict_class: Either `dict` or `OrderedDict`, depending on the whether
-            the user specified `ordered=True`.
+            the user specified `ordered=True`. `dict` is used in both cases on
+            Python 3.7+, where dictionaries keep insertion order.
         """
         return dict_cls(inherited_fields + cls_fields)
 
@@ -203,6 +264,8 @@ class SchemaOpts(object):
         self.include = getattr(meta, 'include', {})
         self.load_only = getattr(meta, 'load_only', ())
         self.dump_only = getattr(meta, 'dump_only', ())
+        self.columnar = getattr(meta, 'columnar', False)
+        self.object_type = getattr(meta, 'object_type', None)
 
 
 class BaseSchema(base.SchemaABC):
@@ -318,14 +381,23 @@ class BaseSchema(base.SchemaABC):
             of invalid items in a collection.
         - ``load_only``: Tuple or list of fields to exclude from serialized results.
         - ``dump_only``: Tuple or list of fields to exclude from deserialization
+        - ``columnar``: If `True`, serialize collections one field at a time
+            with `Field.serialize_many` instead of one object at a time. NumPy
+            structured arrays are then passed to fields as is, so numeric
+            columns can be converted in one go.
+        - ``object_type``: Class of the objects to serialize. The fields named in
+            ``fields`` or ``additional`` which are not declared are then inferred
+            from the annotations and class attributes of this class, instead of
+            from the first object passed to `dump`.
         """
         pass
 
     def __init__(self, extra=None, only=(), exclude=(), prefix='', strict=False,
                  many=False, context=None, load_only=(), dump_only=(),
                  partial=False):
-        # copy declared fields from metaclass
-        self.declared_fields = copy.deepcopy(self._declared_fields)
+        # copy declared fields from metaclass. Looked up on the class so that
+        # metaclasses may compute them lazily
+        self.declared_fields = copy.deepcopy(self.__class__._declared_fields)
         self.many = many
         self.only = only
         self.exclude = exclude
@@ -336,10 +408,20 @@ class BaseSchema(base.SchemaABC):
         self.dump_only = set(dump_only) or set(self.opts.dump_only)
         self.partial = partial
         #: Dictionary mapping field_names -> :class:`Field` objects
-        self.fields = self.dict_class()
+        self.fields = self._fields_dict_class()
+        #: Fields inferred from ``class Meta`` ``fields`` or ``additional``,
+        #: keyed by object type and field names
+        self._implicit_fields = {}
+        #: What ``self.fields`` were computed from, see `_update_fields`
+        self._fields_key = None
+        #: `marshalling.DumpPlan` and `marshalling.LoadPlan` of ``self.fields``,
+        #: built again whenever the fields or their options change
+        self._dump_plan = None
+        self._load_plan = None
         #: Callable marshalling object
         self._marshal = marshalling.Marshaller(
-            prefix=self.prefix
+            prefix=self.prefix,
+            columnar=self.opts.columnar,
         )
         #: Callable unmarshalling object
         self._unmarshal = marshalling.Unmarshaller()
@@ -373,10 +455,95 @@ class BaseSchema(base.SchemaABC):
 
         return data
 
+    def _can_dump_in_batches(self):
+        """Return True if dumping a list of objects with ``many=True`` gives
+        the same items as dumping each object on its own, i.e. if no
+        processor or error handler gets to see more than one object.
+        """
+        for tag_name in (PRE_DUMP, POST_DUMP):
+            if self.__processors__.get((tag_name, True)):
+                return False
+            for attr_name in self.__processors__.get((tag_name, False), ()):
+                processor_kwargs = getattr(self, attr_name).__marshmallow_kwargs__
+                if processor_kwargs[(tag_name, False)].get('pass_original', False):
+                    return False
+        return getattr(self.handle_error, '__func__', None) is \
+            BaseSchema.__dict__['handle_error']
+
+    def _copy_for_recursion(self, many=False):
+        """Return a schema built the same way as this one, for a
+        ``Nested('self')`` field of this schema with the same ``only`` and
+        ``exclude``.
+
+        The declared fields are shared with this schema, so that their
+        accessors, validators and nested schemas are compiled once for all the
+        levels of the recursion. Only the ``Nested('self')`` fields are copied.
+        """
+        ret = copy.copy(self)
+        ret.many = many
+        ret.declared_fields = self.declared_fields.__class__(
+            (field_name, field_obj._copy_for_recursion()
+             if getattr(field_obj, 'nested', None) == fields._RECURSIVE_NESTED
+             else field_obj)
+            for field_name, field_obj in iteritems(self.declared_fields)
+        )
+        ret.context = {}
+        ret._marshal = marshalling.Marshaller(
+            prefix=ret.prefix,
+            columnar=self.opts.columnar,
+        )
+        ret._unmarshal = marshalling.Unmarshaller()
+        ret._update_fields(many=many)
+        return ret
+
+    def _get_dump_plan(self):
+        # Field options may be changed after the schema is built, which
+        # `Field._options_changes` counts
+        plan = self._dump_plan
+        if plan is None or plan.fields_dict is not self.fields or \
+                plan.version != fields.Field._options_changes:
+            plan = self._dump_plan = marshalling.dump_plan(
+                self.fields, self.prefix,
+                pre_dump=self._has_processors(PRE_DUMP),
+                post_dump=self._has_processors(POST_DUMP),
+                accessor=self._get_accessor(),
+                dict_class=self.dict_class,
+                batches=self._can_dump_in_batches(),
+            )
+        return plan
+
+    def _get_load_plan(self):
+        plan = self._load_plan
+        if plan is None or plan.fields_dict is not self.fields or \
+                plan.version != fields.Field._options_changes:
+            plan = self._load_plan = marshalling.load_plan(
+                self.fields,
+                pre_load=self._has_processors(PRE_LOAD),
+                validates=self._has_processors(VALIDATES, False),
+                validates_schema_many=self._has_processors(VALIDATES_SCHEMA, True),
+                validates_schema=self._has_processors(VALIDATES_SCHEMA, False),
+                post_load=self._has_processors(POST_LOAD),
+                dict_class=self.dict_class,
+            )
+        return plan
+
+    def _has_processors(self, tag_name, pass_many=None):
+        """Return True if any processor is registered for ``tag_name`` (and
+        ``pass_many``, unless it is `None`).
+        """
+        processors = self.__processors__
+        if pass_many is None:
+            return bool(processors.get((tag_name, False)) or processors.get((tag_name, True)))
+        return bool(processors.get((tag_name, pass_many)))
+
     @property
     def dict_class(self):
         return OrderedDict if self.ordered else dict
 
+    @property
+    def _fields_dict_class(self):
+        return _OrderedFieldsDict if self.ordered else dict
+
     @property
     def set_class(self):
         return OrderedSet if self.ordered else set
@@ -400,6 +567,17 @@ class BaseSchema(base.SchemaABC):
         """
         return utils.get_value(attr, obj, default)
 
+    def _get_accessor(self):
+        """Return the accessor function to pass to fields, or `None` if
+        `get_attribute` is not overridden, in which case fields use the
+        accessors they compiled when they were bound to this schema.
+        """
+        # TODO: Remove self.__accessor__ in a later release
+        accessor = self.get_attribute or self.__accessor__
+        if getattr(accessor, '__func__', None) is BaseSchema.__dict__['get_attribute']:
+            return None
+        return accessor
+
     ##### Handler decorators (deprecated) #####
 
     @classmethod
@@ -473,23 +651,29 @@ class BaseSchema(base.SchemaABC):
                             'many=True to serialize a collection.',
                             category=DeprecationWarning)
 
-        if many and utils.is_iterable_but_not_string(obj):
+        if many and utils.is_iterable_but_not_string(obj) and \
+                not (self.opts.columnar and utils.is_structured_array(obj)):
             obj = list(obj)
 
-        processed_obj = self._invoke_dump_processors(PRE_DUMP, obj, many, original_data=obj)
+        plan = self._get_dump_plan()
+        if plan.pre_dump:
+            processed_obj = self._invoke_dump_processors(PRE_DUMP, obj, many, original_data=obj)
+        else:
+            processed_obj = obj
 
         if update_fields:
             self._update_fields(processed_obj, many=many)
+            plan = self._get_dump_plan()
 
         try:
             preresult = self._marshal(
                 processed_obj,
                 self.fields,
                 many=many,
-                # TODO: Remove self.__accessor__ in a later release
-                accessor=self.get_attribute or self.__accessor__,
-                dict_class=self.dict_class,
+                accessor=plan.accessor,
+                dict_class=plan.dict_class,
                 index_errors=self.opts.index_errors,
+                plan=plan,
                 **kwargs
             )
         except ValidationError as error:
@@ -501,10 +685,31 @@ class BaseSchema(base.SchemaABC):
             errors = {}
         result = self._postprocess(preresult, many, obj=obj)
 
-        result = self._invoke_dump_processors(POST_DUMP, result, many, original_data=obj)
+        if plan.post_dump:
+            result = self._invoke_dump_processors(POST_DUMP, result, many, original_data=obj)
 
         return MarshalResult(result, errors)
 
+    def iter_dump(self, objs, update_fields=True, **kwargs):
+        """Serialize the objects of an iterable one at a time, without
+        loading the whole iterable into memory first.
+
+        Fields are updated based on the first object only, as :meth:`dump`
+        does for collections. Each object is then serialized with
+        ``many=False``, so processors registered with ``pass_many=True``
+        receive one object at a time.
+
+        :param objs: Iterable of objects to serialize, e.g. a generator or a
+            query cursor.
+        :param bool update_fields: Whether to update the schema's field classes
+            from the first object.
+        :return: A generator of `MarshalResult` tuples, one per object, whose
+            ``errors`` only concern that object.
+        """
+        for obj in objs:
+            yield self.dump(obj, many=False, update_fields=update_fields, **kwargs)
+            update_fields = False
+
     def dumps(self, obj, many=None, update_fields=True, *args, **kwargs):
         """Same as :meth:`dump`, except return a JSON-encoded string.
 
@@ -597,7 +802,12 @@ class BaseSchema(base.SchemaABC):
         if partial is None:
             partial = self.partial
 
-        processed_data = self._invoke_load_processors(PRE_LOAD, data, many, original_data=data)
+        plan = self._get_load_plan()
+        if plan.pre_load:
+            processed_data = self._invoke_load_processors(PRE_LOAD, data, many,
+                                                          original_data=data)
+        else:
+            processed_data = data
 
         try:
             result = self._unmarshal(
@@ -605,27 +815,31 @@ class BaseSchema(base.SchemaABC):
                 self.fields,
                 many=many,
                 partial=partial,
-                dict_class=self.dict_class,
+                dict_class=plan.dict_class,
                 index_errors=self.opts.index_errors,
+                plan=plan,
             )
         except ValidationError as error:
             result = error.data
         else:
             errors = {}
-        self._invoke_field_validators(data=result, many=many)
+        if plan.validates:
+            self._invoke_field_validators(data=result, many=many)
         errors = self._unmarshal.errors
         field_errors = bool(errors)
         # Run schema-level migration
-        try:
-            self._invoke_validators(pass_many=True, data=result, original_data=data, many=many,
-                                    field_errors=field_errors)
-        except ValidationError as err:
-            errors.update(err.messages)
-        try:
-            self._invoke_validators(pass_many=False, data=result, original_data=data, many=many,
-                                    field_errors=field_errors)
-        except ValidationError as err:
-            errors.update(err.messages)
+        if plan.validates_schema_many:
+            try:
+                self._invoke_validators(pass_many=True, data=result, original_data=data,
+                                        many=many, field_errors=field_errors)
+            except ValidationError as err:
+                errors.update(err.messages)
+        if plan.validates_schema:
+            try:
+                self._invoke_validators(pass_many=False, data=result, original_data=data,
+                                        many=many, field_errors=field_errors)
+            except ValidationError as err:
+                errors.update(err.messages)
         if errors:
             # TODO: Remove self.__error_handler__ in a later release
             if self.__error_handler__ and callable(self.__error_handler__):
@@ -640,13 +854,40 @@ class BaseSchema(base.SchemaABC):
             if self.strict:
                 raise exc
 
-        if not errors and postprocess:
+        if not errors and postprocess and plan.post_load:
             result = self._invoke_load_processors(POST_LOAD, result, many, original_data=data)
 
         return result, errors
 
     def _update_fields(self, obj=None, many=False):
-        """Update fields based on the passed in object."""
+        """Update fields based on the passed in object.
+
+        The fields are only computed again if ``only``, ``exclude``,
+        ``load_only``, ``dump_only``, the context, the declared fields or the
+        type of the object implicit fields are inferred from changed since the
+        last update. The dump and load plans are then rebuilt from the new
+        fields the next time they are needed.
+        """
+        if self.opts.object_type is None:
+            obj = self.__get_prototype(obj, many)
+        if obj is _NO_PROTOTYPE:
+            object_key = _NO_PROTOTYPE
+        elif self.opts.object_type is None and \
+                (self.only or self.opts.fields or self.opts.additional):
+            object_key = type(obj) if obj else None
+        else:  # Implicit fields do not depend on the object
+            object_key = None
+        fields_key = (
+            self.declared_fields, self.context,
+            _snapshot(self.only), _snapshot(self.exclude),
+            _snapshot(self.load_only), _snapshot(self.dump_only),
+            self.ordered, object_key,
+        )
+        last_key = self._fields_key
+        if last_key is not None and last_key[0] is fields_key[0] and \
+                last_key[1] is fields_key[1] and last_key[2:] == fields_key[2:]:
+            return self.fields
+
         if self.only:
             # Return only fields specified in only option
             if self.opts.fields:
@@ -667,10 +908,12 @@ class BaseSchema(base.SchemaABC):
         excludes = set(self.opts.exclude) | set(self.exclude)
         if excludes:
             field_names = field_names - excludes
-        ret = self.__filter_fields(field_names, obj, many=many)
+        ret = self.__filter_fields(field_names, obj)
         # Set parents
         self.__set_field_attrs(ret)
         self.fields = ret
+        self._fields_key = fields_key
+        self._dump_plan = self._load_plan = None
         return self.fields
 
     def on_bind_field(self, field_name, field_obj):
@@ -703,49 +946,97 @@ class BaseSchema(base.SchemaABC):
                     raise TypeError(msg)
         return fields_dict
 
-    def __filter_fields(self, field_names, obj, many=False):
-        """Return only those field_name:field_obj pairs specified by
-        ``field_names``.
-
-        :param set field_names: Field names to include in the final
-            return dictionary.
-        :returns: An dict of field_name:field_obj pairs.
+    def __get_prototype(self, obj, many):
+        """Return the object to infer implicit fields from: ``obj``, or its
+        first item if ``many`` is true. `_NO_PROTOTYPE` if ``obj`` is an empty
+        collection.
         """
-        if obj and many:
+        if many and (utils.is_structured_array(obj) or obj):
             try:  # Homogeneous collection
                 # Prefer getitem over iter to prevent breaking serialization
                 # of objects for which iter will modify position in the collection
                 # e.g. Pymongo cursors
                 if hasattr(obj, '__getitem__') and callable(getattr(obj, '__getitem__')):
-                    obj_prototype = obj[0]
-                else:
-                    obj_prototype = next(iter(obj))
+                    return obj[0]
+                return next(iter(obj))
             except (StopIteration, IndexError):  # Nothing to serialize
-                return self.declared_fields
-            obj = obj_prototype
-        ret = self.dict_class()
+                return _NO_PROTOTYPE
+        return obj
+
+    def __filter_fields(self, field_names, obj):
+        """Return only those field_name:field_obj pairs specified by
+        ``field_names``.
+
+        :param set field_names: Field names to include in the final
+            return dictionary.
+        :param obj: The object to infer implicit fields from, as returned by
+            `__get_prototype`.
+        :returns: An dict of field_name:field_obj pairs.
+        """
+        if obj is _NO_PROTOTYPE:  # Nothing to serialize
+            return self.declared_fields
+        declared_fields = self.declared_fields
+        implicit_keys = tuple(key for key in field_names if key not in declared_fields)
+        if implicit_keys:
+            implicit_fields = self.__get_implicit_fields(implicit_keys, obj)
+        ret = self._fields_dict_class()
         for key in field_names:
-            if key in self.declared_fields:
-                ret[key] = self.declared_fields[key]
+            if key in declared_fields:
+                ret[key] = declared_fields[key]
             else:  # Implicit field creation (class Meta 'fields' or 'additional')
-                if obj:
-                    attribute_type = None
-                    try:
-                        if isinstance(obj, Mapping):
-                            attribute_type = type(obj[key])
-                        else:
-                            attribute_type = type(getattr(obj, key))
-                    except (AttributeError, KeyError) as err:
-                        err_type = type(err)
-                        raise err_type(
-                            '"{0}" is not a valid field for {1}.'.format(key, obj))
-                    field_obj = self.TYPE_MAPPING.get(attribute_type, fields.Field)()
-                else:  # Object is None
-                    field_obj = fields.Field()
-                # map key -> field (default to Raw)
-                ret[key] = field_obj
+                ret[key] = implicit_fields[key]
         return ret
 
+    def __get_implicit_fields(self, keys, obj):
+        """Return a dict of fields for the undeclared field names ``keys``,
+        inferred from the type of the attributes of ``obj``.
+
+        The attribute types are read once per schema class, type of ``obj``
+        and field names, from the first object dumped, unless the
+        ``object_type`` class Meta option declares them. Objects whose
+        attribute types vary should declare their fields instead.
+        """
+        object_type = self.opts.object_type
+        if object_type is None:
+            object_type = type(obj) if obj else None
+        cache_key = (object_type, keys)
+        try:
+            return self._implicit_fields[cache_key]
+        except KeyError:
+            pass
+        if self.opts.object_type is not None:
+            types = _get_object_attribute_types(self.__class__, object_type, keys)
+        elif object_type is None:  # Object is None
+            types = (None, ) * len(keys)
+        else:
+            types = _inferred_attribute_types.get((self.__class__, ) + cache_key)
+            if types is None:
+                types = _inferred_attribute_types[(self.__class__, ) + cache_key] = \
+                    self.__get_attribute_types(keys, obj)
+        if len(self._implicit_fields) >= MAX_IMPLICIT_FIELD_SETS:
+            self._implicit_fields.clear()
+        # map key -> field (default to Raw)
+        ret = self._implicit_fields[cache_key] = dict(
+            (key, self.TYPE_MAPPING.get(attribute_type, fields.Field)())
+            for key, attribute_type in zip(keys, types)
+        )
+        return ret
+
+    @staticmethod
+    def __get_attribute_types(keys, obj):
+        types = []
+        for key in keys:
+            try:
+                if isinstance(obj, Mapping):
+                    types.append(type(obj[key]))
+                else:
+                    types.append(type(getattr(obj, key)))
+            except (AttributeError, KeyError) as err:
+                err_type = type(err)
+                raise err_type(
+                    '"{0}" is not a valid field for {1}.'.format(key, obj))
+        return tuple(types)
+
     def _invoke_dump_processors(self, tag_name, data, many, original_data=None):
         # The pass_many post-dump processors may do things like add an envelope, so
         # invoke those after invoking the non-pass_many processors which will expect
@@ -7,6 +7,7 @@ import datetime
 import functools
 import inspect
 import json
+import re
 import time
 import types
 from calendar import timegm
@@ -14,12 +15,12 @@ from decimal import Decimal, ROUND_HALF_EVEN, Context, Inexact
 from email.utils import formatdate, parsedate
 from pprint import pprint as py_pprint
 
-from marshmallow.compat import OrderedDict, binary_type, text_type
+from marshmallow.compat import OrderedDict, binary_type, text_type, basestring
 
 
 dateutil_available = False
 try:
-    from dateutil import parser
+    from dateutil import parser, tz
     dateutil_available = True
 except ImportError:
     dateutil_available = False
@@ -64,6 +65,23 @@ def is_collection(obj):
     return is_iterable_but_not_string(obj) and not isinstance(obj, collections.Mapping)
 
 
+def is_structured_array(obj):
+    """Return True if ``obj`` is a one-dimensional NumPy structured array,
+    i.e. an array whose columns can be selected by name.
+    """
+    return bool(getattr(getattr(obj, 'dtype', None), 'names', None)) and \
+        getattr(obj, 'ndim', None) == 1
+
+
+def get_array_column(obj, key):
+    """Return the column ``key`` of the structured array ``obj``, or `None` if
+    ``obj`` is not a structured array or has no such column.
+    """
+    if is_structured_array(obj) and key in obj.dtype.names:
+        return obj[key]
+    return None
+
+
 def is_instance_or_subclass(val, class_):
     """Return True if ``val`` is either a subclass or instance of ``class_``."""
     try:
@@ -211,17 +229,47 @@ def rfcformat(dt, localtime=False):
         return local_rfcformat(dt)
 
 
+# C implementation of UTC, where available; only used for conversions since
+# its ``repr`` differs from `UTC`'s
+_utc = getattr(datetime, 'timezone', None) and datetime.timezone.utc or UTC
+
+
 def isoformat(dt, localtime=False, *args, **kwargs):
     """Return the ISO8601-formatted UTC representation of a datetime object.
+    Naive datetimes are taken to be in UTC.
     """
-    if localtime and dt.tzinfo is not None:
-        localized = dt
-    else:
-        if dt.tzinfo is None:
-            localized = UTC.localize(dt)
-        else:
-            localized = dt.astimezone(UTC)
-    return localized.isoformat(*args, **kwargs)
+    if dt.tzinfo is None:
+        # Same as localizing to UTC
+        dt = dt.replace(tzinfo=_utc)
+    elif not localtime:
+        dt = dt.astimezone(_utc)
+    if args or kwargs:
+        return dt.isoformat(*args, **kwargs)
+    return format_iso(dt)
+
+
+def format_iso(value, milliseconds=False, zulu=False):
+    """Return the ISO8601 representation of a datetime, date or time object.
+
+    This is the formatter shared by :class:`DateTime <marshmallow.fields.DateTime>`
+    fields (through `isoformat`) and renderers that encode datetimes directly.
+    Naive datetimes are rendered without a UTC offset.
+
+    :param value: The `datetime.datetime`, `datetime.date` or `datetime.time`.
+    :param bool milliseconds: Truncate microseconds to milliseconds. Times are
+        then rendered without their UTC offset.
+    :param bool zulu: Use ``Z`` instead of ``+00:00`` for UTC datetimes.
+    """
+    ret = value.isoformat()
+    if isinstance(value, datetime.datetime):
+        if milliseconds and value.microsecond:
+            ret = ret[:23] + ret[26:]
+        if zulu and ret.endswith('+00:00'):
+            ret = ret[:-6] + 'Z'
+    elif isinstance(value, datetime.time):
+        if milliseconds and value.microsecond:
+            ret = ret[:12]
+    return ret
 
 
 def from_datestring(datestring):
@@ -249,11 +297,84 @@ def from_rfc(datestring, use_dateutil=True):
         return datetime.datetime.fromtimestamp(timestamp)
 
 
+_ISO_DATETIME_RE = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d)(?::(\d\d)(?:\.(\d{1,6}))?)?'
+    r'(?:(Z)|([+-])(\d\d):?(\d\d))?$'
+)
+_ISO_TIME_RE = re.compile(r'(\d\d):(\d\d)(?::(\d\d)(?:\.(\d{1,6}))?)?$')
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d\d)-(\d\d)$')
+
+# Python 3.7+
+_fromisoformat = getattr(datetime.datetime, 'fromisoformat', None)
+
+
+def _memoize(func):
+    """Cache the results of ``func`` for the most recently seen strings."""
+    if hasattr(functools, 'lru_cache'):
+        return functools.lru_cache(maxsize=1024)(func)
+    return func
+
+
+def _fixed_timezone(offset):
+    """Return a `tzinfo` for a fixed UTC offset in seconds, or `None` if there
+    is no implementation available.
+    """
+    if dateutil_available:  # Same classes as dateutil's parser
+        return tz.tzoffset(None, offset) if offset else tz.tzutc()
+    if _utc is not UTC:
+        return datetime.timezone(datetime.timedelta(seconds=offset)) if offset else _utc
+    return None if offset else UTC
+
+
+def _is_canonical_iso(datestring):
+    """Return True if ``datestring`` has the shape produced by `isoformat`,
+    ``YYYY-MM-DDTHH:MM:SS[.ffffff]+HH:MM``.
+    """
+    return (len(datestring) in (25, 32) and datestring[10] == 'T' and
+            datestring[-6] in '+-' and datestring[-3] == ':')
+
+
+@_memoize
+def _parse_iso_datetime(datestring):
+    """Parse the common shapes of ISO8601 datetimes,
+    ``YYYY-MM-DD[T ]HH:MM[:SS[.ffffff]][Z|±HH[:]MM]``, without dateutil.
+    Return `None` for other strings.
+    """
+    match = _ISO_DATETIME_RE.match(datestring)
+    if match is None:
+        return None
+    (year, month, day, hour, minute, second, fraction,
+     zulu, sign, offset_hours, offset_minutes) = match.groups()
+    tzinfo = None
+    if zulu:
+        tzinfo = _fixed_timezone(0)
+    elif sign:
+        offset = int(offset_hours) * 3600 + int(offset_minutes) * 60
+        tzinfo = _fixed_timezone(-offset if sign == '-' else offset)
+        if tzinfo is None:
+            return None
+    try:
+        if _fromisoformat is not None and _is_canonical_iso(datestring):
+            return _fromisoformat(datestring).replace(tzinfo=tzinfo)
+        return datetime.datetime(
+            int(year), int(month), int(day), int(hour), int(minute),
+            int(second or 0), int(fraction.ljust(6, '0')) if fraction else 0,
+            tzinfo=tzinfo,
+        )
+    except ValueError:  # e.g. month 13
+        return None
+
+
 def from_iso(datestring, use_dateutil=True):
     """Parse an ISO8601-formatted datetime string and return a datetime object.
 
-    Use dateutil's parser if possible and return a timezone-aware datetime.
+    Common shapes (see `_parse_iso_datetime`) are parsed directly. Otherwise
+    use dateutil's parser if possible and return a timezone-aware datetime.
     """
+    if isinstance(datestring, basestring):
+        ret = _parse_iso_datetime(datestring)
+        if ret is not None:
+            return ret
     # Use dateutil's parser if possible
     if dateutil_available and use_dateutil:
         return parser.parse(datestring)
@@ -262,10 +383,40 @@ def from_iso(datestring, use_dateutil=True):
         return datetime.datetime.strptime(datestring[:19], '%Y-%m-%dT%H:%M:%S')
 
 
+@_memoize
+def _parse_iso_time(timestring):
+    """Parse ``HH:MM[:SS[.ffffff]]`` times. Return `None` for other strings."""
+    match = _ISO_TIME_RE.match(timestring)
+    if match is None:
+        return None
+    hour, minute, second, fraction = match.groups()
+    try:
+        return datetime.time(int(hour), int(minute), int(second or 0),
+                             int(fraction.ljust(6, '0')) if fraction else 0)
+    except ValueError:
+        return None
+
+
+@_memoize
+def _parse_iso_date(datestring):
+    """Parse ``YYYY-MM-DD`` dates. Return `None` for other strings."""
+    match = _ISO_DATE_RE.match(datestring)
+    if match is None:
+        return None
+    try:
+        return datetime.date(*[int(each) for each in match.groups()])
+    except ValueError:
+        return None
+
+
 def from_iso_time(timestring, use_dateutil=True):
     """Parse an ISO8601-formatted datetime string and return a datetime.time
     object.
     """
+    if isinstance(timestring, basestring):
+        ret = _parse_iso_time(timestring)
+        if ret is not None:
+            return ret
     if dateutil_available and use_dateutil:
         return parser.parse(timestring).time()
     else:
@@ -276,6 +427,10 @@ def from_iso_time(timestring, use_dateutil=True):
         return datetime.datetime.strptime(timestring, fmt).time()
 
 def from_iso_date(datestring, use_dateutil=True):
+    if isinstance(datestring, basestring):
+        ret = _parse_iso_date(datestring)
+        if ret is not None:
+            return ret
     if dateutil_available and use_dateutil:
         return parser.parse(datestring).date()
     else:
@@ -326,6 +481,91 @@ def _get_value_for_key(key, obj, default):
     return default
 
 
+# Marks attributes not found by an `Accessor`
+_NOT_FOUND = object()
+
+
+def _get_attribute_for_key(key, obj, default):
+    """Same as `_get_value_for_key` for objects that do not support ``obj[key]``."""
+    attr = getattr(obj, key, _NOT_FOUND)
+    if attr is _NOT_FOUND:
+        return default
+    return attr() if callable(attr) else attr
+
+
+def _get_dict_value_for_key(key, obj, default):
+    """Same as `_get_value_for_key` for `dict` objects."""
+    try:
+        return obj[key]
+    except KeyError:
+        return _get_value_for_key(key, obj, default)
+
+
+class Accessor(object):
+    """Callable equivalent to ``get_value(key, obj, default)`` for a fixed ``key``.
+
+    The key is split on ``.`` once. The lookup used for each path component is
+    chosen the first time an object of a given type is seen and cached: objects
+    that cannot be indexed are read with `getattr` directly instead of raising
+    and catching a `TypeError` on ``obj[key]``.
+
+    :param key: The attribute, key or dotted path to get from objects.
+    """
+
+    __slots__ = ('key', 'first', 'rest', '_lookups')
+
+    def __init__(self, key):
+        self.key = key
+        if not isinstance(key, int) and '.' in key:
+            self.first, rest = key.split('.', 1)
+            #: `Accessor` for the remainder of a dotted path
+            self.rest = Accessor(rest)
+        else:
+            self.first, self.rest = key, None
+        # {<object type>: <lookup function>}
+        self._lookups = {}
+
+    def __repr__(self):
+        return '<Accessor({0!r})>'.format(self.key)
+
+    def _get_lookup(self, obj_type):
+        if isinstance(self.first, int) or issubclass(obj_type, type):
+            lookup = _get_value_for_key
+        elif obj_type is dict:
+            lookup = _get_dict_value_for_key
+        elif not hasattr(obj_type, '__getitem__'):
+            lookup = _get_attribute_for_key
+        else:
+            lookup = _get_value_for_key
+        self._lookups[obj_type] = lookup
+        return lookup
+
+    def __call__(self, obj, default=missing):
+        try:
+            lookup = self._lookups[type(obj)]
+        except KeyError:
+            lookup = self._get_lookup(type(obj))
+        value = lookup(self.first, obj, default)
+        if self.rest is None:
+            return value
+        return self.rest(value, default)
+
+
+# {<key>: <Accessor>}
+_accessors = {}
+
+
+def get_accessor(key):
+    """Return an `Accessor` for ``key``. Accessors hold no per-object state, so
+    a single instance is shared by all the fields that read the same key.
+    """
+    try:
+        return _accessors[key]
+    except KeyError:
+        ret = _accessors[key] = Accessor(key)
+        return ret
+
+
 def callable_or_raise(obj):
     """Check that an object is callable, else raise a :exc:`ValueError`.
     """
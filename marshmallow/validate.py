@@ -10,6 +10,28 @@ from marshmallow.compat import basestring, text_type, zip_longest
 from marshmallow.exceptions import ValidationError
 
 
+def _freeze(choices):
+    """Return ``choices`` as a frozenset for constant-time membership tests,
+    or `None` if ``in`` could behave differently on the frozenset.
+    """
+    if not isinstance(choices, (list, tuple, set, frozenset)):
+        return None
+    try:
+        return frozenset(choices)
+    except TypeError:  # Unhashable choices
+        return None
+
+
+def _contains(choices, frozen, value):
+    """Return ``value in choices``, using ``frozen`` when possible."""
+    if frozen is not None:
+        try:
+            return value in frozen
+        except TypeError:  # Unhashable value
+            pass
+    return value in choices
+
+
 class Validator(object):
     """Base abstract class for validators.
 
@@ -82,20 +104,19 @@ class URL(Validator):
         return self.error.format(input=value)
 
     def __call__(self, value):
-        message = self._format_error(value)
         if not value:
-            raise ValidationError(message)
+            raise ValidationError(self._format_error(value))
 
         # Check first if the scheme is valid
         if '://' in value:
             scheme = value.split('://')[0].lower()
             if scheme not in self.schemes:
-                raise ValidationError(message)
+                raise ValidationError(self._format_error(value))
 
         regex = self.RELATIVE_URL_REGEX if self.relative else self.URL_REGEX
 
         if not regex.search(value):
-            raise ValidationError(message)
+            raise ValidationError(self._format_error(value))
 
         return value
 
@@ -132,15 +153,13 @@ class Email(Validator):
         return self.error.format(input=value)
 
     def __call__(self, value):
-        message = self._format_error(value)
-
         if not value or '@' not in value:
-            raise ValidationError(message)
+            raise ValidationError(self._format_error(value))
 
         user_part, domain_part = value.rsplit('@', 1)
 
         if not self.USER_REGEX.match(user_part):
-            raise ValidationError(message)
+            raise ValidationError(self._format_error(value))
 
         if domain_part not in self.DOMAIN_WHITELIST:
             if not self.DOMAIN_REGEX.match(domain_part):
@@ -151,7 +170,7 @@ class Email(Validator):
                 else:
                     if self.DOMAIN_REGEX.match(domain_part):
                         return value
-                raise ValidationError(message)
+                raise ValidationError(self._format_error(value))
 
         return value
 
@@ -335,6 +354,15 @@ class NoneOf(Validator):
         self.values_text = ', '.join(text_type(each) for each in self.iterable)
         self.error = error or self.default_message
 
+    @property
+    def iterable(self):
+        return self._iterable
+
+    @iterable.setter
+    def iterable(self, iterable):
+        self._iterable = iterable
+        self._frozen = _freeze(iterable)
+
     def _repr_args(self):
         return 'iterable={0!r}'.format(self.iterable)
 
@@ -346,7 +374,7 @@ class NoneOf(Validator):
 
     def __call__(self, value):
         try:
-            if value in self.iterable:
+            if _contains(self._iterable, self._frozen, value):
                 raise ValidationError(self._format_error(value))
         except TypeError:
             pass
@@ -372,6 +400,15 @@ class OneOf(Validator):
         self.labels_text = ', '.join(text_type(label) for label in self.labels)
         self.error = error or self.default_message
 
+    @property
+    def choices(self):
+        return self._choices
+
+    @choices.setter
+    def choices(self, choices):
+        self._choices = choices
+        self._frozen = _freeze(choices)
+
     def _repr_args(self):
         return 'choices={0!r}, labels={1!r}'.format(self.choices, self.labels)
 
@@ -384,7 +421,7 @@ class OneOf(Validator):
 
     def __call__(self, value):
         try:
-            if value not in self.choices:
+            if not _contains(self._choices, self._frozen, value):
                 raise ValidationError(self._format_error(value))
         except TypeError:
             raise ValidationError(self._format_error(value))
@@ -424,6 +461,14 @@ class ContainsOnly(OneOf):
         return super(ContainsOnly, self)._format_error(value_text)
 
     def __call__(self, value):
+        frozen = self._frozen
+        if frozen is not None and len(frozen) == len(self._choices):
+            # Choices are unique, so each of them may be used at most once
+            try:
+                return self._check_unique(value, frozen)
+            except TypeError:  # Unhashable value
+                pass
+
         choices = list(self.choices)
 
         if not value and choices:
@@ -440,3 +485,15 @@ class ContainsOnly(OneOf):
                 del choices[index]
 
         return value
+
+    def _check_unique(self, value, frozen):
+        if not value and frozen:
+            raise ValidationError(self._format_error(value))
+
+        seen = set()
+        for val in value:
+            if val not in frozen or val in seen:
+                raise ValidationError(self._format_error(value))
+            seen.add(val)
+
+        return value
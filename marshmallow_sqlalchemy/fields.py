@@ -1,8 +1,23 @@
 # -*- coding: utf-8 -*-
 
+import operator
+from collections import namedtuple
+
+import sqlalchemy as sa
 from marshmallow import fields
+from marshmallow.compat import basestring
 from marshmallow.utils import is_iterable_but_not_string
 
+#: Maximum number of keys looked up by a single ``IN`` query
+IN_CHUNK_SIZE = 500
+
+#: What a `Related` field resolved from the schema it is bound to: the root
+#: schema, the models, the related key properties, their names and columns,
+#: and a getter of the key values of a related instance
+_Binding = namedtuple('_Binding', [
+    'parent', 'name', 'schema', 'model', 'related_model', 'related_keys',
+    'key_names', 'key_columns', 'get_key',
+])
 
 def get_primary_keys(model):
     """Get primary key properties for a SQLAlchemy model.
@@ -24,6 +39,60 @@ def get_schema_for_field(field):
 def ensure_list(value):
     return value if is_iterable_but_not_string(value) else [value]
 
+def _coerce_key_value(column, value):
+    """Convert string values of integer columns, as found in query strings,
+    to integers so that they match the keys of the loaded instances.
+    """
+    if not isinstance(value, basestring):
+        return value
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return value
+    if python_type is int:
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    return value
+
+def load_related(session, model, keys, key_names):
+    """Return a dictionary mapping those of ``keys``, tuples of the values of
+    the ``key_names`` attributes of ``model``, which exist to their instance.
+
+    Instances found in the identity map of ``session`` are used as is when
+    ``key_names`` are the primary key; the other keys are loaded with one
+    ``IN`` query (a tuple ``IN`` for composite keys) per `IN_CHUNK_SIZE` keys.
+    """
+    found = {}
+    pending = list(keys)
+    mapper = model.__mapper__
+    if list(key_names) == [prop.key for prop in get_primary_keys(model)]:
+        identity_map = session.identity_map
+        missing = []
+        for key in pending:
+            instance = identity_map.get(mapper.identity_key_from_primary_key(list(key)))
+            if instance is not None:
+                state = sa.inspect(instance)
+                if not (state.expired or state.deleted or state.was_deleted):
+                    found[key] = instance
+                    continue
+            missing.append(key)
+        pending = missing
+    if not pending:
+        return found
+    attrs = [getattr(model, name) for name in key_names]
+    if len(attrs) == 1:
+        condition = lambda chunk: attrs[0].in_([key[0] for key in chunk])
+    else:
+        condition = lambda chunk: sa.tuple_(*attrs).in_(chunk)
+    for start in range(0, len(pending), IN_CHUNK_SIZE):
+        chunk = pending[start:start + IN_CHUNK_SIZE]
+        for instance in session.query(model).filter(condition(chunk)):
+            key = tuple(getattr(instance, name) for name in key_names)
+            found.setdefault(key, instance)
+    return found
+
 class Related(fields.Field):
     """Related data represented by a SQLAlchemy `relationship`. Must be attached
     to a :class:`Schema` class whose options includes a SQLAlchemy `model`, such
@@ -33,54 +102,111 @@ class Related(fields.Field):
         the primary key(s) of the related model will be used.
     """
 
+    __slots__ = ('columns', '_binding')
+
+    default_error_messages = {
+        'not_found': 'Related object {value!r} not found.',
+    }
+
     def __init__(self, column=None, **kwargs):
         super(Related, self).__init__(**kwargs)
         self.columns = ensure_list(column or [])
+        #: `_Binding` of the field to its current parent
+        self._binding = None
+
+    def _bind(self):
+        """Return the `_Binding` of the field, resolving it again if the field
+        was bound to another parent since.
+        """
+        binding = self._binding
+        if binding is None or binding.parent is not self.parent or binding.name != self.name:
+            schema = get_schema_for_field(self)
+            model = schema.opts.model
+            related_model = getattr(model, self.attribute or self.name).property.mapper.class_
+            if self.columns:
+                related_keys = [
+                    related_model.__mapper__.columns[column]
+                    for column in self.columns
+                ]
+            else:
+                related_keys = get_primary_keys(related_model)
+            key_names = tuple(prop.key for prop in related_keys)
+            binding = self._binding = _Binding(
+                parent=self.parent,
+                name=self.name,
+                schema=schema,
+                model=model,
+                related_model=related_model,
+                related_keys=related_keys,
+                key_names=key_names,
+                key_columns=tuple(
+                    prop.columns[0] if hasattr(prop, 'columns') else prop
+                    for prop in related_keys
+                ),
+                get_key=operator.attrgetter(*key_names),
+            )
+        return binding
 
     @property
     def model(self):
-        schema = get_schema_for_field(self)
-        return schema.opts.model
+        return self._bind().model
 
     @property
     def related_model(self):
-        return getattr(self.model, self.attribute or self.name).property.mapper.class_
+        return self._bind().related_model
 
     @property
     def related_keys(self):
-        if self.columns:
-            return [
-                self.related_model.__mapper__.columns[column]
-                for column in self.columns
-            ]
-        return get_primary_keys(self.related_model)
+        return self._bind().related_keys
 
     @property
     def session(self):
-        schema = get_schema_for_field(self)
-        return schema.session
+        return self._bind().schema.session
 
     def _serialize(self, value, attr, obj):
-        ret = {
-            prop.key: getattr(value, prop.key, None)
-            for prop in self.related_keys
-        }
-        return ret if len(ret) > 1 else list(ret.values())[0]
+        binding = self._bind()
+        key_names = binding.key_names
+        try:
+            key = binding.get_key(value)
+        except AttributeError:
+            key = tuple(getattr(value, name, None) for name in key_names)
+            if len(key_names) == 1:
+                key = key[0]
+        if len(key_names) == 1:
+            return key
+        return dict(zip(key_names, key))
 
-    def _deserialize(self, value, *args, **kwargs):
+    def get_key(self, value):
+        """Return the tuple of the values of `related_keys` in ``value``, a
+        scalar or a dictionary.
+        """
+        binding = self._bind()
+        key_names = binding.key_names
         if not isinstance(value, dict):
-            if len(self.related_keys) != 1:
+            if len(key_names) != 1:
                 raise ValueError(
                     'Could not deserialized related value {0!r}; expected a dictionary '
-                    'with keys {1!r}'.format(
-                        value,
-                        [prop.key for prop in self.related_keys]
-                    )
+                    'with keys {1!r}'.format(value, list(key_names))
                 )
-            value = {self.related_keys[0].key: value}
-        return self.session.query(
-            self.related_model
-        ).filter_by(**{
-            prop.key: value.get(prop.key)
-            for prop in self.related_keys
-        }).one()
+            return (_coerce_key_value(binding.key_columns[0], value), )
+        return tuple(
+            _coerce_key_value(column, value.get(name))
+            for column, name in zip(binding.key_columns, key_names)
+        )
+
+    def get_key_names(self):
+        return self._bind().key_names
+
+    def _deserialize(self, value, *args, **kwargs):
+        key = self.get_key(value)
+        related_model = self.related_model
+        cache_key = (related_model, self.get_key_names())
+        # Instances prefetched by `ModelSchema.load` for the whole payload
+        instances = getattr(self._bind().schema, '_related_instances', None)
+        found = instances.get(cache_key, {}) if instances is not None else {}
+        if key not in found:
+            found = load_related(self.session, related_model, [key], cache_key[1])
+        instance = found.get(key)
+        if instance is None:
+            self.fail('not_found', value=value)
+        return instance
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Serialization of SQLAlchemy Core result rows with the fields of a
+`ModelSchema` or `TableSchema`, without building ORM instances.
+
+Example: ::
+
+    from marshmallow_sqlalchemy.rows import RowDumper
+
+    schema = UserSchema(many=True, exclude=('roles', ))
+    dumper = RowDumper(schema)
+    rows = session.execute(
+        session.query(User).with_entities(*dumper.columns).statement
+    ).fetchall()
+    data = dumper.dump(rows)
+"""
+from marshmallow import compiler
+from marshmallow.compat import iteritems
+from marshmallow.exceptions import ValidationError
+
+
+def _dumped_fields(schema):
+    return [
+        (attr_name, field_obj)
+        for attr_name, field_obj in iteritems(schema.fields)
+        if not field_obj.load_only
+    ]
+
+def _column_for(schema, attribute):
+    model = getattr(schema.opts, 'model', None)
+    if model is not None:
+        mapper = model.__mapper__
+        if not mapper.has_property(attribute):
+            return None
+        prop = mapper.get_property(attribute)
+        if len(getattr(prop, 'columns', ())) != 1:  # Relationships, composites
+            return None
+        return getattr(model, attribute)
+    table = getattr(schema.opts, 'table', None)
+    if table is not None:
+        return table.c.get(attribute)
+    return None
+
+def row_columns(schema):
+    """Return the column expressions holding the values of the fields
+    ``schema`` serializes, in field order, or `None` if rows cannot be
+    serialized with ``schema``: a field is not backed by a single column
+    (relationships, method fields, dotted attributes), or the schema has
+    ``pre_dump`` or ``post_dump`` processors, which expect instances.
+    """
+    plan = schema._get_dump_plan()
+    if plan.pre_dump or plan.post_dump or schema.extra:
+        return None
+    columns = []
+    for attr_name, field_obj in _dumped_fields(schema):
+        attribute = field_obj.attribute or attr_name
+        if not field_obj._CHECK_ATTRIBUTE or '.' in attribute:
+            return None
+        column = _column_for(schema, attribute)
+        if column is None:
+            return None
+        columns.append(column)
+    return columns
+
+def _index_getter(index):
+    def getter(row, default):
+        return row[index]
+    return getter
+
+
+class RowDumper(object):
+    """Serialize the rows of a SELECT of `columns` with the fields of
+    ``schema``. The values are read from the rows by position with getters
+    compiled once, in a dump function generated by `marshmallow.compiler`.
+
+    :param schema: A `ModelSchema` or `TableSchema` instance for which
+        `row_columns` is not `None`.
+    :param list columns: The result of ``row_columns(schema)``, if already
+        computed.
+    """
+
+    def __init__(self, schema, columns=None):
+        self.schema = schema
+        self.columns = row_columns(schema) if columns is None else columns
+        if self.columns is None:
+            raise ValueError(
+                'Rows cannot be serialized with {0!r}'.format(schema))
+        dumped = _dumped_fields(schema)
+        #: Attributes of the selected columns, in order
+        self.attributes = [
+            field_obj.attribute or attr_name for attr_name, field_obj in dumped
+        ]
+        self._indexes = dict(
+            (attribute, index) for index, attribute in enumerate(self.attributes)
+        )
+        self._dump = compiler.compile_dump(
+            schema.fields,
+            prefix=schema.prefix,
+            accessor=self.get_value,
+            dict_class=schema.dict_class,
+            getters=dict(
+                (attr_name, _index_getter(index))
+                for index, (attr_name, _) in enumerate(dumped)
+            ),
+        )
+
+    def get_value(self, attribute, row, default):
+        """Accessor for the fields which do not use the compiled getters."""
+        return row[self._indexes[attribute]]
+
+    def dump(self, rows):
+        """Return the list of the serialized ``rows``. Fields failing to
+        serialize are left out, like `Schema.dump` does.
+        """
+        dump = self._dump
+        try:
+            return [dump(row) for row in rows]
+        except ValidationError:
+            # Collect the errors with the generic path
+            attributes = self.attributes
+            return self.schema.dump(
+                [dict(zip(attributes, row)) for row in rows], many=True
+            ).data
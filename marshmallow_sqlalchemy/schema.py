@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
+import threading
+
 import marshmallow as ma
 from marshmallow.compat import with_metaclass, iteritems
 
 from .convert import ModelConverter
-from .fields import get_primary_keys
+from .fields import Related, get_primary_keys, load_related
 
 
 class TableSchemaOpts(ma.SchemaOpts):
@@ -41,28 +43,112 @@ class ModelSchemaOpts(ma.SchemaOpts):
         self.model_converter = getattr(meta, 'model_converter', ModelConverter)
         self.include_fk = getattr(meta, 'include_fk', False)
 
+#: Fields converted from SQLAlchemy models and tables, keyed by
+#: `SchemaMeta.conversion_key`; shared between the schema classes converting
+#: the same model or table with the same options
+_converted_fields = {}
+_conversion_lock = threading.RLock()
+
+
+class _DeclaredFields(object):
+    """Descriptor giving the instances of `TableSchema` and `ModelSchema` the
+    ``_declared_fields`` of their class. The metaclass property computing them
+    lazily is only found on the class itself.
+    """
+
+    def __get__(self, instance, owner):
+        return owner._declared_fields
+
+
 class SchemaMeta(ma.schema.SchemaMeta):
-    """Metaclass for `ModelSchema`."""
+    """Metaclass for `ModelSchema`.
+
+    The fields converted from the SQLAlchemy model or table are computed the
+    first time the ``_declared_fields`` of the class are needed, usually when
+    the schema is first instantiated, rather than when the class is defined,
+    so that defining schemas neither walks nor configures the mappers.
+    Conversion errors are raised at that point. Instances read the fields of
+    their class through `_DeclaredFields`.
+    """
+
+    # override SchemaMeta
+    @classmethod
+    def get_inherited_fields(mcs, klass):
+        """Returns no fields: the inherited fields, which include the fields
+        converted for the parent schemas, are collected by `_declared_fields`.
+        """
+        return []
 
     # override SchemaMeta
     @classmethod
     def get_declared_fields(mcs, klass, cls_fields, inherited_fields, dict_cls):
-        """Updates declared fields with fields converted from the SQLAlchemy model
-        passed as the `model` class Meta option.
+        """Returns the fields declared on the class itself. The fields
+        converted from the SQLAlchemy model passed as the `model` class Meta
+        option and the inherited fields are added lazily, see
+        `_declared_fields`.
         """
-        declared_fields = dict_cls()
-        opts = klass.opts
-        Converter = opts.model_converter
-        converter = Converter(schema_cls=klass)
-        declared_fields = mcs.get_fields(converter, opts, dict_cls)
-        base_fields = super(SchemaMeta, mcs).get_declared_fields(
+        klass._sqla_dict_cls = dict_cls
+        return super(SchemaMeta, mcs).get_declared_fields(
             klass, cls_fields, inherited_fields, dict_cls
         )
-        declared_fields.update(base_fields)
+
+    @property
+    def _declared_fields(cls):
+        declared_fields = cls.__dict__.get('_sqla_declared_fields')
+        if declared_fields is None:
+            with _conversion_lock:
+                declared_fields = cls.__dict__.get('_sqla_declared_fields')
+                if declared_fields is None:
+                    dict_cls = cls._sqla_dict_cls
+                    declared_fields = dict_cls(
+                        type(cls).get_converted_fields(cls, dict_cls))
+                    declared_fields.update(
+                        ma.schema._get_fields_by_mro(cls, ma.base.FieldABC))
+                    declared_fields.update(cls._sqla_cls_fields)
+                    cls._sqla_declared_fields = declared_fields
         return declared_fields
 
+    @_declared_fields.setter
+    def _declared_fields(cls, value):
+        cls._sqla_cls_fields = value
+        cls._sqla_declared_fields = None
+
+    @classmethod
+    def get_converted_fields(mcs, klass, dict_cls):
+        """Return the fields converted from the SQLAlchemy model or table of
+        ``klass``, memoized by `conversion_key`. The returned dictionary is
+        shared and must not be modified.
+        """
+        opts = klass.opts
+        key = mcs.conversion_key(klass, dict_cls)
+        fields = _converted_fields.get(key)
+        if fields is None:
+            converter = opts.model_converter(schema_cls=klass)
+            fields = mcs.get_fields(converter, opts, dict_cls)
+            fields = _converted_fields[key] = fields if fields is not None else dict_cls()
+        return fields
+
+    @classmethod
+    def conversion_key(mcs, klass, dict_cls):
+        """Return the options the fields converted for ``klass`` depend on."""
+        opts = klass.opts
+        # The converter falls back on the TYPE_MAPPING of the schema class
+        type_mapping_owner = next(
+            base for base in klass.__mro__ if 'TYPE_MAPPING' in base.__dict__)
+        return (
+            mcs,
+            getattr(opts, 'model', None),
+            getattr(opts, 'table', None),
+            opts.include_fk,
+            frozenset(opts.fields),
+            frozenset(opts.exclude),
+            opts.model_converter,
+            type_mapping_owner,
+            dict_cls,
+        )
+
     @classmethod
-    def get_fields(mcs, converter, opts):
+    def get_fields(mcs, converter, opts, dict_cls):
         pass
 
 class TableSchemaMeta(SchemaMeta):
@@ -112,6 +198,7 @@ class TableSchema(with_metaclass(TableSchemaMeta, ma.Schema)):
         serialized = schema.dump(user).data
     """
     OPTIONS_CLASS = TableSchemaOpts
+    _declared_fields = _DeclaredFields()
 
 class ModelSchema(with_metaclass(ModelSchemaMeta, ma.Schema)):
     """Base class for SQLAlchemy model-based Schemas.
@@ -134,12 +221,99 @@ class ModelSchema(with_metaclass(ModelSchemaMeta, ma.Schema)):
     :param instance: Optional existing instance to modify; may be overridden in `load`.
     """
     OPTIONS_CLASS = ModelSchemaOpts
+    _declared_fields = _DeclaredFields()
 
     def __init__(self, *args, **kwargs):
         session = kwargs.pop('session', None)
         self.instance = kwargs.pop('instance', None)
         super(ModelSchema, self).__init__(*args, **kwargs)
         self.session = session or self.opts.sqla_session
+        #: Instances referenced by the `Related` fields of the data being
+        #: loaded, keyed by related model and key names, then by key
+        self._related_instances = None
+        #: Existing instances of the model for the data being loaded with
+        #: ``many=True``, keyed by primary key
+        self._existing_instances = None
+        #: Instances created and updated by the last call to `load`, to be
+        #: added to the session or flushed separately
+        self.new_instances = []
+        self.updated_instances = []
+
+    def _related_fields(self):
+        """Yield ``(key, field)`` pairs for the `Related` fields of the schema,
+        and for those in a `List`, where ``key`` is their key in the input.
+        """
+        for name, field in iteritems(self.fields):
+            if field.dump_only:
+                continue
+            related = field.container if isinstance(field, ma.fields.List) else field
+            if isinstance(related, Related):
+                yield field.load_from or name, related
+
+    def prefetch_related(self, data, many):
+        """Load the instances referenced by the `Related` fields of ``data``
+        with one query per related model, and return them in the format of
+        `_related_instances`. Keys which do not exist map to `None`.
+        """
+        related_fields = list(self._related_fields())
+        if not related_fields:
+            return {}
+        requested = {}
+        for item in (data if many and ma.utils.is_collection(data) else [data]):
+            if not isinstance(item, dict):
+                continue
+            for key, field in related_fields:
+                value = item.get(key)
+                if value is None:
+                    continue
+                values = value if ma.utils.is_collection(value) else [value]
+                for each in values:
+                    if each is None:
+                        continue
+                    try:
+                        related_key = field.get_key(each)
+                    except (ValueError, TypeError):
+                        continue  # Reported when the field is deserialized
+                    cache_key = (field.related_model, field.get_key_names())
+                    requested.setdefault(cache_key, set()).add(related_key)
+        instances = {}
+        for cache_key, keys in iteritems(requested):
+            model, key_names = cache_key
+            found = load_related(self.session, model, keys, key_names)
+            instances[cache_key] = dict((key, found.get(key)) for key in keys)
+        return instances
+
+    def prefetch_instances(self, data):
+        """Load the existing instances of the model whose primary keys appear
+        in ``data``, a collection, with one query (per `IN_CHUNK_SIZE` keys),
+        and return them in the format of `_existing_instances`. Keys which do
+        not exist map to `None`.
+        """
+        props = get_primary_keys(self.opts.model)
+        key_fields = []
+        for prop in props:
+            for name, field in iteritems(self.fields):
+                if (field.attribute or name) == prop.key and not field.dump_only:
+                    key_fields.append((field.load_from or name, field))
+                    break
+            else:
+                return {}
+        keys = set()
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            try:
+                key = tuple(field.deserialize(item.get(load_key, ma.missing))
+                            for load_key, field in key_fields)
+            except (ma.ValidationError, TypeError, ValueError):
+                continue  # Reported when the item is deserialized
+            if None not in key and ma.missing not in key:
+                keys.add(key)
+        if not keys:
+            return {}
+        key_names = [prop.key for prop in props]
+        found = load_related(self.session, self.opts.model, keys, key_names)
+        return dict((key, found.get(key)) for key in keys)
 
     def get_instance(self, data):
         """Retrieve an existing record by primary key(s)."""
@@ -149,6 +323,11 @@ class ModelSchema(with_metaclass(ModelSchemaMeta, ma.Schema)):
             for prop in props
         }
         if None not in filters.values():
+            existing = self._existing_instances
+            if existing is not None:
+                key = tuple(filters[prop.key] for prop in props)
+                if key in existing:
+                    return existing[key]
             return self.session.query(
                 self.opts.model
             ).filter_by(
@@ -168,11 +347,17 @@ class ModelSchema(with_metaclass(ModelSchemaMeta, ma.Schema)):
         if instance is not None:
             for key, value in iteritems(data):
                 setattr(instance, key, value)
+            self.updated_instances.append(instance)
             return instance
-        return self.opts.model(**data)
+        instance = self.opts.model(**data)
+        self.new_instances.append(instance)
+        return instance
 
     def load(self, data, session=None, instance=None, *args, **kwargs):
-        """Deserialize data to internal representation.
+        """Deserialize data to internal representation. With ``many=True``, the
+        existing rows are fetched together before the instances are made; the
+        instances are also collected in `new_instances` and
+        `updated_instances`.
 
         :param session: Optional SQLAlchemy session.
         :param instance: Optional existing instance to modify.
@@ -181,10 +366,27 @@ class ModelSchema(with_metaclass(ModelSchemaMeta, ma.Schema)):
         self.instance = instance or self.instance
         if not self.session:
             raise ValueError('Deserialization requires a session')
-        return super(ModelSchema, self).load(data, *args, **kwargs)
+        many = kwargs.get('many', args[0] if args else None)
+        many = self.many if many is None else bool(many)
+        self._related_instances = self.prefetch_related(data, many)
+        if many and not self.instance and ma.utils.is_collection(data):
+            self._existing_instances = self.prefetch_instances(data)
+        self.new_instances = []
+        self.updated_instances = []
+        try:
+            return super(ModelSchema, self).load(data, *args, **kwargs)
+        finally:
+            self._related_instances = None
+            self._existing_instances = None
 
     def validate(self, data, session=None, *args, **kwargs):
         self.session = session or self.session
         if not self.session:
             raise ValueError('Validation requires a session')
-        return super(ModelSchema, self).validate(data, *args, **kwargs)
+        many = kwargs.get('many', args[0] if args else None)
+        self._related_instances = self.prefetch_related(
+            data, self.many if many is None else bool(many))
+        try:
+            return super(ModelSchema, self).validate(data, *args, **kwargs)
+        finally:
+            self._related_instances = None
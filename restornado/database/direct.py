@@ -0,0 +1,157 @@
+# coding: utf-8
+"""
+Single-statement updates and deletes by lookup.
+
+`update_by` and `delete_by` run ``UPDATE ... WHERE`` and ``DELETE ... WHERE``
+with SQLAlchemy Core, without loading an instance first, and tell whether a
+row matched from the row count. Updates read the written row back with
+``RETURNING`` when the dialect supports it.
+
+The ORM is bypassed: relationship cascades, ``before_update`` mapper events
+and the instances already in the session are not involved.
+"""
+from sqlalchemy import and_
+from sqlalchemy.util import int_types, string_types
+
+from restornado.database.upsert import coerce_value
+
+
+def supports_returning(dialect):
+    """
+    Tell whether `dialect` supports ``UPDATE ... RETURNING``.
+    """
+    # SQLAlchemy 2.0 flags each statement kind, 1.4 only has full_returning
+    supported = getattr(dialect, 'update_returning', None)
+    if supported is None:
+        supported = getattr(dialect, 'full_returning', False)
+    return bool(supported)
+
+
+def version_attribute(model):
+    """
+    Return the attribute of the ``version_id_col`` of the mapper of `model`,
+    or `None`.
+    """
+    mapper = model.__mapper__
+    if mapper.version_id_col is None:
+        return None
+    return mapper.get_property_by_column(mapper.version_id_col).key
+
+
+def parse_version(model, attribute, value):
+    """
+    Return `value`, the entity tag of an If-Match header, as a value of the
+    version column `attribute` of `model`. Raise `ValueError` if it is not
+    one, e.g. not a number for an integer column.
+    """
+    column = model.__mapper__.get_property(attribute).columns[0]
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if issubclass(python_type, int_types):
+        if not value.isdigit():
+            raise ValueError('Invalid version {0!r}'.format(value))
+        return int(value)
+    if issubclass(python_type, string_types):
+        return value
+    try:
+        return python_type(value)
+    except TypeError:
+        raise ValueError('Invalid version {0!r}'.format(value))
+
+
+def where_clause(model, lookup):
+    """
+    Return the criterion matching the rows of `model` whose attributes have
+    the values of `lookup`, a dict such as the URL keyword arguments.
+    """
+    mapper = model.__mapper__
+    criteria = []
+    for attribute, value in lookup.items():
+        column = mapper.get_property(attribute).columns[0]
+        criteria.append(column == coerce_value(column, value))
+    return and_(*criteria)
+
+
+def exists_by(session, model, lookup):
+    """
+    Tell whether a row of `model` matches `lookup`.
+    """
+    mapper = model.__mapper__
+    return session.execute(
+        mapper.local_table.select()
+        .with_only_columns(list(mapper.primary_key[:1]))
+        .where(where_clause(model, lookup))
+    ).first() is not None
+
+
+def update_by(session, model, lookup, values, columns, returning=True,
+              version=None):
+    """
+    Write `values`, a dict of attribute values, to the row of `model`
+    matching `lookup`, with a single UPDATE. Only the attributes in
+    `columns`, as returned by `upsert_columns`, are written.
+
+    `version`, an ``(attribute, value)`` pair as returned by `parse_version`,
+    makes the UPDATE conditional on the version column holding `value`, and
+    increments it if it is an integer. The ``version_id_col`` of the mapper
+    is incremented in any case.
+
+    Return `None` if no row matched. Otherwise return a dict of the row:
+    every attribute in `columns` read back with ``RETURNING`` if `returning`
+    and the dialect support it, else the written values and `lookup`.
+    """
+    mapper = model.__mapper__
+    table = mapper.local_table
+    criterion = where_clause(model, lookup)
+    written = dict(
+        (column.key, coerce_value(column, values[attribute]))
+        for attribute, column in columns.items()
+        if attribute in values
+    )
+    result = dict(
+        (attribute, written[column.key])
+        for attribute, column in columns.items()
+        if column.key in written
+    )
+    if version is not None:
+        attribute, expected = version
+        column = mapper.get_property(attribute).columns[0]
+        criterion = and_(criterion, column == expected)
+        if isinstance(expected, int_types):
+            written[column.key] = column + 1
+            result[attribute] = expected + 1
+        elif not written:
+            # Nothing to SET: still check the version with the UPDATE
+            written[column.key] = column
+    elif mapper.version_id_col is not None and written:
+        # Keep the versioning of the ORM counting the writes
+        written[mapper.version_id_col.key] = mapper.version_id_col + 1
+    if not written:
+        # Nothing to SET: only check that the row exists
+        return dict(lookup) if exists_by(session, model, lookup) else None
+    statement = table.update().where(criterion).values(written)
+    dialect = session.get_bind(mapper).dialect
+    if returning and supports_returning(dialect):
+        attributes = list(columns)
+        row = session.execute(statement.returning(
+            *[columns[attribute] for attribute in attributes])).first()
+        if row is None:
+            return None
+        return dict(zip(attributes, row))
+    if not session.execute(statement).rowcount:
+        return None
+    for attribute, value in lookup.items():
+        result.setdefault(attribute, value)
+    return result
+
+
+def delete_by(session, model, lookup):
+    """
+    Delete the rows of `model` matching `lookup` with a single DELETE and
+    return how many there were.
+    """
+    table = model.__mapper__.local_table
+    return session.execute(
+        table.delete().where(where_clause(model, lookup))).rowcount
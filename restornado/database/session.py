@@ -6,23 +6,57 @@ import contextlib
 
 import tornado.ioloop
 import tornado.log
+from sqlalchemy import text
 
-from restornado.db import get_session
+from restornado.database import get_session
 
 
 logger = tornado.log.app_log
 
 
+#: Session mode of pure reads: no autoflush, and the transaction is rolled
+#: back instead of committed
+READ = 'read'
+#: Session mode of writes: instances are not expired on commit, so they can
+#: be serialized afterwards without being loaded again
+WRITE = 'write'
+
+#: Dialects supporting SET TRANSACTION READ ONLY
+READ_ONLY_DIALECTS = ('postgresql', 'mysql')
+
+
 @contextlib.contextmanager
-def session_manager():
+def session_manager(mode=None, read_only_transaction=False):
+    """
+    Provide a session for the block, committed at the end of it, or rolled
+    back if it raises.
+
+    :param mode: `READ` or `WRITE` to tune the session for reads or writes,
+        or `None` for the defaults of the sessionmaker.
+    :param read_only_transaction: In `READ` mode, start the transaction
+        with SET TRANSACTION READ ONLY where the dialect supports it.
+    """
     session = get_session()
+    autoflush, expire_on_commit = session.autoflush, session.expire_on_commit
     try:
+        if mode == READ:
+            session.autoflush = False
+            if read_only_transaction and \
+                    session.get_bind().dialect.name in READ_ONLY_DIALECTS:
+                session.execute(text(u"SET TRANSACTION READ ONLY"))
+        elif mode == WRITE:
+            session.expire_on_commit = False
         yield session
-        session.commit()
+        if mode == READ:
+            session.rollback()
+        else:
+            session.commit()
     except:
         session.rollback()
         raise
     finally:
+        # Scoped sessions are reused by the next request of the thread
+        session.autoflush, session.expire_on_commit = autoflush, expire_on_commit
         session.close()
 
 
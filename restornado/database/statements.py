@@ -0,0 +1,172 @@
+# coding: utf-8
+"""
+Statements of the generic views built once and reused by later requests.
+
+The query shapes the generic views run on every request are built once per
+view class, with their request values as bound parameters:
+
+- ORM queries, such as the permission check and `get_object`, are baked with
+  `sqlalchemy.ext.baked`, which also keeps their compiled form.
+- Core statements, such as the count of `get_queryset_total`, are kept as
+  they are; SQLAlchemy 1.4 caches their compiled form by itself. Those built
+  from the query of `get_queryset` are keyed by the shape of its filters,
+  see `filter_shape`.
+
+`stats` counts, per view class and shape, the executions which found their
+statement already built.
+"""
+import json
+import threading
+from collections import OrderedDict
+
+from sqlalchemy.ext import baked
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.util import LRUCache
+from tornado.web import RequestHandler
+
+
+class StatementStats(object):
+    """Thread-safe hit and miss counts per view class and shape."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def record(self, name, shape, hit):
+        with self.lock:
+            counts = self.counts.setdefault(name, {}).setdefault(shape, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def reset(self):
+        with self.lock:
+            self.counts = {}
+
+    def as_dict(self):
+        with self.lock:
+            return OrderedDict(
+                (name, OrderedDict(
+                    (shape, OrderedDict([
+                        ('hits', hits),
+                        ('misses', misses),
+                        ('hit_rate', hits / float(hits + misses)),
+                    ]))
+                    for shape, (hits, misses) in sorted(shapes.items())
+                ))
+                for name, shapes in sorted(self.counts.items())
+            )
+
+
+#: Counts recorded by the generic views
+stats = StatementStats()
+
+
+def filter_shape(queryset):
+    """
+    Return the shape of the filters of `queryset`, which keys the statements
+    built from it, or `None` if they must not be reused. Statements can only
+    be reused when every value the filters compare against is a
+    ``bindparam`` given its value with ``.params()``, which is passed again
+    when they are executed; a filter holding a value of its own would be
+    frozen in the statement built for the first request.
+    """
+    whereclause = queryset.whereclause
+    if whereclause is None:
+        return ()
+    for element in visitors.iterate(whereclause, {}):
+        if isinstance(element, BindParameter) and (
+                element.value is not None or element.callable is not None):
+            return None
+    generate = getattr(whereclause, '_generate_cache_key', None)
+    if generate is None:  # SQLAlchemy < 1.4
+        return (str(whereclause),)
+    key = generate()
+    return None if key is None else key.key
+
+
+class StatementCache(object):
+    """
+    Statements keyed by a view class, a shape name and any extra key values.
+
+    :param int size: How many statements of each kind to keep.
+    """
+
+    def __init__(self, size=500):
+        self.bakery = baked.bakery(size=size)
+        self.statements = LRUCache(size)
+
+    def query(self, session, view_class, shape, build, *key):
+        """
+        Return the baked query of `shape` for `view_class`. On first use,
+        `build(session)` makes the `Query`, whose request values must be
+        ``bindparam`` objects; call ``.params()`` on the result to bind them.
+        """
+        built = []
+
+        def initial(session):
+            built.append(True)
+            return build(session)
+
+        return _RecordingResult(
+            self.bakery(initial, view_class, shape, *key)(session),
+            view_class.__name__, shape, built)
+
+    def statement(self, view_class, shape, build, *key):
+        """
+        Return the Core statement of `shape` for `view_class`, made by
+        `build()` on first use.
+        """
+        cache_key = (view_class, shape) + key
+        statement = self.statements.get(cache_key)
+        hit = statement is not None
+        if not hit:
+            statement = self.statements[cache_key] = build()
+        stats.record(view_class.__name__, shape, hit)
+        return statement
+
+
+class _RecordingResult(object):
+    """Baked query result recording whether its statement was built."""
+
+    def __init__(self, result, name, shape, built):
+        self.result = result
+        self.name = name
+        self.shape = shape
+        self.built = built
+
+    def params(self, *args, **kwargs):
+        self.result = self.result.params(*args, **kwargs)
+        return self
+
+    def _run(self, method):
+        value = getattr(self.result, method)()
+        stats.record(self.name, self.shape, not self.built)
+        return value
+
+    def first(self):
+        return self._run('first')
+
+    def scalar(self):
+        return self._run('scalar')
+
+    def all(self):
+        return self._run('all')
+
+
+#: Statements of the generic views
+cache = StatementCache()
+
+
+class StatementStatsHandler(RequestHandler):
+    """Serve the statement cache counts as JSON; ``DELETE`` resets them."""
+
+    def initialize(self, stats=stats):
+        self.stats = stats
+        self.set_header('Content-Type', 'application/json; charset=UTF-8')
+
+    def get(self):
+        self.write(json.dumps(self.stats.as_dict()))
+
+    def delete(self):
+        self.stats.reset()
+        self.set_status(204)
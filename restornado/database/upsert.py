@@ -0,0 +1,125 @@
+# coding: utf-8
+"""
+Single-statement inserts or updates by primary key.
+
+`upsert` writes rows with ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite and
+PostgreSQL, and ``INSERT ... ON DUPLICATE KEY UPDATE`` on MySQL, instead of
+selecting each row and then inserting or updating it. Other dialects, and
+SQLAlchemy versions without these constructs, fall back on `Session.merge`.
+"""
+from sqlalchemy.util import string_types
+
+#: Most bound parameters in a single statement (SQLite's historical limit)
+MAX_PARAMETERS = 999
+
+
+def primary_key_attributes(model):
+    """
+    Return the attributes of the primary key columns of `model`.
+    """
+    mapper = model.__mapper__
+    return [mapper.get_property_by_column(column).key
+            for column in mapper.primary_key]
+
+
+def upsert_columns(schema, keys=()):
+    """
+    Return a ``{attribute: column}`` dict of the columns of the model of
+    `schema`, a `ModelSchema`, which its load fields write to. The columns of
+    the attributes `keys`, such as the primary key rows are upserted by, are
+    included even if their fields are ``dump_only`` or not in the schema.
+    """
+    model = schema.opts.model
+    mapper = model.__mapper__
+    table = mapper.local_table
+    attributes = [field.attribute or name
+                  for name, field in schema.fields.items()
+                  if not field.dump_only]
+    columns = {}
+    for attribute in attributes + list(keys):
+        if not mapper.has_property(attribute):
+            continue
+        prop = mapper.get_property(attribute)
+        prop_columns = getattr(prop, 'columns', ())
+        if len(prop_columns) == 1 and prop_columns[0].table is table:
+            columns[attribute] = prop_columns[0]
+    return columns
+
+
+def coerce_value(column, value):
+    if isinstance(value, string_types):
+        try:
+            if column.type.python_type is int:
+                return int(value)
+        except (NotImplementedError, ValueError):
+            pass
+    return value
+
+
+def _insert_for(dialect_name):
+    try:
+        if dialect_name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect_name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect_name == 'mysql':
+            from sqlalchemy.dialects.mysql import insert
+        else:
+            return None
+    except ImportError:
+        return None
+    return insert
+
+
+def upsert_statement(insert, table, rows, update_keys, primary_keys):
+    """
+    Return the upsert statement writing `rows`, dicts with the same column
+    keys, into `table`; conflicting rows get the columns `update_keys`.
+    """
+    statement = insert(table).values(rows)
+    if hasattr(statement, 'on_duplicate_key_update'):  # MySQL
+        keys = update_keys or primary_keys[:1]
+        return statement.on_duplicate_key_update(
+            dict((key, statement.inserted[key]) for key in keys))
+    if not update_keys:
+        return statement.on_conflict_do_nothing(index_elements=primary_keys)
+    return statement.on_conflict_do_update(
+        index_elements=primary_keys,
+        set_=dict((key, statement.excluded[key]) for key in update_keys),
+    )
+
+
+def upsert(session, model, rows, columns):
+    """
+    Insert `rows`, dicts of attribute values, into the table of `model`,
+    updating the rows whose primary key already exists. Only the attributes
+    in `columns`, as returned by `upsert_columns`, are written; they should
+    include the primary key, see `primary_key_attributes`.
+
+    Rows are grouped by the attributes they set, and each group is written
+    with as few statements as `MAX_PARAMETERS` allows.
+    """
+    mapper = model.__mapper__
+    table = mapper.local_table
+    primary_keys = [column.key for column in mapper.primary_key]
+    insert = _insert_for(session.get_bind(mapper).dialect.name)
+    groups = {}
+    for row in rows:
+        values = dict(
+            (column.key, coerce_value(column, row[attribute]))
+            for attribute, column in columns.items()
+            if attribute in row
+        )
+        groups.setdefault(tuple(sorted(values)), []).append(values)
+    for keys, group in groups.items():
+        if insert is None:
+            by_key = dict((column.key, attribute) for attribute, column in columns.items())
+            for values in group:
+                session.merge(model(**dict(
+                    (by_key[key], value) for key, value in values.items())))
+            continue
+        update_keys = [key for key in keys if key not in primary_keys]
+        size = max(1, MAX_PARAMETERS // max(len(keys), 1))
+        for start in range(0, len(group), size):
+            session.execute(upsert_statement(
+                insert, table, group[start:start + size], update_keys, primary_keys))
@@ -3,10 +3,12 @@
 Generic views that provide commonly needed behaviour.
 """
 from __future__ import unicode_literals
+import cProfile
 import json
 from tornado.web import RequestHandler
 from tornado import gen
 from tornado.escape import url_unescape
+from sqlalchemy import bindparam
 from restornado.mixin import (
     CreateModelMixin, ListModelMixin,
     RetrieveModelMixin, UpdateModelMixin,
@@ -14,7 +16,10 @@ from restornado.mixin import (
 )
 from modules.account.models import User, Permission, Role
 from restornado.validate import ValidateMixin
+from restornado.database.session import READ, WRITE, session_manager
+from restornado.database import statements
 from restornado.renderers import JSONRenderer
+from restornado import profiling, timing
 
 
 class BaseRequestHandler(RequestHandler):
@@ -56,6 +61,17 @@ class BaseRequestHandler(RequestHandler):
             [(k, v[0]) for k, v in self.request.arguments.items()])
 
 
+def _permission_query(perm_code):
+    # A missing perm_code is compared with IS NULL, as filter_by() does
+    def build(session):
+        query = session.query(Role).filter(
+            Role.users.any(id=bindparam('user_id')),
+            Role.permissions.any(
+                perm_code=None if perm_code is None else bindparam('perm_code')))
+        return session.query(query.exists())
+    return build
+
+
 class GenericAPIView(BaseRequestHandler, ValidateMixin):
 
     """
@@ -68,6 +84,81 @@ class GenericAPIView(BaseRequestHandler, ValidateMixin):
     pagination = False
     permission_class = Permission
     model = None
+    #: `timing.PhaseTimer` of the request if the ``phase_timing`` setting is on
+    _phase_timer = None
+    #: `get_queryset` returns the same query for every request, so
+    #: `get_object` reuses the statement built for the first request instead
+    #: of building it again; the list count is reused for the queries whose
+    #: filters have the same shape, see `statements.filter_shape`
+    cache_statements = False
+    #: HTTP methods which only read, and get `READ` sessions
+    read_methods = ('GET', 'HEAD', 'OPTIONS')
+    #: `cProfile.Profile` of the request if it asked for ``cprofile`` mode
+    _profile = None
+
+    def prepare(self):
+        if self.settings.get('phase_timing'):
+            self._phase_timer = timing.PhaseTimer()
+        mode = profiling.requested_mode(self)
+        if mode == 'cprofile':
+            self._profile = cProfile.Profile()
+        elif mode == 'sample':
+            sampler = (profiling.start_sampling(self.application) or
+                       profiling.current_sampler())
+            if sampler is not None:
+                self.set_header(profiling.OUTPUT_HEADER, sampler.path)
+
+    def phase(self, name):
+        """
+        Return a context manager timing its block as the phase `name` of
+        the request. Does nothing unless the `phase_timing` setting is on.
+        """
+        timer = self._phase_timer
+        if timer is None:
+            return timing.NULL_PHASE
+        return timer.phase(name)
+
+    def session_manager(self):
+        """
+        Return the `session_manager` of the request: in `READ` mode for the
+        `read_methods`, starting the transaction read-only if the
+        `read_only_transactions` setting is on, and in `WRITE` mode for the
+        other methods.
+        """
+        if self.request.method in self.read_methods:
+            return session_manager(
+                READ, self.settings.get('read_only_transactions', False))
+        return session_manager(WRITE)
+
+    @property
+    def executor(self):
+        executor = self.application.executor
+        if self._profile is not None:
+            executor = profiling.ProfilingExecutor(executor, self._profile)
+        if self._phase_timer is not None:
+            executor = timing.QueueTimingExecutor(executor, self._phase_timer)
+        return executor
+
+    def validate(self, schema, arguments):
+        with self.phase('validate'):
+            return super(GenericAPIView, self).validate(schema, arguments)
+
+    def render_json(self, data):
+        with self.phase('render'):
+            return JSONRenderer().render(data)
+
+    def finish(self, chunk=None):
+        timer = self._phase_timer
+        if timer is not None and not self._finished:
+            timer.stop()
+            self.set_header('Server-Timing', timer.header())
+            timing.stats.record(self.__class__.__name__, timer)
+        if self._profile is not None and not self._finished:
+            path = profiling.output_path(
+                self.settings, self.__class__.__name__, '.prof')
+            self._profile.dump_stats(path)
+            self.set_header(profiling.OUTPUT_HEADER, path)
+        return super(GenericAPIView, self).finish(chunk)
 
     def get_queryset(self, session):
         assert self.queryset is not None, (
@@ -87,6 +178,14 @@ class GenericAPIView(BaseRequestHandler, ValidateMixin):
         queryset lookups.  Eg if objects are referenced using multiple
         keyword arguments in the url conf.
         """
+        if self.cache_statements:
+            keys = tuple(sorted(kwargs))
+            return statements.cache.query(
+                session, self.__class__, 'get_object',
+                lambda session: self.get_queryset(session).filter_by(
+                    **dict((key, bindparam(key)) for key in keys)),
+                *keys
+            ).params(**kwargs).first()
         queryset = self.get_queryset(session)
         obj = queryset.filter_by(**kwargs).first()
         return obj
@@ -149,10 +248,20 @@ class GenericAPIView(BaseRequestHandler, ValidateMixin):
         if not (userId and token):
             return False
         perm_code = self.permissions.get('get', None)
-        query = session.query(Role).filter(
-            Role.users.any(id=userId),
-            Role.permissions.any(perm_code=perm_code))
-        return session.query(query.exists()).scalar()
+        return self.has_permission(session, userId, perm_code)
+
+    def has_permission(self, session, user_id, perm_code):
+        """
+        Tell whether one of the roles of the user `user_id` has the
+        permission `perm_code`.
+        """
+        params = {'user_id': user_id}
+        if perm_code is not None:
+            params['perm_code'] = perm_code
+        return statements.cache.query(
+            session, self.__class__, 'permission',
+            _permission_query(perm_code), perm_code is None
+        ).params(**params).scalar()
 
     def post_permission(self, session):
         token = self.request.headers.get('Authorization')
@@ -160,10 +269,7 @@ class GenericAPIView(BaseRequestHandler, ValidateMixin):
         if not (userId and token):
             return False
         perm_code = self.permissions.get('post', None)
-        query = session.query(Role).filter(
-            Role.users.any(id=userId),
-            Role.permissions.any(perm_code=perm_code))
-        return session.query(query.exists()).scalar()
+        return self.has_permission(session, userId, perm_code)
 
     def put_permission(self, session):
         token = self.request.headers.get('Authorization')
@@ -171,10 +277,7 @@ class GenericAPIView(BaseRequestHandler, ValidateMixin):
         if not (userId and token):
             return False
         perm_code = self.permissions.get('put', None)
-        query = session.query(Role).filter(
-            Role.users.any(id=userId),
-            Role.permissions.any(perm_code=perm_code))
-        return session.query(query.exists()).scalar()
+        return self.has_permission(session, userId, perm_code)
 
     def delete_permission(self, session):
         token = self.request.headers.get('Authorization')
@@ -182,10 +285,7 @@ class GenericAPIView(BaseRequestHandler, ValidateMixin):
         if not (userId and token):
             return False
         perm_code = self.permissions.get('delete', None)
-        query = session.query(Role).filter(
-            Role.users.any(id=userId),
-            Role.permissions.any(perm_code=perm_code))
-        return session.query(query.exists()).scalar()
+        return self.has_permission(session, userId, perm_code)
 
 
 class CreateAPIView(CreateModelMixin, GenericAPIView):
@@ -202,11 +302,11 @@ class CreateAPIView(CreateModelMixin, GenericAPIView):
                 output = {'code': 0, 'msg': u'成功'}
                 result = yield self.task(data)
                 if result:
-                    self.write(JSONRenderer().render(output))
+                    self.write(self.render_json(output))
             else:
-                self.write(JSONRenderer().render(data))
+                self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
     @gen.coroutine
@@ -225,9 +325,9 @@ class ListAPIView(ListModelMixin, GenericAPIView):
         validation = self.get_validate()
         if isinstance(validation, dict):
             data = yield self.list(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
 
@@ -241,9 +341,9 @@ class RetrieveAPIView(RetrieveModelMixin, GenericAPIView):
         validation = self.get_validate()
         if isinstance(validation, dict):
             data = yield self.retrieve(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
 
@@ -258,9 +358,9 @@ class DestroyAPIView(DestroyModelMixin, GenericAPIView):
         validation = self.delete_validate()
         if isinstance(validation, dict):
             data = yield self.destroy(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
 
@@ -274,9 +374,19 @@ class UpdateAPIView(UpdateModelMixin, GenericAPIView):
         validation = self.put_validate()
         if isinstance(validation, dict):
             data = yield self.update(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
+        self.finish()
+
+    @gen.coroutine
+    def patch(self, *args, **kwargs):
+        validation = self.patch_validate()
+        if isinstance(validation, dict):
+            data = yield self.partial_update(validation, *args, **kwargs)
+            self.write(self.render_json(data))
+        else:
+            self.write(self.render_json(validation))
         self.finish()
 
 
@@ -290,9 +400,9 @@ class ListCreateAPIView(ListModelMixin, CreateModelMixin, GenericAPIView):
         validation = self.get_validate()
         if isinstance(validation, dict):
             data = yield self.list(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
     @gen.coroutine
@@ -304,11 +414,11 @@ class ListCreateAPIView(ListModelMixin, CreateModelMixin, GenericAPIView):
                 output = {'code': 0, 'msg': u'成功'}
                 result = yield self.task(data)
                 if result:
-                    self.write(JSONRenderer().render(output))
+                    self.write(self.render_json(output))
             else:
-                self.write(JSONRenderer().render(data))
+                self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
     @gen.coroutine
@@ -322,9 +432,9 @@ class ListCreateDeleteAPIView(ListCreateAPIView, DestroyManyModelMixin):
         validation = self.delete_validate()
         if isinstance(validation, dict):
             data = yield self.destroy(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
 
@@ -340,9 +450,9 @@ class RetrieveUpdateAPIView(RetrieveModelMixin,
         validation = self.get_validate()
         if isinstance(validation, dict):
             data = yield self.retrieve(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
     @gen.coroutine
@@ -351,11 +461,24 @@ class RetrieveUpdateAPIView(RetrieveModelMixin,
         if isinstance(validation, dict):
             data = yield self.update(validation, *args, **kwargs)
             if data.get('code', 0) == 0:
-                self.write(JSONRenderer().render({'code': 0, 'msg': u'成功'}))
+                self.write(self.render_json({'code': 0, 'msg': u'成功'}))
             else:
-                self.write(JSONRenderer().render(data))
+                self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
+        self.finish()
+
+    @gen.coroutine
+    def patch(self, *args, **kwargs):
+        validation = self.patch_validate()
+        if isinstance(validation, dict):
+            data = yield self.partial_update(validation, *args, **kwargs)
+            if data.get('code', 0) == 0:
+                self.write(self.render_json({'code': 0, 'msg': u'成功'}))
+            else:
+                self.write(self.render_json(data))
+        else:
+            self.write(self.render_json(validation))
         self.finish()
 
 
@@ -371,9 +494,9 @@ class RetrieveDestroyAPIView(RetrieveModelMixin,
         validation = self.get_validate()
         if isinstance(validation, dict):
             data = yield self.retrieve(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
     @gen.coroutine
@@ -381,9 +504,9 @@ class RetrieveDestroyAPIView(RetrieveModelMixin,
         validation = self.delete_validate()
         if isinstance(validation, dict):
             data = yield self.destroy(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
 
@@ -399,9 +522,9 @@ class RetrieveUpdateDestroyAPIView(RetrieveModelMixin,
         validation = self.get_validate()
         if isinstance(validation, dict):
             data = yield self.retrieve(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
     @gen.coroutine
@@ -409,12 +532,19 @@ class RetrieveUpdateDestroyAPIView(RetrieveModelMixin,
         validation = self.put_validate()
         if isinstance(validation, dict):
             data = yield self.update(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
 
+    @gen.coroutine
     def patch(self, *args, **kwargs):
+        validation = self.patch_validate()
+        if isinstance(validation, dict):
+            data = yield self.partial_update(validation, *args, **kwargs)
+            self.write(self.render_json(data))
+        else:
+            self.write(self.render_json(validation))
         self.finish()
 
     @gen.coroutine
@@ -422,7 +552,7 @@ class RetrieveUpdateDestroyAPIView(RetrieveModelMixin,
         validation = self.delete_validate()
         if isinstance(validation, dict):
             data = yield self.destroy(validation, *args, **kwargs)
-            self.write(JSONRenderer().render(data))
+            self.write(self.render_json(data))
         else:
-            self.write(JSONRenderer().render(validation))
+            self.write(self.render_json(validation))
         self.finish()
@@ -1,25 +1,64 @@
 # coding: utf-8
 
 from tornado.concurrent import run_on_executor
-from restornado.database.session import session_manager
+from restornado.database.direct import (
+    delete_by, exists_by, parse_version, update_by, version_attribute
+)
+from restornado.database import statements
+from restornado.database.upsert import (
+    primary_key_attributes, upsert, upsert_columns
+)
+from restornado.validate import partial_schema
+from marshmallow_sqlalchemy.rows import RowDumper, row_columns
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.sql import func
 
 
+def count_statement(queryset):
+    """
+    Return the statement counting the rows of `queryset`.
+    """
+    statement = queryset.with_labels().order_by(None).statement
+    if hasattr(statement, 'get_final_froms'):
+        # SQLAlchemy 1.4+ derives the FROM clause from the new columns only,
+        # unless told to keep the FROM objects of the replaced ones
+        return statement.with_only_columns(
+            func.count(), maintain_column_froms=True)
+    return statement.with_only_columns([func.count()])
+
+
 class CreateModelMixin(object):
     """
     Create a model instance.
     """
+    #: Write with a single INSERT ... ON CONFLICT DO UPDATE (ON DUPLICATE KEY
+    #: UPDATE on MySQL) instead of building an instance; the body may then
+    #: also hold a batch of records as {'list': [...]}
+    upsert = False
 
     @run_on_executor
     def create(self, *args, **kwargs):
-        with session_manager() as session:
-            if self.post_permission(session):
+        with self.session_manager() as session:
+            with self.phase('permission'):
+                allowed = self.post_permission(session)
+            if allowed:
+                body = self.body
+                batch = self.upsert and isinstance(body.get('list'), list)
                 if self.schema:
                     try:
-                        data = self.schema(self.body)
+                        with self.phase('validate'):
+                            if batch:
+                                data = [self.schema(each) for each in body['list']]
+                            else:
+                                data = self.schema(body)
                     except:
                         return {'code': 1, 'msg': u'失败'}
-                obj = self.perform_create(session, data)
+                if self.upsert:
+                    with self.phase('save'):
+                        self.perform_upsert(session, data if batch else [data])
+                    return {'code': 0, 'msg': u'成功'}
+                with self.phase('save'):
+                    obj = self.perform_create(session, data)
                 if isinstance(obj, self.model):
                     return {
                         'code': 0,
@@ -37,40 +76,81 @@ class CreateModelMixin(object):
         session.commit()
         return obj
 
+    def perform_upsert(self, session, rows):
+        schema = self.get_schema(session)
+        upsert(session, self.model, rows, upsert_columns(
+            schema, primary_key_attributes(self.model)))
+        session.commit()
+        return schema
+
 
 class ListModelMixin(object):
     """
     List a queryset.
     """
+    #: Select only the columns the schema serializes, with SQLAlchemy Core,
+    #: and serialize the rows instead of ORM instances. Views whose schema
+    #: serializes relationships or uses dump processors list instances.
+    core_read = False
 
     @run_on_executor
     def list(self, *args, **kwargs):
-        with session_manager() as session:
-            if self.get_permission(session):
+        with self.session_manager() as session:
+            with self.phase('permission'):
+                allowed = self.get_permission(session)
+            if allowed:
                 queryset = self.get_queryset(session)
-                total = self.get_queryset_total(session, queryset)
+                with self.phase('count'):
+                    total = self.get_queryset_total(session, queryset)
                 schema = self.get_schema(session, many=True)
                 if self.pagination:
                     page = self.paginate_queryset(queryset)
                     if page:
                         schema = self.get_schema(session, many=True)
-                        return {
-                            'code': 0,
-                            'total': total,
-                            'data': schema.dump(page).data
-                        }
+                        queryset = page
+                dumper = self.get_row_dumper(schema, queryset)
+                with self.phase('fetch'):
+                    if dumper is not None:
+                        objs = session.execute(
+                            queryset.with_entities(*dumper.columns).statement
+                        ).fetchall()
+                    else:
+                        objs = list(queryset)
+                with self.phase('dump'):
+                    if dumper is not None:
+                        data = dumper.dump(objs)
+                    else:
+                        data = schema.dump(objs).data
                 return {
                     'code': 0,
                     'total': total,
-                    'data': schema.dump(queryset).data
+                    'data': data
                 }
             else:
                 return {'code': 1, 'msg': u'无此权限'}
 
+    def get_row_dumper(self, schema, queryset):
+        """
+        Return the `RowDumper` serializing the rows of `queryset` with
+        `schema`, or `None` to list ORM instances.
+        """
+        if not self.core_read or not hasattr(queryset, 'with_entities'):
+            return None
+        columns = row_columns(schema)
+        if columns is None:
+            return None
+        return RowDumper(schema, columns)
+
     def get_queryset_total(self, session, queryset):
-        count = queryset.with_labels(
-            ).statement.with_only_columns([func.count()])
-        return session.execute(count).scalar()
+        shape = None
+        if self.cache_statements:
+            shape = statements.filter_shape(queryset)
+        if shape is None:
+            return session.execute(count_statement(queryset)).scalar()
+        count = statements.cache.statement(
+            self.__class__, 'count', lambda: count_statement(queryset), shape)
+        # The parameters of the filters, as given to .params()
+        return session.execute(count, dict(queryset._params)).scalar()
 
 
 class RetrieveModelMixin(object):
@@ -80,11 +160,16 @@ class RetrieveModelMixin(object):
 
     @run_on_executor
     def retrieve(self, *args, **kwargs):
-        with session_manager() as session:
-            if self.get_permission(session):
-                instance = self.get_object(session, *args, **kwargs)
+        with self.session_manager() as session:
+            with self.phase('permission'):
+                allowed = self.get_permission(session)
+            if allowed:
+                with self.phase('fetch'):
+                    instance = self.get_object(session, *args, **kwargs)
                 schema = self.get_schema(session)
-                return {'code': 0, 'data': schema.dump(instance).data}
+                with self.phase('dump'):
+                    data = schema.dump(instance).data
+                return {'code': 0, 'data': data}
             else:
                 return {'code': 1, 'msg': u'无此权限'}
 
@@ -93,19 +178,58 @@ class UpdateModelMixin(object):
     """
     Update a model instance.
     """
+    #: Write with a single INSERT ... ON CONFLICT DO UPDATE (ON DUPLICATE KEY
+    #: UPDATE on MySQL) keyed by the URL lookup, instead of fetching and
+    #: updating the instance; the response then holds the written values
+    upsert = False
+    #: Write with a single UPDATE ... WHERE on the URL lookup instead of
+    #: fetching and updating the instance; the response holds the row read
+    #: back with RETURNING where supported, else the written values
+    direct = False
+    #: Attribute of the version column which the If-Match header of PATCH
+    #: and direct PUT requests is checked against; defaults to the
+    #: version_id_col of the mapper of the model
+    version_column = None
 
     @run_on_executor
     def update(self, *args, **kwargs):
-        with session_manager() as session:
-            if self.put_permission(session):
+        with self.session_manager() as session:
+            with self.phase('permission'):
+                allowed = self.put_permission(session)
+            if allowed:
                 if self.schema:
                     try:
-                        data = self.schema(self.body)
+                        with self.phase('validate'):
+                            data = self.schema(self.body)
                     except:
                         return {'code': 1, 'msg': u'失败'}
-                instance = self.perform_update(
-                    session, self.get_object(session, *args, **kwargs), data)
-                return {'code': 0, 'data': self.schema.dump(instance).data}
+                if self.upsert:
+                    row = dict(data, **kwargs)
+                    with self.phase('save'):
+                        schema = self.perform_upsert(session, [row], kwargs)
+                    with self.phase('dump'):
+                        data = schema.dump(row).data
+                    return {'code': 0, 'data': data}
+                if self.direct:
+                    try:
+                        version = self.get_version()
+                    except ValueError:
+                        return {'code': 1, 'msg': u'版本冲突'}
+                    with self.phase('save'):
+                        schema, row = self.perform_direct_update(
+                            session, kwargs, data, version)
+                    if row is None:
+                        return self.get_missing_response(session, kwargs, version)
+                    with self.phase('dump'):
+                        data = schema.dump(row).data
+                    return {'code': 0, 'data': data}
+                with self.phase('fetch'):
+                    instance = self.get_object(session, *args, **kwargs)
+                with self.phase('save'):
+                    instance = self.perform_update(session, instance, data)
+                with self.phase('dump'):
+                    data = self.schema.dump(instance).data
+                return {'code': 0, 'data': data}
             else:
                 return {'code': 1, 'msg': u'无此权限'}
 
@@ -115,6 +239,120 @@ class UpdateModelMixin(object):
         session.commit()
         return obj
 
+    def perform_upsert(self, session, rows, lookup):
+        """
+        Upsert `rows`, which hold the URL lookup `lookup`. Rows conflict on
+        their primary key only, so the lookup must be the primary key.
+        """
+        keys = primary_key_attributes(self.model)
+        assert sorted(lookup) == sorted(keys), (
+            "'%s' can only upsert rows looked up by their primary key %s, "
+            "not by %s" % (self.__class__.__name__, keys, sorted(lookup))
+        )
+        schema = self.get_schema(session)
+        upsert(session, self.model, rows, upsert_columns(schema, keys))
+        session.commit()
+        return schema
+
+    def perform_direct_update(self, session, lookup, data, version=None):
+        schema = self.get_schema(session)
+        row = update_by(session, self.model, lookup, data,
+                        upsert_columns(schema), version=version)
+        session.commit()
+        return schema, row
+
+    @run_on_executor
+    def partial_update(self, *args, **kwargs):
+        with self.session_manager() as session:
+            with self.phase('permission'):
+                allowed = self.put_permission(session)
+            if allowed:
+                data = self.body
+                if self.schema:
+                    try:
+                        with self.phase('validate'):
+                            data = partial_schema(self.schema)(data)
+                    except:
+                        return {'code': 1, 'msg': u'失败'}
+                try:
+                    version = self.get_version()
+                except ValueError:
+                    return {'code': 1, 'msg': u'版本冲突'}
+                with self.phase('save'):
+                    schema, obj = self.perform_partial_update(
+                        session, kwargs, data, version)
+                if obj is None:
+                    return self.get_missing_response(session, kwargs, version)
+                with self.phase('dump'):
+                    data = schema.dump(obj).data
+                return {'code': 0, 'data': data}
+            else:
+                return {'code': 1, 'msg': u'无此权限'}
+
+    def perform_partial_update(self, session, lookup, data, version=None):
+        """
+        Write the supplied fields `data` to the row matching `lookup`. Plain
+        columns are written with a single UPDATE; other fields, such as
+        relationships, need the instance to be fetched and updated. The
+        version is checked by the UPDATE of the columns, or by the ORM for
+        the version_id_col of the mapper.
+        Return the schema and the row (or instance), or `None` if no row
+        matches `lookup` and `version`.
+        """
+        schema = self.get_schema(session)
+        columns = upsert_columns(schema)
+        if all(key in columns for key in data):
+            row = update_by(session, self.model, lookup, data, columns,
+                            version=version)
+            session.commit()
+            return schema, row
+        if version is not None and version[0] != version_attribute(self.model):
+            # Check the version in the UPDATE writing the plain columns, so
+            # that no other write gets in between; the ORM only checks the
+            # version_id_col of the mapper
+            row = update_by(session, self.model, lookup, data, columns,
+                            returning=False, version=version)
+            if row is None:
+                session.rollback()
+                return schema, None
+            data = dict((key, value) for key, value in data.items()
+                        if key not in columns)
+            version = None
+        with self.phase('fetch'):
+            instance = self.get_object(session, **lookup)
+        if instance is None:
+            return schema, None
+        if version is not None and getattr(instance, version[0]) != version[1]:
+            return schema, None
+        try:
+            instance = self.perform_update(session, instance, data)
+        except StaleDataError:
+            # The version_id_col changed since the instance was read
+            session.rollback()
+            return schema, None
+        return self.schema, instance
+
+    def get_version(self):
+        """
+        Return the ``(attribute, value)`` pair the If-Match header of the
+        request pins the version column to, or `None`. Raise `ValueError` if
+        the entity tag is not a value of the version column.
+        """
+        value = self.request.headers.get('If-Match', '').strip()
+        attribute = self.version_column or version_attribute(self.model)
+        if not value or value == '*' or attribute is None:
+            return None
+        if value.startswith('W/'):
+            value = value[2:]
+        if len(value) > 1 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        return attribute, parse_version(self.model, attribute, value)
+
+    def get_missing_response(self, session, lookup, version):
+        if version is not None and exists_by(session, self.model, lookup):
+            return {'code': 1, 'msg': u'版本冲突'}
+        return {'code': 1, 'msg': u'不存在'}
+
 
 class DestroyManyModelMixin(object):
     """
@@ -123,9 +361,12 @@ class DestroyManyModelMixin(object):
 
     @run_on_executor
     def destroy(self, *args, **kwargs):
-        with session_manager() as session:
-            if self.delete_permission(session):
-                return self.remove(session, *args, **kwargs)
+        with self.session_manager() as session:
+            with self.phase('permission'):
+                allowed = self.delete_permission(session)
+            if allowed:
+                with self.phase('save'):
+                    return self.remove(session, *args, **kwargs)
             else:
                 return {'code': 1, 'msg': u'无此权限'}
 
@@ -141,17 +382,36 @@ class DestroyModelMixin(object):
     """
     Destroy a model instance.
     """
+    #: Delete with a single DELETE ... WHERE on the URL lookup instead of
+    #: fetching and deleting the instance; relationship cascades are then
+    #: left to the foreign keys of the database
+    direct = False
 
     @run_on_executor
     def destroy(self, *args, **kwargs):
-        with session_manager() as session:
-            if self.delete_permission(session):
-                instance = self.get_object(session)
-                self.perform_destroy(session, instance)
+        with self.session_manager() as session:
+            with self.phase('permission'):
+                allowed = self.delete_permission(session)
+            if allowed:
+                if self.direct:
+                    with self.phase('save'):
+                        deleted = self.perform_direct_destroy(session, kwargs)
+                    if not deleted:
+                        return {'code': 1, 'msg': u'不存在'}
+                    return {'code': 0, 'msg': u'成功'}
+                with self.phase('fetch'):
+                    instance = self.get_object(session, *args, **kwargs)
+                with self.phase('save'):
+                    self.perform_destroy(session, instance)
                 return {'code': 0, 'msg': u'成功'}
             else:
                 return {'code': 1, 'msg': u'无此权限'}
 
     def perform_destroy(self, session, instance):
-        instance.delete()
+        session.delete(instance)
+        session.commit()
+
+    def perform_direct_destroy(self, session, lookup):
+        deleted = delete_by(session, self.model, lookup)
         session.commit()
+        return deleted
@@ -0,0 +1,297 @@
+# coding: utf-8
+"""
+On-demand profiling of a live server.
+
+Profiling is off unless the application has a ``profile_secret`` setting::
+
+    app = tornado.web.Application([
+        (r'/users', UserListView),
+        (r'/_profile', ProfilerHandler),
+    ], profile_secret='...', profile_dir='/var/tmp/profiles')
+
+A request to a `GenericAPIView` carrying an ``X-Profile`` header signed with
+that secret (see `sign`) is then profiled according to the signed mode:
+
+- ``cprofile``: the tasks the request runs on the executor are profiled with
+  `cProfile`, and the stats written to a ``.prof`` file;
+- ``sample``: a `StackSampler` samples the stacks of the IOLoop thread and of
+  the executor threads for ``profile_seconds`` (10 by default), and writes
+  them as collapsed stacks, the input of ``flamegraph.pl`` and speedscope.
+
+Sampling windows last at most ``profile_max_seconds`` (`MAX_SECONDS` by
+default), and take at most one sample per `MIN_INTERVAL` seconds.
+
+The path of the output file is sent back in the ``X-Profile-Output`` header.
+`ProfilerHandler` starts and lists sampling windows; it requires the same
+signed header.
+"""
+from __future__ import division, unicode_literals
+
+import cProfile
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from tornado.web import HTTPError, RequestHandler
+from tornado.web import create_signed_value, decode_signed_value
+
+HEADER = 'X-Profile'
+OUTPUT_HEADER = 'X-Profile-Output'
+MODES = ('cprofile', 'sample')
+#: Seconds a signed ``X-Profile`` header stays valid
+MAX_AGE = 3600
+#: Longest sampling window, unless the ``profile_max_seconds`` setting is set
+MAX_SECONDS = 60
+#: Shortest interval between two samples
+MIN_INTERVAL = 0.001
+
+#: The running `StackSampler`, if any
+_sampler = None
+_sampler_lock = threading.Lock()
+#: Distinguishes the output files written within the same second
+_sequence = itertools.count(1)
+
+
+def sign(secret, mode):
+    """Return the value of the ``X-Profile`` header requesting ``mode``."""
+    assert mode in MODES, 'mode must be one of {0}'.format(MODES)
+    return create_signed_value(secret, HEADER, mode).decode('ascii')
+
+
+def requested_mode(handler):
+    """Return the profiling mode ``handler``'s request asks for, or `None` if
+    profiling is off or the header is missing or not validly signed.
+    """
+    secret = handler.settings.get('profile_secret')
+    value = handler.request.headers.get(HEADER)
+    if not secret or not value:
+        return None
+    mode = decode_signed_value(secret, HEADER, value,
+                               max_age_days=MAX_AGE / 86400.0)
+    if mode is None:
+        return None
+    mode = mode.decode('ascii')
+    return mode if mode in MODES else None
+
+
+def output_path(settings, kind, suffix):
+    """Return a new file path in the ``profile_dir`` directory."""
+    directory = settings.get('profile_dir') or tempfile.gettempdir()
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    name = '{0}-{1}-{2}-{3}{4}'.format(
+        kind, time.strftime('%Y%m%dT%H%M%S'), os.getpid(), next(_sequence), suffix)
+    return os.path.join(directory, name)
+
+
+##### Per-request cProfile #####
+
+class ProfilingExecutor(object):
+    """Executor proxy running the submitted tasks under ``profile``.
+
+    Tasks already running under another profiler (e.g. those of a
+    concurrently profiled request on Python 3.12+, where only one profiler
+    may be active at a time) run unprofiled.
+    """
+
+    def __init__(self, executor, profile=None):
+        self.executor = executor
+        self.profile = profile if profile is not None else cProfile.Profile()
+
+    def submit(self, fn, *args, **kwargs):
+        profile = self.profile
+
+        def run(*args, **kwargs):
+            try:
+                profile.enable()
+            except ValueError:
+                return fn(*args, **kwargs)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+        return self.executor.submit(run, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.executor, name)
+
+
+##### Stack sampling #####
+
+def _frame_label(frame):
+    code = frame.f_code
+    return '{0} ({1}:{2})'.format(code.co_name, code.co_filename, code.co_firstlineno)
+
+
+def collapse(frame):
+    """Return the stack of ``frame``, root first, as a collapsed stack line
+    (without its count).
+    """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ';'.join(labels)
+
+
+class StackSampler(threading.Thread):
+    """Daemon thread sampling, every ``interval`` seconds during ``seconds``
+    seconds, the stacks of the threads whose identifiers ``get_threads()``
+    returns as a ``{<ident>: <name>}`` dict.
+
+    Stacks are counted in `stacks`, keyed by their collapsed form prefixed
+    with the thread name, and written to `path` when sampling ends.
+    """
+
+    def __init__(self, get_threads, path, seconds=10, interval=0.005):
+        super(StackSampler, self).__init__(name='restornado-stack-sampler')
+        self.daemon = True
+        self.get_threads = get_threads
+        self.path = path
+        self.seconds = seconds
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+
+    def sample(self):
+        frames = sys._current_frames()
+        for ident, name in self.get_threads().items():
+            frame = frames.get(ident)
+            if frame is not None:
+                self.stacks['{0};{1}'.format(name, collapse(frame))] += 1
+        self.samples += 1
+
+    def run(self):
+        deadline = time.time() + self.seconds
+        try:
+            while time.time() < deadline and not self.stopped.is_set():
+                self.sample()
+                self.stopped.wait(self.interval)
+        finally:
+            self.write()
+
+    def stop(self):
+        self.stopped.set()
+
+    def write(self):
+        with open(self.path, 'w') as fp:
+            for stack, count in sorted(self.stacks.items()):
+                fp.write('{0} {1}\n'.format(stack, count))
+
+
+def application_threads(application, ioloop_ident):
+    """Return a ``get_threads`` function for `StackSampler` covering the
+    IOLoop thread and the threads of ``application.executor``.
+    """
+    def get_threads():
+        threads = {ioloop_ident: 'ioloop'}
+        # ThreadPoolExecutor starts its threads lazily, so look them up on
+        # every sample
+        for thread in list(getattr(application.executor, '_threads', ())):
+            threads[thread.ident] = thread.name
+        return threads
+    return get_threads
+
+
+def sampling_window(settings, seconds=None, interval=None):
+    """Return the ``(seconds, interval)`` of a sampling window, defaulting to
+    the ``profile_seconds`` and ``profile_interval`` settings. ``seconds`` is
+    capped to the ``profile_max_seconds`` setting, and ``interval`` kept
+    between `MIN_INTERVAL` and ``seconds``.
+
+    :raise ValueError: If ``seconds`` or ``interval`` is not positive.
+    """
+    if seconds is None:
+        seconds = settings.get('profile_seconds', 10)
+    if interval is None:
+        interval = settings.get('profile_interval', 0.005)
+    # Also rejects NaN
+    if not (seconds > 0 and interval > 0):
+        raise ValueError('seconds and interval must be positive')
+    seconds = min(seconds, settings.get('profile_max_seconds', MAX_SECONDS))
+    interval = min(max(interval, MIN_INTERVAL), seconds)
+    return seconds, interval
+
+
+def start_sampling(application, seconds=None, interval=None):
+    """Start sampling the threads of ``application`` from the IOLoop thread
+    and return the `StackSampler`, or `None` if one is already running.
+
+    :raise ValueError: If ``seconds`` or ``interval`` is not positive.
+    """
+    global _sampler
+    settings = application.settings
+    seconds, interval = sampling_window(settings, seconds, interval)
+    with _sampler_lock:
+        if _sampler is not None and _sampler.is_alive():
+            return None
+        _sampler = StackSampler(
+            application_threads(application, threading.current_thread().ident),
+            output_path(settings, 'stacks', '.folded'),
+            seconds=seconds,
+            interval=interval,
+        )
+        _sampler.start()
+        return _sampler
+
+
+def current_sampler():
+    """Return the running `StackSampler`, if any."""
+    sampler = _sampler
+    return sampler if sampler is not None and sampler.is_alive() else None
+
+
+class ProfilerHandler(RequestHandler):
+    """Start (``POST``, with optional ``seconds`` and ``interval`` arguments,
+    limited as `sampling_window` does) or stop (``DELETE``) a sampling
+    window, and list the profiles written so far (``GET``). Requests must
+    carry a signed ``X-Profile`` header.
+    """
+
+    def initialize(self):
+        self.set_header('Content-Type', 'application/json; charset=UTF-8')
+
+    def prepare(self):
+        if requested_mode(self) is None:
+            raise HTTPError(403)
+
+    def get(self):
+        directory = self.settings.get('profile_dir') or tempfile.gettempdir()
+        sampler = current_sampler()
+        profiles = sorted(
+            name for name in os.listdir(directory)
+            if name.endswith(('.folded', '.prof'))
+        ) if os.path.isdir(directory) else []
+        self.write(json.dumps({
+            'running': sampler.path if sampler is not None else None,
+            'directory': directory,
+            'profiles': profiles,
+        }))
+
+    def post(self):
+        seconds = self.get_argument('seconds', None)
+        interval = self.get_argument('interval', None)
+        try:
+            sampler = start_sampling(
+                self.application,
+                float(seconds) if seconds is not None else None,
+                float(interval) if interval is not None else None,
+            )
+        except ValueError:
+            raise HTTPError(400)
+        if sampler is None:
+            raise HTTPError(409, reason='A sampling window is already running')
+        self.write(json.dumps({'path': sampler.path, 'seconds': sampler.seconds}))
+
+    def delete(self):
+        sampler = current_sampler()
+        if sampler is not None:
+            sampler.stop()
+        self.set_status(204)
@@ -0,0 +1,206 @@
+# coding: utf-8
+"""
+Per-request phase timing for the generic views.
+
+Enable it with the ``phase_timing`` application setting::
+
+    app = tornado.web.Application([
+        (r'/users', UserListView),
+        (r'/_stats', PhaseStatsHandler),
+    ], phase_timing=True)
+
+Each response of a `GenericAPIView` then carries a ``Server-Timing`` header
+splitting its time between validation, the executor queue, permission
+checks, the count, the fetch, `schema.dump` and rendering, and the phases are
+aggregated per handler into in-memory histograms, which `PhaseStatsHandler`
+serves as JSON.
+"""
+from __future__ import division, unicode_literals
+
+import bisect
+import json
+import threading
+from collections import OrderedDict
+from timeit import default_timer
+
+from tornado.web import RequestHandler
+
+#: Upper bounds (in milliseconds) of the histogram buckets
+BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500,
+           5000, 10000, float('inf'))
+
+
+class _NullPhase(object):
+    """Context manager doing nothing, used when timing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase(object):
+
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = default_timer()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, default_timer() - self.start)
+        return False
+
+
+class PhaseTimer(object):
+    """Durations of the phases of a single request, in seconds. Phases
+    entered several times are added up.
+    """
+
+    def __init__(self):
+        self.start = default_timer()
+        self.phases = OrderedDict()
+
+    def phase(self, name):
+        """Return a context manager adding the time spent in its block to
+        the phase ``name``.
+        """
+        return _Phase(self, name)
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0) + seconds
+
+    def stop(self):
+        """Record the time elapsed since the timer was created as ``total``."""
+        self.phases['total'] = default_timer() - self.start
+
+    def header(self):
+        """Return the value of the ``Server-Timing`` header."""
+        return ', '.join(
+            '{0};dur={1:.3f}'.format(name, seconds * 1000)
+            for name, seconds in self.phases.items()
+        )
+
+
+class QueueTimingExecutor(object):
+    """Executor proxy adding the time tasks wait for a thread to the
+    ``queue`` phase of ``timer``.
+    """
+
+    def __init__(self, executor, timer):
+        self.executor = executor
+        self.timer = timer
+
+    def submit(self, fn, *args, **kwargs):
+        queued = default_timer()
+        timer = self.timer
+
+        def run(*args, **kwargs):
+            timer.add('queue', default_timer() - queued)
+            return fn(*args, **kwargs)
+        return self.executor.submit(run, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.executor, name)
+
+
+class Histogram(object):
+    """Distribution of durations, bucketed by `BUCKETS`."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.buckets[bisect.bisect_left(BUCKETS, ms)] += 1
+
+    def percentile(self, percent):
+        """Return the upper bound of the bucket holding the ``percent``
+        percentile, capped by the largest duration seen.
+        """
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self):
+        return OrderedDict([
+            ('count', self.count),
+            ('mean_ms', self.total / self.count if self.count else 0.0),
+            ('p50_ms', self.percentile(50)),
+            ('p95_ms', self.percentile(95)),
+            ('p99_ms', self.percentile(99)),
+            ('max_ms', self.max),
+            ('buckets', OrderedDict(
+                ('+Inf' if bound == float('inf') else str(bound), count)
+                for bound, count in zip(BUCKETS, self.buckets) if count
+            )),
+        ])
+
+
+class PhaseStats(object):
+    """Thread-safe per-handler, per-phase histograms."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def record(self, handler_name, timer):
+        with self.lock:
+            phases = self.histograms.setdefault(handler_name, {})
+            for name, seconds in timer.phases.items():
+                histogram = phases.get(name)
+                if histogram is None:
+                    histogram = phases[name] = Histogram()
+                histogram.add(seconds * 1000)
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def as_dict(self):
+        with self.lock:
+            return OrderedDict(
+                (handler_name, OrderedDict(
+                    (name, histogram.as_dict())
+                    for name, histogram in sorted(phases.items())
+                ))
+                for handler_name, phases in sorted(self.histograms.items())
+            )
+
+
+#: Histograms recorded by the generic views
+stats = PhaseStats()
+
+
+class PhaseStatsHandler(RequestHandler):
+    """Serve the phase histograms as JSON; ``DELETE`` resets them."""
+
+    def initialize(self, stats=stats):
+        self.stats = stats
+        self.set_header('Content-Type', 'application/json; charset=UTF-8')
+
+    def get(self):
+        self.write(json.dumps(self.stats.as_dict()))
+
+    def delete(self):
+        self.stats.reset()
+        self.set_status(204)
@@ -7,6 +7,7 @@ import datetime
 import decimal
 import json
 import uuid
+from marshmallow.utils import format_iso
 from restornado import six
 
 from tornado.util import timedelta_to_seconds as total_seconds
@@ -18,20 +19,8 @@ class JSONEncoder(json.JSONEncoder):
     decimal types, generators and other basic python objects.
     """
     def default(self, obj):
-        if isinstance(obj, datetime.datetime):
-            representation = obj.isoformat()
-            if obj.microsecond:
-                representation = representation[:23] + representation[26:]
-            if representation.endswith('+00:00'):
-                representation = representation[:-6] + 'Z'
-            return representation
-        elif isinstance(obj, datetime.date):
-            return obj.isoformat()
-        elif isinstance(obj, datetime.time):
-            representation = obj.isoformat()
-            if obj.microsecond:
-                representation = representation[:12]
-            return representation
+        if isinstance(obj, (datetime.date, datetime.time)):
+            return format_iso(obj, milliseconds=True, zulu=True)
         elif isinstance(obj, datetime.timedelta):
             return six.text_type(total_seconds(obj))
         elif isinstance(obj, decimal.Decimal):
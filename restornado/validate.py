@@ -1,6 +1,7 @@
 # coding: utf-8
+import weakref
 
-from restornado.voluptuous import MultipleInvalid
+from restornado.voluptuous import MultipleInvalid, Optional, Required, Schema
 
 
 class ValidateMixin(object):
@@ -23,6 +24,12 @@ class ValidateMixin(object):
             return self.validate(self.PostValidateSchema, arguments)
         return arguments
 
+    def patch_validate(self):
+        arguments = self.body
+        if getattr(self, 'PatchValidateSchema', None):
+            return self.validate(self.PatchValidateSchema, arguments)
+        return arguments
+
     def delete_validate(self):
         arguments = self.body
         if getattr(self, 'DeleteValidateSchema', None):
@@ -34,3 +41,25 @@ class ValidateMixin(object):
             return schema(arguments)
         except MultipleInvalid as e:
             return str(e)
+
+
+_partial_schemas = weakref.WeakKeyDictionary()
+
+
+def partial_schema(schema):
+    """
+    Return a copy of the dict-based voluptuous `schema` whose keys are all
+    optional and have no default, to validate the fields a PATCH supplies.
+    """
+    try:
+        return _partial_schemas[schema]
+    except KeyError:
+        pass
+    fields = {}
+    for key, value in schema.schema.items():
+        if type(key) in (Required, Optional):
+            key = Optional(key.schema, msg=key.msg)
+        fields[key] = value
+    partial = Schema(fields, required=False, extra=schema.extra)
+    _partial_schemas[schema] = partial
+    return partial
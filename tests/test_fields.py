@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import copy
+import pickle
+
+from marshmallow import Schema, fields, validate
+
+
+class TestFieldConfiguration:
+
+    def test_validators_can_be_appended(self):
+        field = fields.Str()
+        field.validators.append(validate.Length(max=2))
+        assert isinstance(field.validators, list)
+        assert fields.Str().validators == []
+
+        class MySchema(Schema):
+            name = field
+
+        assert MySchema().load({'name': 'abc'}).errors == {
+            'name': ['Longer than maximum length 2.']
+        }
+
+    def test_validators_appended_after_first_use(self):
+        field = fields.Str(validate=validate.Length(max=5))
+        field.deserialize('abc')
+        field.validators.append(validate.OneOf(['abcd']))
+        result = None
+        try:
+            field.deserialize('abc')
+        except Exception as err:
+            result = err.messages
+        assert result == ['Not a valid choice.']
+
+    def test_validator_chain_is_compiled_once(self):
+        field = fields.Str(validate=[validate.Length(max=5)])
+        field.deserialize('abc')
+        chain = field._validator_chain
+        field.deserialize('abcd')
+        assert field._validator_chain is chain
+        field.validators[0] = validate.Length(max=2)
+        try:
+            field.deserialize('abc')
+        except Exception as err:
+            result = err.messages
+        assert result == ['Longer than maximum length 2.']
+        field.validators = []
+        assert field.deserialize('abcdefg') == 'abcdefg'
+
+    def test_error_messages_can_be_modified(self):
+        field = fields.Str()
+        field.error_messages['invalid'] = 'Bad string.'
+        assert fields.Str().error_messages['invalid'] == 'Not a valid string.'
+
+        class MySchema(Schema):
+            name = field
+
+        assert MySchema().load({'name': 1}).errors == {'name': ['Bad string.']}
+
+    def test_arbitrary_attributes(self):
+        field = fields.Int()
+        field.foo = 1
+        assert copy.copy(field).foo == 1
+        assert copy.deepcopy(field).foo == 1
+
+    def test_pickle(self):
+        field = fields.Str(error_messages={'invalid': 'Bad string.'},
+                           validate=validate.Length(max=2))
+        field.foo = 1
+        loaded = pickle.loads(pickle.dumps(field))
+        assert loaded.error_messages['invalid'] == 'Bad string.'
+        assert loaded.foo == 1
+        assert loaded.deserialize('ab') == 'ab'
+
+    def test_pickle_with_default_messages(self):
+        loaded = pickle.loads(pickle.dumps(fields.Int()))
+        assert loaded.error_messages['invalid'] == 'Not a valid integer.'
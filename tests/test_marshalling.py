@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+from marshmallow import Schema, fields, ValidationError
+
+
+class TestSerializeFailingField:
+
+    def test_values_before_the_failing_field_are_kept(self):
+        class MySchema(Schema):
+            tags = fields.List(fields.Str())
+            count = fields.Int()
+
+            class Meta:
+                ordered = True
+
+        result = MySchema().dump({'tags': (tag for tag in 'xy'), 'count': 'a'})
+        assert result.data == OrderedDict([('tags', ['x', 'y'])])
+        assert result.errors == {'count': ['Not a valid integer.']}
+
+    def test_fields_are_serialized_once(self):
+        calls = []
+
+        class MySchema(Schema):
+            name = fields.Method('get_name')
+            count = fields.Int()
+            size = fields.Int(default=lambda: calls.append('size') or 1)
+
+            class Meta:
+                ordered = True
+
+            def get_name(self, obj):
+                calls.append('name')
+                return 'name'
+
+        result = MySchema(many=True).dump([{'count': 'a'}, {'count': 1}])
+        assert result.data == [
+            OrderedDict([('name', 'name'), ('size', 1)]),
+            OrderedDict([('name', 'name'), ('count', 1), ('size', 1)]),
+        ]
+        assert result.errors == {0: {'count': ['Not a valid integer.']}}
+        assert calls == ['name', 'size', 'name', 'size']
+
+
+class TestDeserializeFailingField:
+
+    def test_fields_are_deserialized_once(self):
+        calls = []
+
+        class Counted(fields.Str):
+            def _deserialize(self, value, attr, data):
+                calls.append(value)
+                return value
+
+        class MySchema(Schema):
+            name = Counted()
+            count = fields.Int()
+            code = Counted(load_from='Code')
+
+            class Meta:
+                ordered = True
+
+        result = MySchema().load({'name': 'a', 'count': 'b', 'Code': 'c'})
+        assert result.data == OrderedDict([('name', 'a'), ('code', 'c')])
+        assert result.errors == {'count': ['Not a valid integer.']}
+        assert calls == ['a', 'c']
+
+    def test_error_is_stored_under_load_from(self):
+        class MySchema(Schema):
+            count = fields.Int(load_from='Count')
+
+        result = MySchema().load({'Count': 'b'})
+        assert result.errors == {'Count': ['Not a valid integer.']}
+
+
+class TestSerializeFailingColumn:
+
+    def test_values_are_serialized_once(self):
+        calls = []
+
+        class MySchema(Schema):
+            name = fields.Method('get_name')
+            count = fields.Int(as_string=True)
+
+            class Meta:
+                columnar = True
+
+            def get_name(self, obj):
+                calls.append(obj['count'])
+                if obj['count'] == 3:
+                    raise ValidationError('Bad name.')
+                return 'name'
+
+        result = MySchema(many=True).dump(
+            [{'count': 1}, {'count': 'a'}, {'count': 3}, {'count': 2}])
+        assert result.data == [
+            {'name': 'name', 'count': '1'},
+            {'name': 'name'},
+            {'count': '3'},
+            {'name': 'name', 'count': '2'},
+        ]
+        assert result.errors == {
+            1: {'count': ['Not a valid integer.']},
+            2: {'name': ['Bad name.']},
+        }
+        assert calls == [1, 'a', 3, 2]
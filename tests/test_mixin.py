@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+import sqlalchemy as sa
+import tornado.web
+from sqlalchemy.ext.declarative import declarative_base
+from tornado.httpclient import AsyncHTTPClient, HTTPError
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+from tornado.testing import bind_unused_port
+
+from benchmarks import views
+
+models = views.install_models()
+
+from marshmallow_sqlalchemy import ModelSchema  # noqa: E402
+from restornado import generic  # noqa: E402
+from restornado import voluptuous as vol  # noqa: E402
+from restornado.database import get_session, initialize_sessionmaker  # noqa: E402
+from restornado.database import statements  # noqa: E402
+from restornado.database.session import session_manager  # noqa: E402
+from restornado.mixin import count_statement  # noqa: E402
+
+Base = declarative_base()
+
+
+class Document(Base):
+    __tablename__ = 'document'
+    id = sa.Column(sa.Integer, primary_key=True)
+    title = sa.Column(sa.String(32), nullable=False)
+    version = sa.Column(sa.Integer, nullable=False, default=1)
+
+    @property
+    def label(self):
+        return self.title
+
+    @label.setter
+    def label(self, value):
+        self.title = value
+
+
+class DocumentSchema(ModelSchema):
+
+    def __init__(self, *args, **kwargs):
+        kwargs.pop('redis', None)
+        kwargs.pop('view', None)
+        super(DocumentSchema, self).__init__(*args, **kwargs)
+
+    class Meta:
+        model = Document
+
+
+class DocumentView(generic.RetrieveUpdateDestroyAPIView):
+    model = Document
+    schema_class = DocumentSchema
+    schema = vol.Schema({vol.Required('title'): vol.Coerce(str)})
+    permissions = views.PERMISSIONS
+    version_column = 'version'
+
+    def get_queryset(self, session):
+        return session.query(Document)
+
+
+class DirectDocumentView(DocumentView):
+    direct = True
+
+
+class RacedDocumentView(DocumentView):
+    schema = vol.Schema({
+        vol.Required('title'): vol.Coerce(str),
+        vol.Optional('label'): vol.Coerce(str),
+    })
+
+    def perform_update(self, session, instance, data):
+        # A writer which read the same version writes in between
+        table = Document.__table__
+        self.application.raced.append(session.execute(
+            table.update().where((table.c.id == 1) & (table.c.version == 1))
+            .values(title='raced', version=2)).rowcount)
+        return super(RacedDocumentView, self).perform_update(
+            session, instance, data)
+
+
+class TitleDocumentListView(generic.ListAPIView):
+    model = Document
+    schema_class = DocumentSchema
+    permissions = views.PERMISSIONS
+    cache_statements = True
+
+    def get_queryset(self, session):
+        return session.query(Document).filter(
+            Document.title == self.get_argument('title'))
+
+
+class BoundTitleDocumentListView(TitleDocumentListView):
+
+    def get_queryset(self, session):
+        return session.query(Document).filter(
+            Document.title == sa.bindparam('title')
+        ).params(title=self.get_argument('title'))
+
+
+class KeyDumpOnlyDocumentSchema(DocumentSchema):
+
+    class Meta:
+        model = Document
+        dump_only = ('id',)
+
+
+class UpsertDocumentView(DocumentView):
+    schema_class = KeyDumpOnlyDocumentSchema
+    upsert = True
+
+
+class ViewTest(object):
+
+    def setup_method(self, method):
+        self.io_loop = IOLoop()
+        self.io_loop.make_current()
+        sock, self.port = bind_unused_port()
+        self.server = HTTPServer(self.make_app())
+        self.server.add_sockets([sock])
+        self.client = AsyncHTTPClient()
+
+    def teardown_method(self, method):
+        self.server.stop()
+        self.client.close()
+        self.io_loop.clear_current()
+        self.io_loop.close(all_fds=True)
+
+    def make_app(self):
+        engine = sa.create_engine(
+            'sqlite://', connect_args={'check_same_thread': False},
+            poolclass=sa.pool.StaticPool)
+        models.Base.metadata.create_all(engine)
+        Base.metadata.create_all(engine)
+        initialize_sessionmaker(engine)
+        session = get_session()
+        views.populate(session, models, users=3, roles=2, permissions=4)
+        session.add_all([Document(id=1, title='draft', version=1),
+                         Document(id=2, title='other', version=1)])
+        session.commit()
+        session.close()
+        app = tornado.web.Application([
+            (r'/documents/(?P<id>\d+)', DocumentView),
+            (r'/documents/direct/(?P<id>\d+)', DirectDocumentView),
+            (r'/documents/upsert/(?P<id>\d+)', UpsertDocumentView),
+            (r'/documents/raced/(?P<id>\d+)', RacedDocumentView),
+            (r'/documents/title', TitleDocumentListView),
+            (r'/documents/bound', BoundTitleDocumentListView),
+            (r'/documents/upsert/title/(?P<title>\w+)', UpsertDocumentView),
+        ])
+        app.executor = views.TimedExecutor(1)
+        app.redis = None
+        app.raced = []
+        return app
+
+    def request(self, method, path, body=None, if_match=''):
+        response = self.io_loop.run_sync(lambda: self.client.fetch(
+            'http://127.0.0.1:{0}{1}'.format(self.port, path), method=method,
+            body=None if body is None else json.dumps(body), headers={
+                'userId': '1', 'Authorization': 'token', 'If-Match': if_match,
+            }))
+        return json.loads(response.body.decode('utf-8'))
+
+    def document(self, id=1):
+        session = get_session()
+        try:
+            document = session.query(Document).get(id)
+            return document.title, document.version
+        finally:
+            session.close()
+
+
+class TestIfMatch(ViewTest):
+
+    def test_version(self):
+        result = self.request('PATCH', '/documents/1', {'title': 'final'}, '"1"')
+        assert result['code'] == 0
+        assert self.document() == ('final', 2)
+        result = self.request('PATCH', '/documents/1', {'title': 'again'}, '"1"')
+        assert result == {'code': 1, 'msg': u'版本冲突'}
+
+    def test_version_of_non_column_fields(self):
+        result = self.request('PATCH', '/documents/raced/1',
+                              {'title': 'final', 'label': 'labelled'}, '"1"')
+        assert result['code'] == 0
+        assert self.server.request_callback.raced == [0]
+        assert self.document() == ('labelled', 2)
+        result = self.request('PATCH', '/documents/raced/1', {'label': 'x'}, '"1"')
+        assert result == {'code': 1, 'msg': u'版本冲突'}
+        assert self.document() == ('labelled', 2)
+
+    def test_malformed_version(self):
+        for if_match in ('"one"', 'W/"1x"', '"1", "2"', '""'):
+            for method, path in (('PATCH', '/documents/1'),
+                                 ('PUT', '/documents/direct/1')):
+                result = self.request(method, path, {'title': 'final'}, if_match)
+                assert result == {'code': 1, 'msg': u'版本冲突'}
+        assert self.document() == ('draft', 1)
+
+
+class TestUpsert(ViewTest):
+
+    def test_dump_only_primary_key(self):
+        result = self.request('PUT', '/documents/upsert/2', {'title': 'final'})
+        assert result == {'code': 0, 'data': {'id': 2, 'title': 'final'}}
+        assert self.document(2) == ('final', 1)
+        with session_manager() as session:
+            assert session.query(Document).count() == 2
+
+    def test_lookup_other_than_primary_key(self):
+        with pytest.raises(HTTPError):
+            self.request('PUT', '/documents/upsert/title/other', {'title': 'x'})
+        with session_manager() as session:
+            assert session.query(Document).count() == 2
+
+
+class TestDestroy(ViewTest):
+
+    def test_deletes_the_object_of_the_url(self):
+        result = self.request('DELETE', '/documents/2')
+        assert result == {'code': 0, 'msg': u'成功'}
+        with session_manager() as session:
+            assert [each.id for each in session.query(Document)] == [1]
+
+
+class TestCountStatement(ViewTest):
+
+    def test_count_per_request(self):
+        statements.stats.reset()
+        for path in ('/documents/title', '/documents/bound'):
+            for title, total in (('draft', 1), ('none', 0), ('other', 1)):
+                result = self.request('GET', '{0}?title={1}'.format(path, title))
+                assert result['total'] == total
+        counts = statements.stats.as_dict()
+        assert 'count' not in counts['TitleDocumentListView']
+        assert counts['BoundTitleDocumentListView']['count']['hits'] == 2
+
+    def test_count(self):
+        with session_manager() as session:
+            queryset = session.query(models.User).join(models.User.roles) \
+                .filter(models.Role.id == 2).order_by(models.User.name.desc())
+            expected = len(queryset.all())
+            assert expected == 2
+            assert session.execute(count_statement(queryset)).scalar() == expected
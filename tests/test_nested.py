@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+from marshmallow import Schema, fields
+
+
+class ChildSchema(Schema):
+    count = fields.Int()
+
+    class Meta:
+        ordered = True
+
+
+class ParentSchema(Schema):
+    name = fields.Str()
+    child = fields.Nested(ChildSchema, report_errors=True)
+    children = fields.Nested(ChildSchema, many=True, report_errors=True)
+
+    class Meta:
+        ordered = True
+
+
+class ColumnarParentSchema(ParentSchema):
+
+    class Meta:
+        ordered = True
+        columnar = True
+
+
+PARENTS = [
+    {'name': 'a', 'child': {'count': 1}, 'children': [{'count': 2}, {'count': 'x'}]},
+    {'name': 'b', 'child': {'count': 'y'}, 'children': []},
+]
+
+
+def child(count=None):
+    return OrderedDict() if count is None else OrderedDict([('count', count)])
+
+
+class TestNestedErrors:
+
+    def test_dump(self):
+        result = ParentSchema().dump(PARENTS[1])
+        assert result.errors == {'child': {'count': ['Not a valid integer.']}}
+
+    def test_dump_many(self):
+        for schema_class in (ParentSchema, ColumnarParentSchema):
+            result = schema_class(many=True).dump(PARENTS)
+            assert result.errors == {
+                0: {'children': {1: {'count': ['Not a valid integer.']}}},
+                1: {'child': {'count': ['Not a valid integer.']}},
+            }
+            assert result.data == [
+                OrderedDict([('name', 'a'), ('child', child(1)),
+                             ('children', [child(2), child()])]),
+                OrderedDict([('name', 'b'), ('children', [])]),
+            ]
+
+
+    def test_dump_only_a_field(self):
+        class PluckSchema(Schema):
+            child = fields.Nested(ChildSchema, only='count', report_errors=True)
+            children = fields.Nested(ChildSchema, many=True, only='count',
+                                     report_errors=True)
+
+        for many in (False, True):
+            result = PluckSchema(many=many).dump(
+                [PARENTS[0]] if many else PARENTS[0])
+            data = result.data[0] if many else result.data
+            assert data == {'child': 1, 'children': [2, None]}
+            errors = result.errors[0] if many else result.errors
+            assert errors == {'children': {1: {'count': ['Not a valid integer.']}}}
+
+    def test_left_out_by_default(self):
+        class QuietParentSchema(Schema):
+            child = fields.Nested(ChildSchema)
+            children = fields.Nested(ChildSchema, many=True)
+
+            class Meta:
+                ordered = True
+
+        class ColumnarQuietParentSchema(QuietParentSchema):
+
+            class Meta:
+                ordered = True
+                columnar = True
+
+        for schema in (QuietParentSchema(), QuietParentSchema(strict=True)):
+            result = schema.dump(PARENTS[0])
+            assert result.errors == {}
+            assert result.data == OrderedDict([
+                ('child', child(1)), ('children', [child(2), child()])])
+        for schema_class in (QuietParentSchema, ColumnarQuietParentSchema):
+            result = schema_class(many=True).dump(PARENTS)
+            assert result.errors == {}
+            assert result.data == [
+                OrderedDict([('child', child(1)),
+                             ('children', [child(2), child()])]),
+                OrderedDict([('child', child()), ('children', [])]),
+            ]
+
+
+class TestNestedBatches:
+
+    def test_children_of_a_page_are_dumped_at_once(self):
+        calls = []
+
+        class CountedChildSchema(ChildSchema):
+            def dump(self, obj, many=None, update_fields=True, **kwargs):
+                calls.append(many)
+                return super(CountedChildSchema, self).dump(
+                    obj, many=many, update_fields=update_fields, **kwargs)
+
+        class MySchema(Schema):
+            children = fields.Nested(CountedChildSchema, many=True)
+
+        data = [{'children': [{'count': 1}]}, {'children': [{'count': 2}, {'count': 3}]}]
+        assert MySchema(many=True).dump(data).data == [
+            {'children': [{'count': 1}]},
+            {'children': [{'count': 2}, {'count': 3}]},
+        ]
+        assert calls == [True]
+
+
+class TestRecursiveNested:
+
+    class NodeSchema(Schema):
+        id = fields.Int()
+        children = fields.Nested('self', many=True, max_depth=2)
+
+    def test_levels_share_their_fields(self):
+        schema = self.NodeSchema()
+        tree = {'id': 1, 'children': [
+            {'id': 2, 'children': [{'id': 3, 'children': [{'id': 4}]}]},
+        ]}
+        assert schema.dump(tree).data == {'id': 1, 'children': [
+            {'id': 2, 'children': [{'id': 3}]},
+        ]}
+        first = schema.fields['children'].schema
+        second = first.fields['children'].schema
+        assert second.fields['id'] is first.fields['id']
+        assert second.fields['children'] is not first.fields['children']
+        assert second.fields['children'].parent is second
+        assert second._recursion_depth == 2
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+import tornado.web
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+from tornado.testing import bind_unused_port
+
+from restornado import profiling
+
+SECRET = 'secret'
+
+
+class TestSamplingWindow:
+
+    def test_defaults(self):
+        assert profiling.sampling_window({}) == (10, 0.005)
+        assert profiling.sampling_window(
+            {'profile_seconds': 2, 'profile_interval': 0.01}) == (2, 0.01)
+
+    def test_limits(self):
+        assert profiling.sampling_window({}, 3600, 0.00001) == (
+            profiling.MAX_SECONDS, profiling.MIN_INTERVAL)
+        assert profiling.sampling_window({'profile_max_seconds': 5}, 30) == (5, 0.005)
+        assert profiling.sampling_window({}, 0.5, 2) == (0.5, 0.5)
+
+    @pytest.mark.parametrize('seconds, interval', [
+        (0, None), (-1, None), (None, 0), (None, -0.1), (float('nan'), None),
+    ])
+    def test_not_positive(self, seconds, interval):
+        with pytest.raises(ValueError):
+            profiling.sampling_window({}, seconds, interval)
+
+
+class TestProfilerHandler:
+
+    def setup_method(self, method):
+        self.io_loop = IOLoop()
+        self.io_loop.make_current()
+        sock, self.port = bind_unused_port()
+        self.app = tornado.web.Application(
+            [(r'/_profile', profiling.ProfilerHandler)],
+            profile_secret=SECRET, profile_max_seconds=1,
+        )
+        self.app.executor = None
+        self.server = HTTPServer(self.app)
+        self.server.add_sockets([sock])
+        self.client = AsyncHTTPClient()
+
+    def teardown_method(self, method):
+        sampler = profiling.current_sampler()
+        if sampler is not None:
+            sampler.stop()
+            sampler.join()
+        self.server.stop()
+        self.client.close()
+        self.io_loop.clear_current()
+        self.io_loop.close(all_fds=True)
+
+    def fetch(self, method, query=''):
+        return self.io_loop.run_sync(lambda: self.client.fetch(
+            'http://127.0.0.1:{0}/_profile{1}'.format(self.port, query),
+            method=method, body='' if method == 'POST' else None,
+            headers={profiling.HEADER: profiling.sign(SECRET, 'sample')},
+            raise_error=False,
+        ))
+
+    def test_rejects_values_not_positive(self):
+        for query in ('?seconds=0', '?seconds=-5', '?interval=0', '?interval=-1',
+                      '?seconds=abc'):
+            assert self.fetch('POST', query).code == 400
+        assert profiling.current_sampler() is None
+
+    def test_limits(self, tmpdir):
+        self.app.settings['profile_dir'] = str(tmpdir)
+        response = self.fetch('POST', '?seconds=3600&interval=0.000001')
+        assert response.code == 200
+        assert json.loads(response.body.decode('utf-8'))['seconds'] == 1
+        sampler = profiling.current_sampler()
+        assert (sampler.seconds, sampler.interval) == (1, profiling.MIN_INTERVAL)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from marshmallow import Schema, fields, pre_dump, validates_schema
+
+
+class MySchema(Schema):
+    a = fields.Int()
+    b = fields.Int()
+
+
+class TestFieldOptionsChangedAfterBuild:
+
+    def test_required(self):
+        schema = MySchema()
+        assert schema.load({}).errors == {}
+        schema.fields['a'].required = True
+        assert schema.load({}).errors == {
+            'a': ['Missing data for required field.']
+        }
+
+    def test_load_from(self):
+        schema = MySchema()
+        assert schema.load({'a': 1}).data == {'a': 1}
+        schema.fields['a'].load_from = 'x'
+        assert schema.load({'x': 1}).data == {'a': 1}
+
+    def test_dump_to(self):
+        schema = MySchema()
+        assert schema.dump({'a': 1, 'b': 2}).data == {'a': 1, 'b': 2}
+        schema.fields['a'].dump_to = 'x'
+        assert schema.dump({'a': 1, 'b': 2}).data == {'x': 1, 'b': 2}
+
+    def test_load_only_and_dump_only(self):
+        schema = MySchema()
+        assert schema.dump({'a': 1, 'b': 2}).data == {'a': 1, 'b': 2}
+        schema.fields['a'].load_only = True
+        schema.fields['b'].dump_only = True
+        assert schema.dump({'a': 1, 'b': 2}).data == {'b': 2}
+        assert schema.load({'a': 1, 'b': 2}).data == {'a': 1}
+
+    def test_validators(self):
+        schema = MySchema()
+        assert schema.load({'a': 1}).errors == {}
+        schema.fields['a'].validators.append(lambda value: value > 1)
+        assert schema.load({'a': 1}).errors == {'a': ['Invalid value.']}
+
+
+class Point(object):
+
+    def __init__(self, x, y):
+        self.x = x
+        self._y = y
+        self.reads = 0
+
+    @property
+    def y(self):
+        self.reads += 1
+        return self._y
+
+
+class TestImplicitFields:
+
+    class PointSchema(Schema):
+        x = fields.Int()
+
+        class Meta:
+            additional = ('y', )
+
+    def test_attribute_types_are_read_once_per_type(self):
+        first, second = Point(1, 'a'), Point(2, 'b')
+        assert self.PointSchema().dump(first).data == {'x': 1, 'y': 'a'}
+        # Read to infer the type of the field, then to serialize it
+        assert first.reads == 2
+        schema = self.PointSchema()
+        assert schema.dump(second).data == {'x': 2, 'y': 'b'}
+        assert second.reads == 1
+        field = schema.fields['y']
+        assert isinstance(field, fields.String)
+        schema.dump(Point(3, 'c'))
+        assert schema.fields['y'] is field
+
+
+class TestPlans:
+
+    def test_reused_across_dumps_and_loads(self):
+        schema = MySchema()
+        schema.dump({'a': 1, 'b': 2})
+        schema.load({'a': 1})
+        dump_plan, load_plan = schema._dump_plan, schema._load_plan
+        assert schema.dump({'a': 3, 'b': 4}).data == {'a': 3, 'b': 4}
+        assert schema.load({'b': 2}).data == {'b': 2}
+        assert schema._dump_plan is dump_plan
+        assert schema._load_plan is load_plan
+
+    def test_rebuilt_when_only_or_exclude_change(self):
+        schema = MySchema()
+        schema.dump({'a': 1, 'b': 2})
+        plan = schema._dump_plan
+        schema.only = ('a', )
+        assert schema.dump({'a': 1, 'b': 2}).data == {'a': 1}
+        assert schema._dump_plan is not plan
+        plan = schema._dump_plan
+        schema.only = ()
+        schema.exclude = ('a', )
+        assert schema.dump({'a': 1, 'b': 2}).data == {'b': 2}
+        assert schema._dump_plan is not plan
+
+    def test_rebuilt_when_context_changes(self):
+        schema = MySchema()
+        schema.dump({'a': 1})
+        plan = schema._dump_plan
+        schema.context = {'user': 'someone'}
+        schema.dump({'a': 1})
+        assert schema._dump_plan is not plan
+
+    def test_flags(self):
+        class ProcessedSchema(MySchema):
+
+            @pre_dump
+            def add_b(self, obj):
+                return dict(obj, b=2)
+
+            @validates_schema
+            def check(self, data):
+                pass
+
+        schema = ProcessedSchema()
+        assert schema.dump({'a': 1}).data == {'a': 1, 'b': 2}
+        plan = schema._dump_plan
+        assert (plan.pre_dump, plan.post_dump) == (True, False)
+        assert plan.accessor is None
+        assert plan.batches
+        schema.load({'a': 1})
+        plan = schema._load_plan
+        assert (plan.pre_load, plan.validates_schema,
+                plan.validates_schema_many) == (False, True, False)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declarative_base
+
+from marshmallow import fields
+from marshmallow_sqlalchemy import ModelSchema, TableSchema
+
+Base = declarative_base()
+
+
+class Author(Base):
+    __tablename__ = 'author'
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(32))
+
+
+class AuthorSchema(ModelSchema):
+    extra = fields.Str()
+
+    class Meta:
+        model = Author
+
+
+class AuthorTableSchema(TableSchema):
+
+    class Meta:
+        table = Author.__table__
+
+
+class TestDeclaredFields:
+
+    def test_read_from_instance(self):
+        schema = AuthorSchema()
+        assert set(schema._declared_fields) == {'id', 'name', 'extra'}
+        assert schema._declared_fields is AuthorSchema._declared_fields
+
+    def test_read_from_instance_of_table_schema(self):
+        schema = AuthorTableSchema()
+        assert set(schema._declared_fields) == {'id', 'name'}
+
+    def test_read_from_instance_of_subclass(self):
+        class ChildSchema(AuthorSchema):
+            other = fields.Int()
+
+        assert set(ChildSchema()._declared_fields) == {
+            'id', 'name', 'extra', 'other'}
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+from marshmallow import fields, utils
+
+NAIVE = datetime.datetime(2013, 11, 10, 1, 23, 45, 123456)
+EASTERN = datetime.timezone(datetime.timedelta(hours=-5))
+
+
+class TestIsoformat:
+
+    def test_naive(self, monkeypatch):
+        expected = '2013-11-10T01:23:45.123456+00:00'
+        for available in (True, False):
+            monkeypatch.setattr(utils, 'dateutil_available', available)
+            assert utils.isoformat(NAIVE) == expected
+            assert utils.isoformat(NAIVE, localtime=True) == expected
+            assert utils.isoformat(NAIVE) == utils.UTC.localize(NAIVE).isoformat()
+        assert utils.isoformat(NAIVE, False, ' ') == \
+            '2013-11-10 01:23:45.123456+00:00'
+
+    def test_aware(self):
+        dt = NAIVE.replace(tzinfo=EASTERN)
+        assert utils.isoformat(dt) == '2013-11-10T06:23:45.123456+00:00'
+        assert utils.isoformat(dt, localtime=True) == \
+            '2013-11-10T01:23:45.123456-05:00'
+
+    def test_datetime_field_uses_format_iso(self, monkeypatch):
+        calls = []
+        format_iso = utils.format_iso
+
+        def spy(value, *args, **kwargs):
+            calls.append(value)
+            return format_iso(value, *args, **kwargs)
+
+        monkeypatch.setattr(utils, 'format_iso', spy)
+        assert fields.DateTime().serialize('dt', {'dt': NAIVE}) == \
+            '2013-11-10T01:23:45.123456+00:00'
+        assert len(calls) == 1
+
+
+class TestFormatIso:
+
+    def test_naive(self):
+        assert utils.format_iso(NAIVE) == '2013-11-10T01:23:45.123456'
+        assert utils.format_iso(NAIVE, milliseconds=True, zulu=True) == \
+            '2013-11-10T01:23:45.123'
+
+    def test_utc(self):
+        dt = NAIVE.replace(tzinfo=utils.UTC)
+        assert utils.format_iso(dt, milliseconds=True, zulu=True) == \
+            '2013-11-10T01:23:45.123Z'